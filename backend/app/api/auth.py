@@ -1,17 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 import os
 from urllib.parse import urlencode
 import requests as httpx
 import json
+import hashlib
 import logging
 
 
-from app.core.db import get_db
+from app.core.db import AsyncReadOnlySessionLocal, async_engine, get_db, get_async_db, get_async_read_db
+from app.core.cache import TTLCache
+from app.settings import settings
 from app.models.models import User, UserSession
 from app.schemas.auth import Token, UserResponse
 
@@ -31,6 +36,37 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 # Router
 router = APIRouter()
 
+# token hash -> {"user": {...columns}, "expires_at": datetime}. Per worker: logout elsewhere only
+# deletes the session row, so a hit still checks that the row exists on the primary (one indexed
+# lookup instead of session + user).
+session_cache = TTLCache(maxsize=settings.SESSION_CACHE_MAX_ENTRIES, ttl=settings.SESSION_CACHE_TTL)
+_USER_CACHE_FIELDS = ("id", "email", "name", "role", "created_at", "updated_at")
+
+def _session_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _cache_session(token: str, session: UserSession, user: User) -> None:
+    ttl = (session.expires_at - datetime.utcnow()).total_seconds()
+    session_cache.set(
+        _session_cache_key(token),
+        {"user": {f: getattr(user, f) for f in _USER_CACHE_FIELDS}, "expires_at": session.expires_at},
+        ttl=ttl,
+    )
+
+async def _find_session(db: AsyncSession, stmt):
+    # On the primary even when `db` reads from a replica: a lagging replica would still have
+    # the row of a session that was just logged out
+    if db.bind is async_engine:
+        return await db.scalar(stmt)
+    async with AsyncReadOnlySessionLocal() as primary:
+        return await primary.scalar(stmt)
+
+def _user_from_cache(entry: dict) -> User:
+    # Detached (not transient) so it can't be re-inserted by accident and lazy loads fail loudly
+    user = User(**entry["user"])
+    make_transient_to_detached(user)
+    return user
+
 # Token creation
 def create_access_token(data: dict) -> str:
     auth_logger.info(f"Creating access token for user: {data}")
@@ -126,47 +162,61 @@ def google_callback(code: str, response: Response, db: Session = Depends(get_db)
     # auth_logger.debug("Redirecting to frontend" , extra={"user_id": user.id , "email": email , "name": name})
     return redirect_response
 
-async def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_read_db)) -> User:
     # Extract token from cookie instead of Authorization header
     auth_logger.debug("Getting current user" , extra={"request": request})
     token = request.cookies.get("access_token")
     if not token:
         auth_logger.error("No token found in request" , extra={"request": request})
         raise HTTPException(status_code=401, detail="Not authenticated")
-    
+    return await authenticate_token(token, db)
+
+async def authenticate_token(token: str, db: AsyncSession) -> User:
+    """Resolve a session token (access_token cookie) to its User; shared by HTTP and WebSocket routes."""
     try:
-        auth_logger.debug("Decoding JWT" , extra={"Request": Request})
+        auth_logger.debug("Decoding JWT" )
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: int = int(payload.get("sub"))
     except (JWTError, ValueError):
         auth_logger.error("Invalid token" )
         raise HTTPException(status_code=401, detail="Invalid token")
-    
+
+    cache_key = _session_cache_key(token)
+    cached = session_cache.get(cache_key)
+    if cached is not None:
+        if cached["expires_at"] >= datetime.utcnow() and cached["user"]["id"] == user_id:
+            if await _find_session(db, select(UserSession.id).where(UserSession.token == token)) is not None:
+                auth_logger.debug("Session cache hit" , extra={"user_id": user_id , "cache": session_cache.stats()})
+                return _user_from_cache(cached)
+        session_cache.pop(cache_key)
+
     auth_logger.debug("Getting session from DB" )
-    session = db.query(UserSession).filter(UserSession.token == token).first()
+    session = await _find_session(db, select(UserSession).where(UserSession.token == token))
     if not session or session.expires_at < datetime.utcnow():
         auth_logger.error("Session expired or invalid" , extra={"token": token})
         raise HTTPException(status_code=401, detail="Session expired or invalid")
     
     auth_logger.debug("Getting user from DB" , extra={"user_id": user_id})
-    user = db.query(User).get(user_id)
+    user = await db.get(User, user_id)
     if not user:
         auth_logger.error("User not found" , extra={"user_id": user_id})
         raise HTTPException(status_code=404, detail="User not found")
     auth_logger.debug("User found" , extra={"user_id": user_id})
+    _cache_session(token, session, user)
     return user
 
 @router.post("/logout")
-async def logout(response: Response, request: Request, db: Session = Depends(get_db)):
+async def logout(response: Response, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Logout user and clear secure cookie"""
     # Get token from cookie to invalidate session
     token = request.cookies.get("access_token")
     if token:
+        session_cache.pop(_session_cache_key(token))
         # Invalidate session in database
-        session = db.query(UserSession).filter(UserSession.token == token).first()
+        session = await db.scalar(select(UserSession).where(UserSession.token == token))
         if session:
-            db.delete(session)
-            db.commit()
+            await db.delete(session)
+            await db.commit()
     
     # Clear the secure cookie
     response.delete_cookie(
@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query    
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse
+from sqlalchemy import select, func, or_, tuple_
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, date, time
-from typing import List
+from typing import List, Literal, Optional
+import base64
 import logging
-from app.core.db import get_db
-from app.models.models import BookingRequest, ArtistProfile, User, CalendarBlock
-from app.schemas.auth import BookingRequestCreate, BookingRequestResponse, BookingStatusUpdate , BookingRequestUpdate
-from app.api.auth import get_current_user
-from app.api.mail import send_booking_confirmation_email 
+import secrets
+from app.core.db import get_async_db, get_async_read_db
+from app.models.models import BookingRequest, ArtistProfile, User, OutboxMessage
+from app.schemas.auth import BookingRequestCreate, BookingRequestResponse, BookingStatusUpdate , BookingRequestUpdate, BookingJobResponse, BookingListResponse
+from app.api.auth import get_current_user, authenticate_token
+from app.core.outbox import enqueue, outbox_drainer
+from app.core.pdf import pdf_renderer, render_booking_summary_html, RendererBusy
+from app.core.availability import BUSY_STATUSES, booking_interval, find_conflicts, MAX_PERFORMANCE_MINUTES
 from app.api.chat import send_message_from_booker_func
 from app.schemas.auth import MessageCreate , MessageResponse , ChatResponse
 
@@ -15,12 +22,34 @@ bookings_logger = logging.getLogger("app.bookings")
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-def validate_booking_data(booking_data: BookingRequestCreate, db: Session, artist_id: int) -> None:
+def booking_chat_url(booking: BookingRequest) -> str:
+    return f"http://localhost:3000/chat/{booking.id}/{booking.chat_token}"  # או URL אחר לצ'אט
+
+async def artist_display_name(db: AsyncSession, artist_id: int) -> str:
+    stage_name = await db.scalar(select(ArtistProfile.stage_name).where(ArtistProfile.user_id == artist_id))
+    return stage_name or "Artist"
+
+async def check_artist_available(
+    db: AsyncSession, artist_id: int, start: datetime, end: datetime, exclude_booking_id: Optional[int] = None
+) -> None:
+    """409 if [start, end) (UTC) overlaps a calendar block or a busy (BUSY_STATUSES) booking of the artist"""
+    bookings_logger.debug("Checking if artist is available" , extra={"artist_id": artist_id , "start": start , "end": end})
+    conflicts = await find_conflicts(db, artist_id, start, end, exclude_booking_id=exclude_booking_id, limit=1)
+    if not conflicts:
+        return
+    bookings_logger.error("Artist is not available at the requested time" , extra={"artist_id": artist_id , "start": start , "end": end , "conflict": conflicts[0]})
+    raise HTTPException(
+        status_code=409,
+        detail="Artist is not available at the requested time" if conflicts[0].kind == "block"
+        else "A booking already exists for this artist at the requested time"
+    )
+
+async def validate_booking_data(booking_data: BookingRequestCreate, db: AsyncSession, artist_id: int) -> None:
     """Validate booking data and business rules"""
     bookings_logger.debug("Validating booking data" , extra={"booking_data": booking_data})
     # Check if artist exists
     bookings_logger.debug("Checking if artist exists" , extra={"artist_id": artist_id})
-    artist = db.query(ArtistProfile).filter(ArtistProfile.user_id == artist_id).first()
+    artist = await db.scalar(select(ArtistProfile).where(ArtistProfile.user_id == artist_id))
     if not artist:
         bookings_logger.error("Artist not found" , extra={"artist_id": artist_id})
         raise HTTPException(
@@ -56,22 +85,20 @@ def validate_booking_data(booking_data: BookingRequestCreate, db: Session, artis
             detail="Invalid event time format. Use HH:MM"
         )
         
-    ##TODO -- MOVE THE VALIDATION TO THE FRONTEND
-    # Check if artist is available (no calendar blocks)
-    bookings_logger.debug("Checking if artist is available" , extra={"artist_id": artist_id , "event_date": event_date , "event_time": event_time})
-    existing_block = db.query(CalendarBlock).filter(
-        CalendarBlock.artist_id == artist_id,
-        CalendarBlock.block_date == event_date,
-        CalendarBlock.start_time <= event_time,
-        CalendarBlock.end_time >= event_time
-    ).first()
-
-    if existing_block:
-        bookings_logger.error("Artist is not available at the requested time" , extra={"artist_id": artist_id , "event_date": event_date , "event_time": event_time})
+    if not 0 < booking_data.performance_duration <= MAX_PERFORMANCE_MINUTES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Performance duration must be between 1 and {MAX_PERFORMANCE_MINUTES} minutes"
+        )
+    try:
+        start, end = booking_interval(event_date, event_time, booking_data.time_zone, booking_data.performance_duration)
+    except ValueError:
+        bookings_logger.error("Invalid time zone" , extra={"time_zone": booking_data.time_zone})
         raise HTTPException(
-            status_code=409,
-            detail="Artist is not available at the requested time"
+            status_code=400,
+            detail="Invalid time zone. Use an IANA name such as Europe/London"
         )
+    await check_artist_available(db, artist_id, start, end)
     ##TODO -- MOVE THE VALIDATION TO THE FRONTEND
     # Check if budget meets minimum price
     bookings_logger.debug("Checking if budget meets minimum price" , extra={"artist_id": artist_id , "event_date": event_date , "event_time": event_time})
@@ -80,29 +107,13 @@ def validate_booking_data(booking_data: BookingRequestCreate, db: Session, artis
             status_code=400,
             detail=f"Budget must be at least {artist.min_price} {artist.currency or 'USD'}"
         )
-    
-    # Check for duplicate bookings (same artist, date, time)
-    bookings_logger.debug("Checking for duplicate bookings" , extra={"artist_id": artist_id , "event_date": event_date , "event_time": event_time})
-    existing_booking = db.query(BookingRequest).filter(
-        BookingRequest.artist_id == artist_id,
-        BookingRequest.event_date == event_date,
-        BookingRequest.event_time == event_time,
-        BookingRequest.status.in_(["pending", "accepted"])
-    ).first()
-
-    if existing_booking:
-        bookings_logger.error("A booking already exists for this artist at the requested time" , extra={"artist_id": artist_id , "event_date": event_date , "event_time": event_time})
-        raise HTTPException(
-            status_code=409,
-            detail="A booking already exists for this artist at the requested time"
-        )
     bookings_logger.debug("Booking data validated successfully" , extra={"artist_id": artist_id , "event_date": event_date , "event_time": event_time})
 
 @router.post("", response_model=BookingRequestResponse, status_code=201)
 async def create_booking(
     booking_data: BookingRequestCreate,
     artist_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new booking request for an artist
@@ -114,7 +125,7 @@ async def create_booking(
     try:
         # Validate booking data and business rules
         bookings_logger.debug("Validating booking data and business rules" , extra={"booking_data": booking_data , "artist_id": artist_id})
-        validate_booking_data(booking_data, db, artist_id)
+        await validate_booking_data(booking_data, db, artist_id)
         bookings_logger.debug("Booking data validated successfully" , extra={"booking_data": booking_data , "artist_id": artist_id})
         # Parse date and time
         ## HOWT TO PARSE IT BACK 
@@ -152,16 +163,34 @@ async def create_booking(
         
                 
         db.add(booking)
-        db.commit()
-        db.refresh(booking)
-        bookings_logger.debug("Booking created" , extra={"booking_id": booking.id , "artist_id": artist_id})
+        await db.flush()  # booking.id / chat_token for the confirmation email
+
+        # מייל אישור הזמנה ללקוח — נכתב ל-outbox באותה טרנזקציה ונשלח ברקע (app.core.outbox)
+        enqueue(
+            db,
+            "booking_confirmation",
+            {
+                "artist_name": await artist_display_name(db, artist_id),
+                "booking_details": booking.to_pdf_dict(),
+                "client_email": booking.client_email,
+                "chat_url": booking_chat_url(booking),
+                "booking_id": booking.id,
+                "updated_at": booking.updated_at.isoformat(),
+            },
+            booking_id=booking.id,
+        )
+
+        await db.commit()
+        await db.refresh(booking)
+        outbox_drainer.notify()
+        bookings_logger.debug("Booking created, confirmation email queued" , extra={"booking_id": booking.id , "artist_id": artist_id})
         
         
         
         if booking_data.client_message:
             bookings_logger.debug("Sending initial message from booker" , extra={"booking_id": booking.id , "artist_id": artist_id})
             try:
-                response = send_message_from_booker_func(
+                response = await send_message_from_booker_func(
                     booking_id=booking.id,
                     message_data=MessageCreate(message=booking_data.client_message),
                     chat_token=booking.chat_token,
@@ -176,27 +205,6 @@ async def create_booking(
 
 
 
-        # שליחת מייל אישור הזמנה ללקוח
-        try:
-            bookings_logger.debug("Sending booking confirmation email" , extra={"booking_id": booking.id , "artist_id": artist_id})
-            # קבלת שם האמן
-
-            artist = db.query(ArtistProfile).filter(ArtistProfile.user_id == artist_id).first()
-            artist_name = artist.stage_name if artist and artist.stage_name else "Artist"
-            
-            # שליחת מייל עם PDF
-            chat_url = f"http://localhost:3000/chat/{booking.id}/{booking.chat_token}"  # או URL אחר לצ'אט
-            message_id = send_booking_confirmation_email(
-                artist_name=artist_name,
-                booking_details=booking.to_pdf_dict(),
-                client_email=booking.client_email,
-                chat_url=chat_url
-            )
-            bookings_logger.debug("Confirmation email sent to {booking.client_email}, message ID: {message_id}" , extra={"booking_id": booking.id , "artist_id": artist_id , "client_email": booking.client_email , "message_id": message_id})
-        except Exception as e:
-            bookings_logger.error("Failed to send confirmation email" , extra={"booking_id": booking.id , "artist_id": artist_id , "error": e})
-            # לא נכשיל את ההזמנה אם המייל נכשל
-        
 
 
         bookings_logger.debug("Booking created successfully" , extra={"booking_id": booking.id , "artist_id": artist_id})
@@ -206,7 +214,7 @@ async def create_booking(
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         bookings_logger.error("Error creating booking" , extra={"booking_id": booking.id , "artist_id": artist_id , "error": e})
         raise HTTPException(
             status_code=500,
@@ -218,13 +226,13 @@ async def update_booking(
     booking_id: int,
     booking_data: BookingRequestUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a booking request
     """
     bookings_logger.debug("Updating booking" , extra={"booking_id": booking_id , "booking_data": booking_data})
-    booking = db.query(BookingRequest).filter(BookingRequest.id == booking_id).first()
+    booking = await db.get(BookingRequest, booking_id)
     if not booking:
         bookings_logger.error("Booking not found" , extra={"booking_id": booking_id})
         raise HTTPException(
@@ -245,25 +253,74 @@ async def update_booking(
         booking.performance_duration = booking_data.performance_duration
     if booking_data.budget:
         booking.budget = booking_data.budget
-
-    db.commit()
-    db.refresh(booking)
+    if booking_data.event_date or booking_data.event_time or booking_data.performance_duration:
+        if not 0 < booking.performance_duration <= MAX_PERFORMANCE_MINUTES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Performance duration must be between 1 and {MAX_PERFORMANCE_MINUTES} minutes"
+            )
+        if booking.status in BUSY_STATUSES:
+            try:
+                start, end = booking_interval(booking.event_date, booking.event_time, booking.time_zone, booking.performance_duration)
+            except ValueError:
+                start = None   # unknown time_zone on an old booking: nothing to check against
+            if start is not None:
+                await check_artist_available(db, booking.artist_id, start, end, exclude_booking_id=booking.id)
+
+    await db.commit()
+    await db.refresh(booking)
     bookings_logger.debug("Booking updated successfully" , extra={"booking_id": booking_id})
     return booking
 
 
 
+# Columns of a listing row (BookingListItem); the full booking is GET /{booking_id}
+LISTING_COLUMNS = (
+    BookingRequest.id, BookingRequest.event_date, BookingRequest.event_time, BookingRequest.time_zone,
+    BookingRequest.status, BookingRequest.venue_name, BookingRequest.city, BookingRequest.country,
+    BookingRequest.performance_duration, BookingRequest.budget, BookingRequest.currency,
+    BookingRequest.client_first_name, BookingRequest.client_last_name, BookingRequest.client_email,
+    BookingRequest.artist_unread_count, BookingRequest.created_at, BookingRequest.updated_at,
+)
+
+def encode_cursor(event_date: date, event_time: time, booking_id: int) -> str:
+    raw = f"{event_date.isoformat()}|{event_time.isoformat()}|{booking_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        d, t, booking_id = raw.split("|")
+        return date.fromisoformat(d), time.fromisoformat(t), int(booking_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def like_pattern(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
 ## UPDATE - SEND TOKEN BY COOKIE
-@router.get("/artist/{artist_id}", response_model=List[BookingRequestResponse])
+@router.get("/artist/{artist_id}", response_model=BookingListResponse)
 async def get_artist_bookings(
     artist_id: int,
+    status: Optional[List[str]] = Query(None, description="Repeat for several: ?status=pending&status=accepted"),
+    date_from: Optional[date] = Query(None, description="Event date on or after (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Event date on or before (YYYY-MM-DD)"),
+    country: Optional[str] = Query(None, max_length=100, description="Exact, case-insensitive"),
+    city: Optional[str] = Query(None, max_length=100, description="Exact, case-insensitive"),
+    q: Optional[str] = Query(None, min_length=2, max_length=100, description="Client name or email contains"),
+    order: Literal["desc", "asc"] = Query("desc", description="By event date/time"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Also count all matching bookings (extra query)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
-    Get all bookings for an artist (artist must be authenticated)
+    An artist's bookings, filtered and keyset-paginated by (event_date, event_time, id).
+    Each filter combination is served by an index starting with artist_id (see BookingRequest).
     """
-    bookings_logger.debug("Getting artist bookings" , extra={"artist_id": artist_id})
+    bookings_logger.debug("Getting artist bookings" , extra={"artist_id": artist_id , "cursor": cursor , "limit": limit})
     # Verify the authenticated user is the artist
     if current_user.id != artist_id:
         bookings_logger.error("You can only view your own bookings" , extra={"artist_id": artist_id , "current_user_id": current_user.id})
@@ -271,24 +328,73 @@ async def get_artist_bookings(
             status_code=403,
             detail="You can only view your own bookings"
         )
-    
-    bookings = db.query(BookingRequest).filter(
-        BookingRequest.artist_id == artist_id
-    ).order_by(BookingRequest.event_date.desc()).all()
-    bookings_logger.debug("Artist bookings fetched successfully" , extra={"artist_id": artist_id , "bookings": bookings})
-    return bookings
+
+    filters = [BookingRequest.artist_id == artist_id]
+    if status:
+        filters.append(BookingRequest.status.in_(status) if len(status) > 1 else BookingRequest.status == status[0])
+    if date_from:
+        filters.append(BookingRequest.event_date >= date_from)
+    if date_to:
+        filters.append(BookingRequest.event_date <= date_to)
+    if country:
+        filters.append(func.lower(BookingRequest.country) == country.strip().lower())
+    if city:
+        filters.append(func.lower(BookingRequest.city) == city.strip().lower())
+    if q:
+        # a leading-wildcard LIKE can't use an index; it filters the rows the indexes above select
+        pattern = like_pattern(q.strip())
+        filters.append(or_(
+            BookingRequest.client_first_name.ilike(pattern, escape="\\"),
+            BookingRequest.client_last_name.ilike(pattern, escape="\\"),
+            BookingRequest.client_email.ilike(pattern, escape="\\"),
+            (BookingRequest.client_first_name + " " + BookingRequest.client_last_name).ilike(pattern, escape="\\"),
+        ))
+
+    key = tuple_(BookingRequest.event_date, BookingRequest.event_time, BookingRequest.id)
+    stmt = select(*LISTING_COLUMNS).where(*filters)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor))
+        stmt = stmt.where(key < after if order == "desc" else key > after)
+    sort = [BookingRequest.event_date, BookingRequest.event_time, BookingRequest.id]
+    stmt = stmt.order_by(*(c.desc() if order == "desc" else c.asc() for c in sort)).limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    total = None
+    if include_total:
+        total = await db.scalar(select(func.count()).select_from(BookingRequest).where(*filters))
+
+    bookings_logger.debug("Artist bookings fetched successfully" , extra={"artist_id": artist_id , "count": len(rows) , "has_more": has_more})
+    # built from the selected columns directly: no ORM objects, no second validation pass
+    return JSONResponse({
+        "bookings": [
+            {
+                **r._asdict(),
+                "event_date": r.event_date.isoformat(),
+                "event_time": r.event_time.isoformat(),
+                "budget": float(r.budget),
+                "created_at": r.created_at.isoformat() if r.created_at else None,
+                "updated_at": r.updated_at.isoformat() if r.updated_at else None,
+            }
+            for r in rows
+        ],
+        "has_more": has_more,
+        "next_cursor": encode_cursor(rows[-1].event_date, rows[-1].event_time, rows[-1].id) if has_more else None,
+        "total": total,
+    })
 
 @router.get("/{booking_id}", response_model=BookingRequestResponse)
 async def get_booking(
     booking_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get a specific booking by ID
     """
     bookings_logger.debug("Getting booking" , extra={"booking_id": booking_id , "current_user_id": current_user.id})
-    booking = db.query(BookingRequest).filter(BookingRequest.id == booking_id).first()
+    booking = await db.get(BookingRequest, booking_id)
     
     if not booking:
         bookings_logger.error("Booking not found" , extra={"booking_id": booking_id , "current_user_id": current_user.id})
@@ -307,6 +413,89 @@ async def get_booking(
     bookings_logger.debug("Booking fetched successfully" , extra={"booking_id": booking_id , "current_user_id": current_user.id})
     return booking
 
+@router.get("/{booking_id}/jobs", response_model=List[BookingJobResponse])
+async def get_booking_jobs(
+    booking_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Background work of a booking and its status: outgoing email (outbox)
+    """
+    booking = await db.get(BookingRequest, booking_id)
+    if not booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    if booking.artist_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You can only view your own bookings")
+    outbox = (await db.scalars(
+        select(OutboxMessage).where(OutboxMessage.booking_request_id == booking_id).order_by(OutboxMessage.id)
+    )).all()
+    return [
+        {
+            "id": m.id,
+            "kind": m.kind,
+            "status": m.status,
+            "attempts": m.attempts,
+            "last_error": m.last_error,
+            "next_attempt_at": m.available_at if m.status == "pending" and m.attempts else None,
+            "provider_message_id": m.provider_message_id,
+            "created_at": m.created_at,
+            "updated_at": m.updated_at,
+        }
+        for m in outbox
+    ]
+
+@router.get("/{booking_id}/summary.pdf", response_class=FileResponse)
+async def download_booking_summary(
+    booking_id: int,
+    request: Request,
+    chat_token: Optional[str] = Query(None, description="Chat token (booker side); the artist uses the session cookie"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Booking summary PDF, served from the render cache (app.core.pdf.PdfCache).
+    ETag is the PDF's sha256, so clients can revalidate with If-None-Match.
+    """
+    booking = await db.get(BookingRequest, booking_id)
+    if not booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    if chat_token is not None:
+        if not secrets.compare_digest(chat_token, booking.chat_token or ""):
+            raise HTTPException(status_code=404, detail="Booking not found or invalid chat token")
+    else:
+        token = request.cookies.get("access_token")
+        if not token:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        user = await authenticate_token(token, db)
+        if booking.artist_id != user.id:
+            raise HTTPException(status_code=403, detail="You can only view your own bookings")
+
+    artist_name = await artist_display_name(db, booking.artist_id)
+    try:
+        digest, path = await pdf_renderer.booking_pdf_file(
+            booking.id,
+            booking.updated_at,
+            lambda: render_booking_summary_html(artist_name, booking.to_pdf_dict(), booking_chat_url(booking), booking.updated_at),
+        )
+    except RendererBusy:
+        bookings_logger.warning("PDF renderer busy", extra={"booking_id": booking_id})
+        raise HTTPException(status_code=503, detail="PDF is being generated, try again shortly", headers={"Retry-After": "5"})
+    except Exception as e:
+        bookings_logger.error("Failed to render booking PDF", extra={"booking_id": booking_id, "error": e})
+        raise HTTPException(status_code=500, detail="Failed to generate PDF")
+
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}   # always revalidate: the booking can change
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"booking_summary_{booking.id}.pdf",
+        headers=headers,
+    )
+
 
 
 
@@ -316,23 +505,22 @@ async def get_booking(
 async def get_booking(
     booking_id: int,
     chat_token: str = Query(..., description="Chat token from booking request"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get a specific booking by ID and chat token.
     Checks if both match, and if the current user has permission.
     """
     bookings_logger.debug("Getting booking chat" , extra={"booking_id": booking_id , "chat_token": chat_token })
-    booking = (
-        db.query(BookingRequest)
+    booking = await db.scalar(
+        select(BookingRequest)
         .options(
             joinedload(BookingRequest.artist).joinedload(ArtistProfile.user)
         )
-        .filter(
+        .where(
             BookingRequest.id == booking_id,
             BookingRequest.chat_token == chat_token
         )
-        .first()
     )
 
     if not booking:
@@ -360,13 +548,13 @@ async def update_booking_status(
     booking_id: int,
     status_update: BookingStatusUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update booking status (only artist can update status)
     """
     bookings_logger.debug("Updating booking status" , extra={"booking_id": booking_id , "status_update": status_update , "current_user_id": current_user.id})
-    booking = db.query(BookingRequest).filter(BookingRequest.id == booking_id).first()
+    booking = await db.get(BookingRequest, booking_id)
     
     if not booking:
         bookings_logger.error("Booking not found" , extra={"booking_id": booking_id , "status_update": status_update , "current_user_id": current_user.id})
@@ -384,7 +572,7 @@ async def update_booking_status(
         )
     
     # Validate status
-    valid_statuses = ["pending", "accepted", "rejected", "cancelled"]
+    valid_statuses = ["pending", "accepted", "rejected", "cancelled", "completed"]
     if status_update.status not in valid_statuses:
         raise HTTPException(
             status_code=400,
@@ -395,8 +583,8 @@ async def update_booking_status(
     booking.status = status_update.status
     booking.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(booking)
+    await db.commit()
+    await db.refresh(booking)
     
     bookings_logger.debug("Booking status updated successfully" , extra={"booking_id": booking_id , "status_update": status_update , "current_user_id": current_user.id})
     return booking
@@ -405,12 +593,12 @@ async def update_booking_status(
 async def cancel_booking(
     booking_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Cancel a booking (only artist can cancel)
     """
-    booking = db.query(BookingRequest).filter(BookingRequest.id == booking_id).first()
+    booking = await db.get(BookingRequest, booking_id)
     
     if not booking:
         raise HTTPException(
@@ -435,7 +623,7 @@ async def cancel_booking(
     booking.status = "cancelled"
     booking.updated_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     logger.info(f"Booking {booking_id} cancelled by artist {current_user.id}")
     
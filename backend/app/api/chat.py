@@ -1,15 +1,22 @@
 # app/api/chat.py — גרסה מעודכנת
 
+import re
 from datetime import datetime
 from typing import List, Tuple, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, WebSocket
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update, tuple_, func, and_, text
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.api.auth import get_current_user
-from app.models.models import BookingRequest, ChatMessage, User, ArtistProfile
-from app.schemas.auth import MessageCreate, MessageResponse, ChatResponse
+from app.core.db import get_async_db, get_async_read_db, AsyncReadOnlySessionLocal
+from app.core.chat_hub import chat_hub
+from app.api.auth import get_current_user, authenticate_token
+from app.models.models import BookingRequest, ChatMessage, User
+from app.schemas.auth import (
+    MessageCreate, MessageResponse, ChatResponse, UnreadSummaryResponse, ChatSearchResponse,
+)
 
 import logging
 chat_logger = logging.getLogger("app.chat")
@@ -18,46 +25,194 @@ router = APIRouter()
 
 # ---------- Validators / helpers ----------
 
-def validate_chat_token(booking_id: int, chat_token: str, db: Session) -> BookingRequest:
-    booking = db.query(BookingRequest).filter(
+async def validate_chat_token(booking_id: int, chat_token: str, db: AsyncSession) -> BookingRequest:
+    booking = await db.scalar(select(BookingRequest).where(
         BookingRequest.id == booking_id,
         BookingRequest.chat_token == chat_token
-    ).first()
+    ))
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found or invalid chat token")
     return booking
 
-def validate_artist_access(booking_id: int, current_user: User, db: Session) -> BookingRequest:
-    booking = db.query(BookingRequest).filter(BookingRequest.id == booking_id).first()
+async def validate_artist_access(booking_id: int, current_user: User, db: AsyncSession) -> BookingRequest:
+    booking = await db.get(BookingRequest, booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     if booking.artist_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     return booking
 
-def resolve_sender_name_and_id(
-    msg: ChatMessage,
+def booker_display_name(booking: BookingRequest) -> str:
+    return f"{booking.client_first_name} {booking.client_last_name}".strip()
+
+# ---------- History paging (keyset on ix_chat_messages_booking_ts) ----------
+
+MAX_PAGE_SIZE = 500
+
+MESSAGE_COLUMNS = (
+    ChatMessage.id,
+    ChatMessage.sender_user_id,
+    ChatMessage.sender_type,
+    ChatMessage.message,
+    ChatMessage.timestamp,
+    ChatMessage.is_read,
+)
+
+async def fetch_messages_page(
+    db: AsyncSession,
+    booking_id: int,
+    limit: Optional[int] = None,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> Tuple[List[Row], bool]:
+    """
+    Messages of a booking in chronological order, paged by (timestamp, id):
+    - after_id: only messages newer than that one (incremental poll)
+    - before_id: the `limit` messages right before that one (scroll back)
+    - neither: the latest `limit` messages, or the whole history when limit is None (legacy clients)
+    Only the columns the API returns are selected (no ORM entities, no sender relationship).
+    Returns (rows, has_more) where has_more means the page was cut at `limit`.
+    """
+    if before_id is not None and after_id is not None:
+        raise HTTPException(status_code=400, detail="Use either before_id or after_id, not both")
+
+    stmt = select(*MESSAGE_COLUMNS).where(ChatMessage.booking_request_id == booking_id)
+    position = (ChatMessage.timestamp, ChatMessage.id)
+    cursor_id = after_id if after_id is not None else before_id
+    if cursor_id is not None:
+        cursor_ts = (
+            select(ChatMessage.timestamp)
+            .where(ChatMessage.id == cursor_id, ChatMessage.booking_request_id == booking_id)
+            .scalar_subquery()
+        )
+        if after_id is not None:
+            stmt = stmt.where(tuple_(*position) > tuple_(cursor_ts, cursor_id))
+        else:
+            stmt = stmt.where(tuple_(*position) < tuple_(cursor_ts, cursor_id))
+
+    newest_first = after_id is None and limit is not None
+    order = [c.desc() for c in position] if newest_first else list(position)
+    stmt = stmt.order_by(*order)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    messages = list((await db.execute(stmt)).all())
+    has_more = limit is not None and len(messages) > limit
+    if has_more:
+        messages = messages[:limit]
+    if newest_first:
+        messages.reverse()
+    return messages, has_more
+
+def page_cursors(messages: List[Row], has_more: bool, after_id: Optional[int]) -> dict:
+    return {
+        "has_more": has_more,
+        # older history continues before the first message of this page
+        "next_before_id": messages[0].id if messages and (has_more or after_id is not None) else None,
+        # poll for new messages with after_id=<newest seen>
+        "next_after_id": messages[-1].id if messages else after_id,
+    }
+
+def chat_page_response(
+    rows: List[Row],
     booking: BookingRequest,
-    fallback_artist_name: Optional[str] = None
-) -> Tuple[str, Optional[int]]:
-    """מחזיר (sender_name, sender_user_id_for_response) בהתאם ל-sender_type"""
-    if msg.sender_type == "booker":
-        name = f"{booking.client_first_name} {booking.client_last_name}".strip()
-        return name, None  # למזמין אין User ID
-    # artist
-    name = (msg.sender.name if msg.sender else None) or fallback_artist_name or "Artist"
-    return name, msg.sender_user_id
+    artist_name: Optional[str],
+    has_more: bool,
+    after_id: Optional[int],
+) -> JSONResponse:
+    """
+    Build the ChatResponse body straight from the selected rows. Sender names are resolved
+    once per booking (the only artist on a chat is booking.artist_id), and returning a
+    Response skips FastAPI's second validation pass against response_model.
+    """
+    names = {"booker": booker_display_name(booking), "artist": artist_name or "Artist"}
+    booking_id = booking.id
+    items = [
+        {
+            "id": r.id,
+            "booking_request_id": booking_id,
+            "sender_user_id": r.sender_user_id if r.sender_type == "artist" else None,  # למזמין אין User ID
+            "sender_type": r.sender_type,
+            "message": r.message,
+            "timestamp": r.timestamp.isoformat(),
+            "is_read": r.is_read,
+            "sender_name": names.get(r.sender_type, ""),
+        }
+        for r in rows
+    ]
+    return JSONResponse({"messages": items, "total_count": len(items), **page_cursors(rows, has_more, after_id)})
+
+async def publish_chat_event(booking_id: int, event: dict) -> None:
+    """Push to the booking's WebSocket listeners; never fails the write that triggered it."""
+    try:
+        await chat_hub.publish(booking_id, event)
+    except Exception:
+        chat_logger.exception("Failed to publish chat event", extra={"booking_id": booking_id})
+
+# ---------- Unread counters ----------
+
+# reader -> (whose messages they read, the booking counter of those messages still unread)
+UNREAD_SIDES = {
+    "artist": ("booker", BookingRequest.artist_unread_count),
+    "booker": ("artist", BookingRequest.booker_unread_count),
+}
+
+async def bump_unread(db: AsyncSession, booking_id: int, sender_type: str) -> None:
+    """Count a new message against the other side; runs in the send transaction."""
+    reader = "booker" if sender_type == "artist" else "artist"
+    counter = UNREAD_SIDES[reader][1]
+    await db.execute(
+        update(BookingRequest)
+        .where(BookingRequest.id == booking_id)
+        # pin updated_at: the column's onupdate would otherwise mark the booking itself as modified
+        # (and orphan its cached PDF) on every message
+        .values({counter: counter + 1, BookingRequest.updated_at: BookingRequest.updated_at})
+        .execution_options(synchronize_session=False)
+    )
+
+async def mark_messages_read(db: AsyncSession, booking: BookingRequest, reader: str) -> int:
+    """
+    Mark the other side's messages as read. Polling is read-only while the booking's unread
+    counter is 0, so repeated fetches don't take write locks or commit.
+    Returns how many messages were marked.
+    """
+    sender_type, counter = UNREAD_SIDES[reader]
+    if not getattr(booking, counter.key):
+        return 0
+
+    marked = await db.execute(
+        update(ChatMessage)
+        .where(
+            ChatMessage.booking_request_id == booking.id,
+            ChatMessage.sender_type == sender_type,
+            ChatMessage.is_read == False,  # noqa: E712
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if marked.rowcount:
+        # subtract what we marked rather than zeroing: a message sent meanwhile stays counted
+        await db.execute(
+            update(BookingRequest)
+            .where(BookingRequest.id == booking.id)
+            .values({counter: counter - marked.rowcount, BookingRequest.updated_at: BookingRequest.updated_at})
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+    if marked.rowcount:
+        await publish_chat_event(booking.id, {"type": "read", "reader": reader})
+    return marked.rowcount
 
 # ---------- Send message: artist ----------
 
-def send_artist_message_func(
+async def send_artist_message_func(
     booking_id: int,
     message_data: MessageCreate,
     current_user: User,
-    db: Session
+    db: AsyncSession
 ) -> MessageResponse:
     chat_logger.debug("Sending message from artist" , extra={"booking_id": booking_id , "current_user_id": current_user.id})
-    booking = validate_artist_access(booking_id, current_user, db)
+    booking = await validate_artist_access(booking_id, current_user, db)
 
     chat_message = ChatMessage(
         booking_request_id=booking_id,
@@ -69,31 +224,29 @@ def send_artist_message_func(
     )
     chat_logger.debug("Chat message created" , extra={"chat_message": chat_message})
     db.add(chat_message)
-    db.commit()
-    db.refresh(chat_message)
+    await bump_unread(db, booking_id, "artist")
+    await db.commit()
 
-    sender_name, sender_user_id = resolve_sender_name_and_id(
-        chat_message, booking, fallback_artist_name=current_user.name
-    )
-    chat_logger.debug("Sender name and user id resolved" , extra={"sender_name": sender_name , "sender_user_id": sender_user_id})
-    return MessageResponse(
+    response = MessageResponse(
         id=chat_message.id,
         booking_request_id=chat_message.booking_request_id,
-        sender_user_id=sender_user_id,
+        sender_user_id=current_user.id,
         sender_type= 'artist' ,
   
         message=chat_message.message,
         timestamp=chat_message.timestamp,
         is_read=chat_message.is_read,
-        sender_name=sender_name,
+        sender_name=current_user.name or "Artist",
     )
+    await publish_chat_event(booking_id, {"type": "message", "message": response.model_dump(mode="json")})
+    return response
 
 @router.post("/{booking_id}/messages/artist", response_model=MessageResponse)
 async def send_message_from_artist(
     booking_id: int,
     message_data: MessageCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     chat_logger.debug(
         "Sending message from artist",
@@ -104,7 +257,7 @@ async def send_message_from_artist(
         }
     )
     try:
-        return send_artist_message_func(booking_id, message_data, current_user, db)
+        return await send_artist_message_func(booking_id, message_data, current_user, db)
     except HTTPException:
         raise
     except Exception:
@@ -116,14 +269,14 @@ async def send_message_from_artist(
 
 # ---------- Send message: booker (by token) ----------
 
-def send_message_from_booker_func(
+async def send_message_from_booker_func(
     booking_id: int,
     message_data: MessageCreate,
     chat_token: str,
-    db: Session
+    db: AsyncSession
 ) -> MessageResponse:
     chat_logger.debug("Sending message from booker" , extra={"booking_id": booking_id , "message_data": message_data , "chat_token": chat_token})
-    booking = validate_chat_token(booking_id, chat_token, db)
+    booking = await validate_chat_token(booking_id, chat_token, db)
     chat_logger.debug("Booking validated" , extra={"booking": booking})
     chat_message = ChatMessage(
         booking_request_id=booking_id,
@@ -135,37 +288,37 @@ def send_message_from_booker_func(
     )
 
     db.add(chat_message)
-    db.commit()
-    db.refresh(chat_message)
+    await bump_unread(db, booking_id, "booker")
+    await db.commit()
+    await db.refresh(chat_message)
     chat_logger.debug("Chat message created" , extra={"chat_message": chat_message})
-    sender_name, sender_user_id = resolve_sender_name_and_id(
-        chat_message, booking, fallback_artist_name=None
-    )
 
-    return MessageResponse(
+    response = MessageResponse(
         id=chat_message.id,
         booking_request_id=chat_message.booking_request_id,
-        sender_user_id=sender_user_id,  # יהיה None בצד מזמין
+        sender_user_id=None,  # למזמין אין User ID
         sender_type=chat_message.sender_type,
         message=chat_message.message,
         timestamp=chat_message.timestamp,
         is_read=chat_message.is_read,
-        sender_name=sender_name,
+        sender_name=booker_display_name(booking),
     )
+    await publish_chat_event(booking_id, {"type": "message", "message": response.model_dump(mode="json")})
+    return response
 
 @router.post("/{booking_id}/messages/booker", response_model=MessageResponse)
 async def send_message_from_booker(
     booking_id: int,
     message_data: MessageCreate,
     chat_token: str = Query(..., description="Chat token from booking request"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     chat_logger.debug(
         "Sending message from booker",
         extra={"booking_id": booking_id, "msg_len": len(message_data.message or "")}
     )
     try:
-        return send_message_from_booker_func(booking_id, message_data, chat_token, db)
+        return await send_message_from_booker_func(booking_id, message_data, chat_token, db)
     except HTTPException:
         raise
     except Exception:
@@ -180,59 +333,29 @@ async def send_message_from_booker(
 @router.get("/{booking_id}/messages/artist", response_model=ChatResponse)
 async def get_messages_for_artist(
     booking_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for the full history"),
+    before_id: Optional[int] = Query(None, description="Return messages older than this message id"),
+    after_id: Optional[int] = Query(None, description="Return messages newer than this message id"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     chat_logger.debug("get_messages_for_artist: start", extra={"booking_id": booking_id})
 
     try:
         # בדיקת הרשאות והבאת ה-booking (יזרוק 403/404 אם לא תקין)
-        booking = validate_artist_access(booking_id, current_user, db)
+        booking = await validate_artist_access(booking_id, current_user, db)
 
         # שליפת ההודעות בסדר כרונולוגי
-        messages: List[ChatMessage] = (
-            db.query(ChatMessage)
-            .filter(ChatMessage.booking_request_id == booking_id)
-            .order_by(ChatMessage.timestamp.asc())
-            .all()
-        )
+        messages, has_more = await fetch_messages_page(db, booking_id, limit, before_id, after_id)
 
-        # המרה ל-DTO
-        items: List[MessageResponse] = []
-        for m in messages:
-            sender_name, sender_user_id = resolve_sender_name_and_id(
-                m, booking, fallback_artist_name=current_user.name
-            )
-            items.append(
-                MessageResponse(
-                    id=m.id,
-                    booking_request_id=m.booking_request_id,
-                    sender_user_id=sender_user_id,
-                    sender_type=m.sender_type,
-                    message=m.message,
-                    timestamp=m.timestamp,
-                    is_read=m.is_read,
-                    sender_name=sender_name,
-                )
-            )
-
-        # סימון כהנקראו את הודעות המזמין (יעיל ובטוח)
-        (
-            db.query(ChatMessage)
-            .filter(
-                ChatMessage.booking_request_id == booking_id,
-                ChatMessage.sender_type == "booker",
-                ChatMessage.is_read == False,  # noqa: E712
-            )
-            .update({"is_read": True}, synchronize_session=False)
-        )
-        db.commit()
+        # סימון כהנקראו את הודעות המזמין (רק כשיש מה לסמן)
+        await mark_messages_read(db, booking, "artist")
 
         chat_logger.info(
             "get_messages_for_artist: success",
-            extra={"booking_id": booking_id, "count": len(items)},
+            extra={"booking_id": booking_id, "count": len(messages)},
         )
-        return ChatResponse(messages=items, total_count=len(items))
+        return chat_page_response(messages, booking, current_user.name, has_more, after_id)
 
     except HTTPException:
         # חשוב לתת ל-FastAPI לטפל ב-HTTPException כפי שהוא
@@ -252,57 +375,6 @@ async def get_messages_for_artist(
 
 
 
-# @router.get("/{booking_id}/messages/artist", response_model=ChatResponse)
-# async def get_messages_for_artist(
-#     booking_id: int,
-#     current_user: User = Depends(get_current_user),
-#     db: Session = Depends(get_db),
-# ):
-    chat_logger.debug("Sending message from booker" , extra={"booking_id": booking_id })
-    try:
-        booking = validate_artist_access(booking_id, current_user, db)
-
-        messages = (
-            db.query(ChatMessage)
-            .filter(ChatMessage.booking_request_id == booking_id)
-            .order_by(ChatMessage.timestamp.asc())
-            .all()
-        )
-
-        items: List[MessageResponse] = []
-        for m in messages:
-            sender_name, sender_user_id = resolve_sender_name_and_id(
-                m, booking, fallback_artist_name=current_user.name
-            )
-            items.append(
-                MessageResponse(
-                    id=m.id,
-                    booking_request_id=m.booking_request_id,
-                    sender_user_id=sender_user_id,  
-                    sender_type=m.sender_type,
-                    message=m.message,
-                    timestamp=m.timestamp,
-                    is_read=m.is_read,
-                    sender_name=sender_name,
-                )
-            )
-
-        # סימון כהנקראו את הודעות המזמין
-        db.query(ChatMessage).filter(
-            ChatMessage.booking_request_id == booking_id,
-            ChatMessage.sender_type == "booker",
-            ChatMessage.is_read == False
-        ).update({"is_read": True})
-        db.commit()
-        chat_logger.debug("Messages fetched successfully" , extra={"booking_id": booking_id , "messages": messages})
-        return ChatResponse(messages=items, total_count=len(items))
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        chat_logger.error("Error getting messages for artist" , extra={"booking_id": booking_id , "error": e})
-        raise HTTPException(status_code=500, detail="Failed to get messages")
-
 # ---------- Get messages: booker side (by token) ----------
 
 @router.get("/{booking_id}/getmessages/booker", response_model=ChatResponse)
@@ -310,54 +382,27 @@ async def get_messages_for_booker(
     
     booking_id: int,
     chat_token: str = Query(..., description="Chat token from booking request"),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for the full history"),
+    before_id: Optional[int] = Query(None, description="Return messages older than this message id"),
+    after_id: Optional[int] = Query(None, description="Return messages newer than this message id"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     chat_logger.debug("Getting messages for booker" , extra={"booking_id": booking_id , "chat_token": chat_token})
 
     try:
-        booking = validate_chat_token(booking_id, chat_token, db)
+        booking = await validate_chat_token(booking_id, chat_token, db)
 
-        messages = (
-            db.query(ChatMessage)
-            .filter(ChatMessage.booking_request_id == booking_id)
-            .order_by(ChatMessage.timestamp.asc())
-            .all()
-        )
+        messages, has_more = await fetch_messages_page(db, booking_id, limit, before_id, after_id)
 
-        # שם האמן למקרה שאין relationship טמון באובייקט
-        artist_name = (
-            booking.artist.user.name
-            if booking.artist and booking.artist.user
-            else "Artist"
+        # שם האמן פעם אחת ל-booking (booking.artist_id == users.id של האמן)
+        artist_name = await db.scalar(
+            select(User.name).where(User.id == booking.artist_id)
         )
 
-        items: List[MessageResponse] = []
-        for m in messages:
-            sender_name, sender_user_id = resolve_sender_name_and_id(
-                m, booking, fallback_artist_name=artist_name
-            )
-            items.append(
-                MessageResponse(
-                    id=m.id,
-                    booking_request_id=m.booking_request_id,
-                    sender_user_id=sender_user_id,
-                    message=m.message,
-                    timestamp=m.timestamp,
-                    is_read=m.is_read,
-                    sender_name=sender_name,
-                    sender_type=m.sender_type,
-                )
-            )
-
-        # סימון כהנקראו את הודעות האמן
-        db.query(ChatMessage).filter(
-            ChatMessage.booking_request_id == booking_id,
-            ChatMessage.sender_type == "artist",
-            ChatMessage.is_read == False
-        ).update({"is_read": True})
-        db.commit()
-        chat_logger.debug("Messages fetched successfully" , extra={"booking_id": booking_id , "messages": messages})
-        return ChatResponse(messages=items, total_count=len(items))
+        # סימון כהנקראו את הודעות האמן (רק כשיש מה לסמן)
+        await mark_messages_read(db, booking, "booker")
+        chat_logger.debug("Messages fetched successfully" , extra={"booking_id": booking_id , "count": len(messages)})
+        return chat_page_response(messages, booking, artist_name, has_more, after_id)
 
     except HTTPException:
         raise
@@ -365,41 +410,190 @@ async def get_messages_for_booker(
         chat_logger.error("Error getting messages for booker" , extra={"booking_id": booking_id , "chat_token": chat_token , "error": e})
         raise HTTPException(status_code=500, detail="Failed to get messages")
 
+# ---------- Unread badges: all of the artist's bookings ----------
 
+UNREAD_PREVIEW_CHARS = 120
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+@router.get("/unread", response_model=UnreadSummaryResponse)
+async def get_unread_summary(
+    only_unread: bool = Query(False, description="Skip bookings with nothing unread"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Unread count and last-message preview for every booking of the artist, in one query:
+    counts come from booking_requests.artist_unread_count (kept by the send / read paths),
+    the preview from a row_number() window over ix_chat_messages_booking_ts. Nothing is marked read.
+    """
+    ranked = (
+        select(
+            ChatMessage.booking_request_id,
+            ChatMessage.id,
+            ChatMessage.sender_type,
+            func.substr(ChatMessage.message, 1, UNREAD_PREVIEW_CHARS).label("preview"),
+            ChatMessage.timestamp,
+            func.row_number().over(
+                partition_by=ChatMessage.booking_request_id,
+                order_by=(ChatMessage.timestamp.desc(), ChatMessage.id.desc()),
+            ).label("rn"),
+        )
+        .join(BookingRequest, BookingRequest.id == ChatMessage.booking_request_id)
+        .where(BookingRequest.artist_id == current_user.id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            BookingRequest.id,
+            BookingRequest.client_first_name,
+            BookingRequest.client_last_name,
+            BookingRequest.event_date,
+            BookingRequest.status,
+            BookingRequest.artist_unread_count,
+            ranked.c.id.label("message_id"),
+            ranked.c.sender_type,
+            ranked.c.preview,
+            ranked.c.timestamp,
+        )
+        .outerjoin(ranked, and_(ranked.c.booking_request_id == BookingRequest.id, ranked.c.rn == 1))
+        .where(BookingRequest.artist_id == current_user.id)
+        .order_by(ranked.c.timestamp.desc().nulls_last(), BookingRequest.id.desc())
+    )
+    if only_unread:
+        stmt = stmt.where(BookingRequest.artist_unread_count > 0)
+
+    bookings = []
+    for r in (await db.execute(stmt)).all():
+        bookings.append({
+            "booking_id": r.id,
+            "client_name": f"{r.client_first_name} {r.client_last_name}".strip(),
+            "event_date": r.event_date,
+            "status": r.status,
+            "unread_count": r.artist_unread_count,
+            "last_message": {
+                "id": r.message_id,
+                "sender_type": r.sender_type,
+                "message": r.preview,
+                "timestamp": r.timestamp,
+            } if r.message_id is not None else None,
+        })
+    chat_logger.debug("get_unread_summary", extra={"artist_id": current_user.id, "bookings": len(bookings)})
+    return UnreadSummaryResponse(bookings=bookings, total_unread=sum(b["unread_count"] for b in bookings))
+
+# ---------- Full-text search over the artist's chats ----------
+
+SEARCH_MAX_PAGE = 50
+SEARCH_MAX_OFFSET = 1000
+SEARCH_MAX_TERMS = 8
+SEARCH_MARK_START, SEARCH_MARK_END = "<<", ">>"
+
+# bm25(): lower is better. chat_messages_fts is kept in sync by triggers (CHAT_FTS_SQLITE)
+_SEARCH_SQLITE = text("""
+    SELECT m.id AS message_id, m.booking_request_id AS booking_id, m.sender_type, m.timestamp,
+           b.client_first_name, b.client_last_name,
+           snippet(chat_messages_fts, 0, :mark_start, :mark_end, '…', 16) AS snippet
+    FROM chat_messages_fts
+    JOIN chat_messages m ON m.id = chat_messages_fts.rowid
+    JOIN booking_requests b ON b.id = m.booking_request_id
+    WHERE chat_messages_fts MATCH :query AND b.artist_id = :artist_id
+    ORDER BY bm25(chat_messages_fts), m.id DESC
+    LIMIT :limit OFFSET :offset
+""")
+
+# the to_tsvector() expression must match ix_chat_messages_fts (CHAT_FTS_POSTGRES)
+_SEARCH_POSTGRES = text("""
+    SELECT m.id AS message_id, m.booking_request_id AS booking_id, m.sender_type, m.timestamp,
+           b.client_first_name, b.client_last_name,
+           ts_headline('simple', m.message, q.query,
+                       'StartSel=' || :mark_start || ', StopSel=' || :mark_end || ', MaxWords=20, MinWords=5') AS snippet
+    FROM chat_messages m
+    JOIN booking_requests b ON b.id = m.booking_request_id,
+         to_tsquery('simple', :query) AS q(query)
+    WHERE to_tsvector('simple', m.message) @@ q.query AND b.artist_id = :artist_id
+    ORDER BY ts_rank(to_tsvector('simple', m.message), q.query) DESC, m.id DESC
+    LIMIT :limit OFFSET :offset
+""")
+
+def search_terms(q: str) -> List[str]:
+    """Words of the user's query; operators and punctuation are never passed to the FTS parser."""
+    return re.findall(r"\w+", q.lower())[:SEARCH_MAX_TERMS]
+
+def build_fts_query(terms: List[str], dialect: str) -> str:
+    """All terms must match; the last one is a prefix so results show up while typing."""
+    if dialect == "postgresql":
+        return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    return " ".join([f'"{t}"' for t in terms[:-1]] + [f'"{terms[-1]}"*'])
+
+@router.get("/search", response_model=ChatSearchResponse)
+async def search_messages(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for"),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_PAGE),
+    offset: int = Query(0, ge=0, le=SEARCH_MAX_OFFSET),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Ranked search over the messages of the current artist's bookings, with highlighted snippets."""
+    terms = search_terms(q)
+    if not terms:
+        return ChatSearchResponse(hits=[])
+
+    dialect = db.get_bind().dialect.name
+    stmt = _SEARCH_POSTGRES if dialect == "postgresql" else _SEARCH_SQLITE
+    rows = (await db.execute(stmt, {
+        "query": build_fts_query(terms, dialect),
+        "artist_id": current_user.id,
+        "mark_start": SEARCH_MARK_START,
+        "mark_end": SEARCH_MARK_END,
+        "limit": limit + 1,
+        "offset": offset,
+    })).all()
+
+    has_more = len(rows) > limit
+    hits = [
+        {
+            "message_id": r.message_id,
+            "booking_id": r.booking_id,
+            "client_name": f"{r.client_first_name} {r.client_last_name}".strip(),
+            "sender_type": r.sender_type,
+            "timestamp": r.timestamp,
+            "snippet": r.snippet,
+        }
+        for r in rows[:limit]
+    ]
+    chat_logger.debug("search_messages", extra={"artist_id": current_user.id, "terms": len(terms), "hits": len(hits)})
+    return ChatSearchResponse(hits=hits, has_more=has_more, next_offset=offset + limit if has_more else None)
+
+# ---------- Real-time: WebSocket per booking ----------
+
+async def authorize_chat_socket(websocket: WebSocket, booking_id: int, chat_token: Optional[str]) -> Optional[str]:
+    """Same access rules as the HTTP routes: booker by chat_token, artist by the access_token cookie."""
+    async with AsyncReadOnlySessionLocal() as db:   # short-lived: not held for the socket's lifetime
+        try:
+            if chat_token:
+                await validate_chat_token(booking_id, chat_token, db)
+                return "booker"
+            token = websocket.cookies.get("access_token")
+            if not token:
+                return None
+            user = await authenticate_token(token, db)
+            await validate_artist_access(booking_id, user, db)
+            return "artist"
+        except HTTPException:
+            return None
+
+@router.websocket("/{booking_id}/ws")
+async def chat_websocket(
+    websocket: WebSocket,
+    booking_id: int,
+    chat_token: Optional[str] = Query(None, description="Chat token (booker side)"),
+):
+    """
+    Server push for one booking's chat: {"type": "message", "message": MessageResponse}
+    and {"type": "read", "reader": "artist" | "booker"}. Sending stays on the POST routes.
+    """
+    role = await authorize_chat_socket(websocket, booking_id, chat_token)
+    if role is None:
+        chat_logger.warning("chat_websocket: unauthorized", extra={"booking_id": booking_id})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await chat_hub.serve(booking_id, websocket)
@@ -0,0 +1,46 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import get_current_user
+from app.core.db import get_async_db
+from app.core.fx import load_rates_in_session, parse_rates
+from app.models.models import User
+from app.schemas.auth import FxRatesLoadResponse, FxRatesUpload
+from app.settings import settings
+
+fx_logger = logging.getLogger("app.fx")
+router = APIRouter()
+
+
+def is_admin(user: User) -> bool:
+    admin_emails = {e.strip().lower() for e in settings.ADMIN_EMAILS.split(",") if e.strip()}
+    return user.role == "admin" or user.email.lower() in admin_emails
+
+
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    if not is_admin(current_user):
+        fx_logger.error("FX rates upload by non-admin", extra={"current_user_id": current_user.id})
+        raise HTTPException(status_code=403, detail="Admin only")
+    return current_user
+
+
+@router.post("/rates", response_model=FxRatesLoadResponse, status_code=200, summary="Load FX rates")
+async def upload_fx_rates(
+    payload: FxRatesUpload,
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Upsert exchange rates (USD per unit, per currency and day) — same as
+    `python -m app.core.fx load rates.csv`. Committed by get_async_db, which also clears
+    the rate cache (after the commit, so no request re-caches the old rates).
+    """
+    try:
+        rates = parse_rates(r.model_dump() for r in payload.rates)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    loaded = await db.run_sync(load_rates_in_session, rates)
+    fx_logger.info("FX rates uploaded", extra={"current_user_id": current_user.id, "rows": loaded})
+    return FxRatesLoadResponse(loaded=loaded)
@@ -1,16 +1,25 @@
-from jinja2 import Environment, FileSystemLoader
-#from weasyprint import HTML
 from io import BytesIO
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from google.auth.transport.requests import Request as GoogleAuthRequest
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
+from email.message import Message
+from typing import List, Optional, Union
 import base64
+import json
 import logging
+import re
+import threading
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.pdf import pdf_renderer, render_booking_summary_html
 
 # Setup logging
 mail_logger = logging.getLogger("app.mail")
@@ -20,39 +29,196 @@ CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 REFRESH_TOKEN = os.getenv("GOOGLE_REFRESH_TOKEN")
 SENDER_EMAIL = os.getenv("GMAIL_SENDER")
+# overridable so the client can run against a local stub server
+GOOGLE_TOKEN_URI = os.getenv("GOOGLE_TOKEN_URI", "https://oauth2.googleapis.com/token")
+GMAIL_API_BASE = os.getenv("GMAIL_API_BASE", "https://gmail.googleapis.com")
+GMAIL_BATCH_LIMIT = 50   # Gmail recommends at most 50 requests per batch
+
+
+class GmailError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"Gmail API error {status}: {detail[:500]}")
+        self.status = status
+
+
+class GmailClient:
+    """
+    Long-lived Gmail API client, shared by all threads of the process.
+
+    - The OAuth access token is cached until it expires and refreshed under a lock, so
+      concurrent senders trigger one refresh-token exchange, not one each.
+    - One requests.Session keeps a keep-alive connection pool to Google (`pool_size`
+      connections) instead of a new HTTP stack + discovery document per email.
+    - send_batch() sends up to GMAIL_BATCH_LIMIT messages in one /batch request.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        refresh_token: str,
+        sender: str,
+        token_uri: str = GOOGLE_TOKEN_URI,
+        api_base: str = GMAIL_API_BASE,
+        pool_size: int = 10,
+        timeout: float = 30.0,
+    ):
+        self.sender = sender
+        self.api_base = api_base.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._creds = Credentials(
+            None,
+            refresh_token=refresh_token,
+            token_uri=token_uri,
+            client_id=client_id,
+            client_secret=client_secret,
+        )
+        self._token_lock = threading.Lock()
+        self.token_refreshes = 0
+
+    def _access_token(self, force_refresh: bool = False) -> str:
+        with self._token_lock:
+            if force_refresh or not self._creds.valid:
+                self._creds.refresh(GoogleAuthRequest(self.session))
+                self.token_refreshes += 1
+                mail_logger.debug("Gmail access token refreshed", extra={"expiry": self._creds.expiry})
+            return self._creds.token
+
+    def _post(self, path: str, headers: Optional[dict] = None, **kwargs) -> requests.Response:
+        """POST with the cached token; a 401 (token revoked / expired early) refreshes once and retries."""
+        for attempt in range(2):
+            auth = {"Authorization": f"Bearer {self._access_token(force_refresh=attempt > 0)}"}
+            resp = self.session.post(
+                f"{self.api_base}{path}", headers={**(headers or {}), **auth}, timeout=self.timeout, **kwargs
+            )
+            if resp.status_code != 401:
+                break
+        if resp.status_code >= 400:
+            raise GmailError(resp.status_code, resp.text)
+        return resp
+
+    @staticmethod
+    def encode(message: Message) -> dict:
+        return {"raw": base64.urlsafe_b64encode(message.as_bytes()).decode()}
+
+    def send(self, message: Message) -> str:
+        """Send one MIME message; returns the Gmail message id."""
+        return self._post("/gmail/v1/users/me/messages/send", json=self.encode(message)).json()["id"]
+
+    def send_batch(self, messages: List[Message]) -> List[Union[str, GmailError]]:
+        """
+        Send messages through the batch endpoint. Returns, in input order, the message id
+        or the GmailError of each one — one failed message doesn't fail the others.
+        """
+        results: List[Union[str, GmailError]] = []
+        for start in range(0, len(messages), GMAIL_BATCH_LIMIT):
+            results.extend(self._send_batch_chunk(messages[start:start + GMAIL_BATCH_LIMIT]))
+        return results
+
+    def _send_batch_chunk(self, messages: List[Message]) -> List[Union[str, GmailError]]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for i, message in enumerate(messages):
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item-{i}>\r\n\r\n"
+                "POST /gmail/v1/users/me/messages/send\r\n"
+                "Content-Type: application/json\r\n\r\n"
+                f"{json.dumps(self.encode(message))}\r\n"
+            )
+        body = "".join(parts) + f"--{boundary}--\r\n"
+        resp = self._post(
+            "/batch/gmail/v1",
+            data=body.encode(),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        return self._parse_batch_response(resp, len(messages))
+
+    @staticmethod
+    def _parse_batch_response(resp: requests.Response, count: int) -> List[Union[str, GmailError]]:
+        match = re.search(r'boundary="?([^";]+)"?', resp.headers.get("Content-Type", ""))
+        if not match:
+            raise GmailError(resp.status_code, "batch response without multipart boundary")
+        results: List[Union[str, GmailError]] = [GmailError(0, "missing from batch response")] * count
+        text = resp.text.replace("\r\n", "\n")
+        for part in text.split(f"--{match.group(1)}"):
+            part = part.strip()
+            if not part or part == "--":
+                continue
+            outer, _, inner = part.partition("\n\n")
+            cid = re.search(r"Content-ID:\s*<response-item-(\d+)>", outer, re.IGNORECASE)
+            status_line = re.match(r"HTTP/[\d.]+ (\d+)", inner)
+            if not cid or not status_line:
+                continue
+            index, status = int(cid.group(1)), int(status_line.group(1))
+            payload = inner.partition("\n\n")[2].strip()
+            if index >= count:
+                continue
+            if status >= 400:
+                results[index] = GmailError(status, payload)
+            else:
+                results[index] = json.loads(payload)["id"]
+        return results
+
+    def close(self) -> None:
+        self.session.close()
 
 
-def generate_pdf_in_memory(artist_name: str, booking_details: dict, chat_url: str) -> BytesIO:
+_gmail_client: Optional[GmailClient] = None
+_gmail_client_lock = threading.Lock()
+
+
+def get_gmail_client() -> GmailClient:
+    """Process-wide GmailClient, created on first use from the GOOGLE_* / GMAIL_* env vars."""
+    global _gmail_client
+    if _gmail_client is None:
+        with _gmail_client_lock:
+            if _gmail_client is None:
+                if not all([CLIENT_ID, CLIENT_SECRET, REFRESH_TOKEN, SENDER_EMAIL]):
+                    raise ValueError("Missing required Gmail API credentials in environment variables")
+                _gmail_client = GmailClient(CLIENT_ID, CLIENT_SECRET, REFRESH_TOKEN, SENDER_EMAIL)
+    return _gmail_client
+
+
+def build_pdf_message(to_email: str, subject: str, body: str, pdf_content: bytes, pdf_filename: str, sender: str) -> MIMEMultipart:
+    message = MIMEMultipart()
+    message['to'] = to_email
+    message['from'] = sender
+    message['subject'] = subject
+
+    message.attach(MIMEText(body, 'plain'))
+
+    # צרף את ה־PDF (מתוך זיכרון, בלי לכתוב לקובץ)
+    pdf_attachment = MIMEApplication(pdf_content, _subtype="pdf")
+    pdf_attachment.add_header('Content-Disposition', 'attachment', filename=pdf_filename)
+    message.attach(pdf_attachment)
+    return message
+
+
+def generate_pdf_in_memory(
+    artist_name: str,
+    booking_details: dict,
+    chat_url: str,
+    booking_id: Optional[int] = None,
+    updated_at: Optional[Union[datetime, str]] = None,
+) -> BytesIO:
     mail_logger.debug("Generating PDF in memory" , extra={"artist_name": artist_name , "booking_details": booking_details , "chat_url": chat_url})
-    # הגדרת תיקיית התבניות
-    template_folder = os.path.join(os.path.dirname(__file__), "../assest")
-    env = Environment(loader=FileSystemLoader(template_folder))
-    template = env.get_template("template_booking_summary.html")
-
-    # יצירת תאריך ושעה
-    now = datetime.now()
-    date_str = now.strftime("%Y-%m-%d")
-    time_str = now.strftime("%H:%M")
-
-    # רינדור HTML מהתבנית
-    html_content = template.render(
-        artist_name=artist_name,
-        booking_details=booking_details,
-        chat_url=chat_url or "",
-        date=date_str,
-        time=time_str
-    )
+    # תבנית מקומפלת פעם אחת לתהליך (app.core.pdf); WeasyPrint רץ ב-process pool
+    html_factory = lambda: render_booking_summary_html(artist_name, booking_details, chat_url, updated_at)
 
-    # יצירת PDF בזיכרון (לשליחה במייל)
-    pdf_io = BytesIO()
-    HTML(string=html_content).write_pdf(pdf_io)
-    pdf_io.seek(0)
+    if booking_id is not None and updated_at is not None:
+        # cache בדיסק לפי booking + updated_at: שליחה חוזרת לא מרנדרת שוב
+        pdf = pdf_renderer.booking_pdf(booking_id, updated_at, html_factory)
+    else:
+        pdf = pdf_renderer.render(html_factory())
 
-    # שמירת הקובץ גם בדיסק באותה תיקייה
-    # filename = f"booking_summary_{now.strftime('%Y%m%d_%H%M%S')}.pdf"
-    # output_path = os.path.join(template_folder, filename)
-    # HTML(string=html_content).write_pdf(output_path)
-    mail_logger.debug("PDF generated successfully" , extra={"pdf_io": pdf_io})
+    pdf_io = BytesIO(pdf)
+    mail_logger.debug("PDF generated successfully" , extra={"size": len(pdf)})
     return pdf_io
 
 
@@ -77,42 +243,14 @@ def send_pdf_via_gmail(to_email: str, subject: str, body: str, pdf_content: byte
     """
     try:
         mail_logger.debug("Sending email to: {to_email}" , extra={"to_email": to_email})
-        
-        # בדיקת משתנים נדרשים
-        if not all([CLIENT_ID, CLIENT_SECRET, REFRESH_TOKEN, SENDER_EMAIL]):
-            raise ValueError("Missing required Gmail API credentials in environment variables")
-        
-        # יצירת credentials מ־.env
-        creds = Credentials(
-            None,
-            refresh_token=REFRESH_TOKEN,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=CLIENT_ID,
-            client_secret=CLIENT_SECRET
-        )
-        service = build('gmail', 'v1', credentials=creds)
-
-        # בנה הודעת מייל עם קובץ מצורף
-        message = MIMEMultipart()
-        message['to'] = to_email
-        message['from'] = SENDER_EMAIL
-        message['subject'] = subject
-
-        message.attach(MIMEText(body, 'plain'))
-
-        # צרף את ה־PDF (מתוך זיכרון, בלי לכתוב לקובץ)
-        pdf_attachment = MIMEApplication(pdf_content, _subtype="pdf")
-        pdf_attachment.add_header('Content-Disposition', 'attachment', filename=pdf_filename)
-        message.attach(pdf_attachment)
-
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        send_message = service.users().messages().send(
-            userId="me",
-            body={'raw': raw_message}
-        ).execute()
-        
-        mail_logger.debug("Email sent successfully" , extra={"send_message": send_message})
-        return send_message['id']
+
+        # client משותף: token שמור + connection pool (בודק גם שה-credentials קיימים)
+        client = get_gmail_client()
+        message = build_pdf_message(to_email, subject, body, pdf_content, pdf_filename, sender=client.sender)
+        message_id = client.send(message)
+
+        mail_logger.debug("Email sent successfully" , extra={"message_id": message_id})
+        return message_id
         
     except Exception as e:
         mail_logger.exception("Failed to send email", extra={"to_email": to_email})
@@ -120,11 +258,55 @@ def send_pdf_via_gmail(to_email: str, subject: str, body: str, pdf_content: byte
         mail_logger.error("Failed to send email" , extra={"to_email": to_email , "error": e})
         raise
 
+def build_booking_confirmation_message(
+    artist_name: str,
+    booking_details: dict,
+    client_email: str,
+    chat_url: str = None,
+    booking_id: Optional[int] = None,
+    updated_at: Optional[Union[datetime, str]] = None,
+    sender: Optional[str] = None,
+) -> MIMEMultipart:
+    """
+    בניית מייל אישור ההזמנה (MIME, עם ה-PDF מצורף) בלי לשלוח אותו —
+    ה-outbox אוסף כמה כאלה לבקשת batch אחת (GmailClient.send_batch)
+    """
+    # יצירת PDF בזיכרון
+    pdf_io = generate_pdf_in_memory(
+        artist_name=artist_name,
+        booking_details=booking_details,
+        chat_url=chat_url or "",
+        booking_id=booking_id,
+        updated_at=updated_at,
+    )
+
+    # הכנת תוכן המייל
+    subject = f"Booking Confirmation - {artist_name}"
+    body = f"""
+Dear Client,
+
+Thank you for your booking request with {artist_name}.
+
+Please find attached the booking summary with all the details of your request.
+
+If you have any questions, please feel free to contact us.
+
+Best regards,
+ArtistryHub Team
+"""
+    filename = f"booking_summary_{artist_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    return build_pdf_message(
+        client_email, subject, body, pdf_io.getvalue(), filename, sender=sender or get_gmail_client().sender
+    )
+
+
 def send_booking_confirmation_email(
     artist_name: str, 
     booking_details: dict, 
     client_email: str,
-    chat_url: str = None
+    chat_url: str = None,
+    booking_id: Optional[int] = None,
+    updated_at: Optional[Union[datetime, str]] = None,
 ) -> str:
     """
     שליחת מייל אישור הזמנה עם PDF מצורף
@@ -134,6 +316,7 @@ def send_booking_confirmation_email(
         booking_details: פרטי ההזמנה (dict)
         client_email: כתובת מייל של הלקוח
         chat_url: קישור לצ'אט (אופציונלי)
+        booking_id, updated_at: מפתח ל-cache של ה-PDF (אופציונלי)
         
     Returns:
         message_id: מזהה ההודעה שנשלחה
@@ -143,39 +326,12 @@ def send_booking_confirmation_email(
     """
     try:
         mail_logger.debug("Sending booking confirmation email" , extra={"artist_name": artist_name , "booking_details": booking_details , "client_email": client_email , "chat_url": chat_url})
-        # יצירת PDF בזיכרון
-        pdf_io = generate_pdf_in_memory(
-            artist_name=artist_name,
-            booking_details=booking_details,
-            chat_url=chat_url or ""
-        )
-        
-        # הכנת תוכן המייל
-        subject = f"Booking Confirmation - {artist_name}"
-        body = f"""
-Dear Client,
-
-Thank you for your booking request with {artist_name}.
-
-Please find attached the booking summary with all the details of your request.
-
-If you have any questions, please feel free to contact us.
-
-Best regards,
-ArtistryHub Team
-"""
-        
-        # שליחת המייל עם PDF מצורף
-        pdf_content = pdf_io.getvalue()
-        filename = f"booking_summary_{artist_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        
-        message_id = send_pdf_via_gmail(
-            to_email=client_email,
-            subject=subject,
-            body=body,
-            pdf_content=pdf_content,
-            pdf_filename=filename
+        # client משותף: token שמור + connection pool
+        client = get_gmail_client()
+        message = build_booking_confirmation_message(
+            artist_name, booking_details, client_email, chat_url, booking_id, updated_at, sender=client.sender
         )
+        message_id = client.send(message)
         
         mail_logger.debug("Booking confirmation sent to {client_email}" , extra={"client_email": client_email})
         return message_id
@@ -184,6 +340,3 @@ ArtistryHub Team
         mail_logger.exception("Failed to send booking confirmation", extra={"client_email": client_email   , "error": e})
         mail_logger.error("Failed to send booking confirmation" , extra={"client_email": client_email , "error": e})
         raise
-
-
-
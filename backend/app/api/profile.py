@@ -1,17 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import HTMLResponse
 from fastapi import Form
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
 from typing import List
 from datetime import date, datetime
 from decimal import Decimal
 from fastapi.encoders import jsonable_encoder
 
-from app.core.db import get_db
+from app.core.db import get_async_db, get_async_read_db
 from app.models.models import ArtistProfile, User, BookingRequest
-from app.schemas.auth import ArtistProfileUpdate, ArtistProfileOut, ArtistDashboardResponse, BookingRequestResponse  , ArtistDashboardStats
+from app.schemas.auth import ArtistProfileUpdate, ArtistProfileOut, ArtistDashboardResponse, BookingRequestResponse  , ArtistDashboardStats, EarningsPoint, EarningsSeriesResponse
 from app.api.auth import get_current_user
+from app.api.bookings import encode_cursor
+from app.core.fx import BASE_CURRENCY, convert_amounts
+from app.core.stats import count_periods, earnings_series, load_artist_stats
+from app.settings import settings
 import logging
 
 profile_logger = logging.getLogger("app.profile")
@@ -22,13 +27,12 @@ router = APIRouter()
 @router.get("/me", response_model=ArtistProfileOut, status_code=200, summary="Get artist profile")
 async def get_artist_profile(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     profile_logger.debug("Getting artist profile" , extra={"current_user_id": current_user.id})
-    profile = (
-        db.query(ArtistProfile)
-          .filter(ArtistProfile.user_id == current_user.id)
-          .first()
+    profile = await db.scalar(
+        select(ArtistProfile)
+          .where(ArtistProfile.user_id == current_user.id)
     )
     if profile is None:
         profile_logger.error("Profile not found" , extra={"current_user_id": current_user.id})
@@ -43,33 +47,17 @@ async def get_artist_profile(
 
 @router.get("/dashboard", response_model=ArtistDashboardResponse, status_code=200, summary="Get artist dashboard data")
 async def get_artist_dashboard(
+    bookings_limit: int = Query(settings.DASHBOARD_BOOKINGS_LIMIT, ge=0, le=200, description="Latest bookings to include"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     profile_logger.debug("Getting artist dashboard" , extra={"current_user_id": current_user.id})
     try:
         # פרופיל אמן
-        profile = db.query(ArtistProfile).filter(ArtistProfile.user_id == current_user.id).first()
+        profile = await db.scalar(select(ArtistProfile).where(ArtistProfile.user_id == current_user.id))
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
 
-        # כל הבקינגים לאמן
-        bookings = (
-            db.query(BookingRequest)
-            .filter(BookingRequest.artist_id == current_user.id)
-            .order_by(BookingRequest.event_date.desc())
-            .all()
-        )
-
-        # סטטיסטיקות
-        total_requests = len(bookings)
-        pending = sum(1 for b in bookings if b.status == "pending")
-        accepted = sum(1 for b in bookings if b.status == "accepted")
-        cancelled = sum(1 for b in bookings if b.status == "cancelled")
-
-        today = date.today()
-        active_bookings = sum(1 for b in bookings if b.status == "accepted" and b.event_date >= today)
-
         def to_float(x) -> float:
             if x is None:
                 return 0.0
@@ -77,26 +65,52 @@ async def get_artist_dashboard(
                 return float(x)
             return float(x)
 
-        total_earnings = to_float(sum((b.budget or 0) for b in bookings if b.status == "accepted"))
-        now = datetime.now()
-        this_month_earnings = to_float(sum(
-            (b.budget or 0) for b in bookings
-            if b.status == "accepted" and b.event_date.month == now.month and b.event_date.year == now.year
-        ))
-        avg_fee = total_earnings / accepted if accepted > 0 else 0.0
+        # סטטיסטיקות — שורה מוכנה מ-artist_stats + הכנסות לפי חודש (app.core.stats), בלי לסרוק את הבקינגים
+        today = date.today()
+        row = await load_artist_stats(db, current_user.id, today)
+        # הכנסות מומרות למטבע של האמן (app.core.fx) — שליפת שערים אחת לכל מטבע/חודש
+        month = today.replace(day=1)
+        display_currency = profile.currency or BASE_CURRENCY
+        revenue = row["revenue"]
+        converted = await convert_amounts(db, [(r.currency, r.month, r.amount) for r in revenue], display_currency)
+        total_earnings = this_month_earnings = 0.0
+        earned = 0   # accepted + completed, with a known rate
+        unconverted = {}
+        for r, amount in zip(revenue, converted):
+            if amount is None:
+                unconverted[r.currency] = unconverted.get(r.currency, 0.0) + to_float(r.amount)
+                continue
+            total_earnings += to_float(amount)
+            earned += r.bookings
+            if r.month == month:
+                this_month_earnings += to_float(amount)
+        accepted = row["accepted_count"]
+        avg_fee = total_earnings / earned if earned > 0 else 0.0
 
         stats = ArtistDashboardStats(
-            total_requests=total_requests,
-            active_bookings=active_bookings,
-            pending=pending,
+            total_requests=row["total_requests"],
+            active_bookings=row["active_upcoming"],
+            pending=row["pending_count"],
             accepted=accepted,
-            cancelled=cancelled,
-            total_earnings=total_earnings,
-            this_month_earnings=this_month_earnings,
+            cancelled=row["cancelled_count"],
+            total_earnings=round(total_earnings, 2),
+            this_month_earnings=round(this_month_earnings, 2),
             avg_booking_fee=round(avg_fee, 2),
-            total_bookings=accepted,
+            total_bookings=earned,
+            currency=display_currency,
+            unconverted_earnings=unconverted,
         )
 
+        # הבקינגים האחרונים בלבד; את השאר דרך GET /api/bookings/artist/{id} עם bookings_next_cursor
+        bookings = (await db.scalars(
+            select(BookingRequest)
+            .where(BookingRequest.artist_id == current_user.id)
+            .order_by(BookingRequest.event_date.desc(), BookingRequest.event_time.desc(), BookingRequest.id.desc())
+            .limit(bookings_limit + 1)
+        )).all()
+        bookings_has_more = len(bookings) > bookings_limit
+        bookings = bookings[:bookings_limit]
+
         # המרת BOOKINGS לפידנטיק (v2): model_validate(..., from_attributes=True)
         serialized_bookings: List[BookingRequestResponse] = [
             BookingRequestResponse.model_validate(b, from_attributes=True) for b in bookings
@@ -116,12 +130,15 @@ async def get_artist_dashboard(
             created_at=profile.created_at,
             updated_at=profile.updated_at,
         )
-        profile_logger.debug("Artist dashboard fetched successfully" , extra={"profile_response": profile_response , "serialized_bookings": serialized_bookings , "stats": stats})
+        profile_logger.debug("Artist dashboard fetched successfully" , extra={"profile_response": profile_response , "bookings": len(serialized_bookings) , "stats": stats})
         # אפשר להחזיר את האובייקט ישירות; אם עדיין יש שדה בעייתי, עטוף ב-jsonable_encoder
         return ArtistDashboardResponse(
             profile=profile_response,
             bookings=serialized_bookings,
-            stats=stats
+            stats=stats,
+            bookings_has_more=bookings_has_more,
+            bookings_next_cursor=encode_cursor(bookings[-1].event_date, bookings[-1].event_time, bookings[-1].id)
+            if bookings_has_more and bookings else None,
         )
 
         # לחלופין, למקרה של ספק סיריאליזציה:
@@ -138,6 +155,52 @@ async def get_artist_dashboard(
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
+@router.get("/earnings", response_model=EarningsSeriesResponse, status_code=200, summary="Get artist earnings time series")
+async def get_artist_earnings(
+    start: date = Query(..., description="First event date (inclusive)"),
+    end: date = Query(..., description="Last event date (inclusive)"),
+    granularity: str = Query("month", pattern="^(day|month|year)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """הכנסות (בקינגים accepted/completed) לפי יום / חודש / שנה — קורא רק מטבלאות הסיכום, לא מהבקינגים"""
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if count_periods(start, end, granularity) > settings.EARNINGS_MAX_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too long: at most {settings.EARNINGS_MAX_POINTS} points per request, use a coarser granularity",
+        )
+    profile_currency = await db.scalar(select(ArtistProfile.currency).where(ArtistProfile.user_id == current_user.id))
+    display_currency = profile_currency or BASE_CURRENCY
+    buckets = await earnings_series(db, current_user.id, start, end, granularity, to_currency=display_currency)
+    totals, unconverted = {}, {}
+    for b in buckets:
+        for currency, amount in b.amounts.items():
+            totals[currency] = totals.get(currency, Decimal(0)) + amount
+        for currency, amount in b.unconverted.items():
+            unconverted[currency] = unconverted.get(currency, Decimal(0)) + amount
+    profile_logger.debug("Artist earnings fetched" , extra={"current_user_id": current_user.id , "granularity": granularity , "points": len(buckets)})
+    return EarningsSeriesResponse(
+        start=start,
+        end=end,
+        granularity=granularity,
+        currency=display_currency,
+        total=round(float(sum(b.converted for b in buckets)), 2),
+        totals={c: float(a) for c, a in totals.items()},
+        unconverted={c: float(a) for c, a in unconverted.items()},
+        series=[
+            EarningsPoint(
+                period=b.start,
+                amounts={c: float(a) for c, a in b.amounts.items()},
+                amount=round(float(b.converted), 2),
+                bookings=b.bookings,
+            )
+            for b in buckets
+        ],
+    )
+
+
 
 
 
@@ -147,11 +210,11 @@ async def get_artist_dashboard(
 async def update_artist_profile(
     profile_in: ArtistProfileUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         profile_logger.debug("Updating artist profile" , extra={"current_user_id": current_user.id})
-        profile = db.query(ArtistProfile).filter(ArtistProfile.user_id == current_user.id).first()
+        profile = await db.scalar(select(ArtistProfile).where(ArtistProfile.user_id == current_user.id))
         if not profile:
             profile = ArtistProfile(user_id=current_user.id)
             db.add(profile)
@@ -171,13 +234,13 @@ async def update_artist_profile(
         if profile_in.photo is not None:
             profile.photo = profile_in.photo
 
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
         profile_logger.debug("Artist profile updated successfully" , extra={"profile": profile})
         return profile
     except Exception as e:
         profile_logger.error("Error updating artist profile" , extra={"current_user_id": current_user.id , "error": e})
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
@@ -193,7 +256,7 @@ async def submit_artist_form(
     min_price: float = Form(...),
     photo: str = Form(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     profile_logger.debug("Submitting artist form" , extra={"current_user_id": current_user.id})
     profile_in = ArtistProfileUpdate(
@@ -1,18 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from fastapi.responses import HTMLResponse
 from fastapi import Form
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+import hashlib
 import json
 import logging
-from app.core.db import get_db
+from app.core.db import get_read_db, get_async_read_db
+from app.core.availability import get_zone, merge_intervals, month_availability, month_start, next_month, to_utc
 from app.models.models import ArtistProfile, User
-from app.schemas.auth import ArtistProfileOut
+from app.schemas.auth import ArtistProfileOut, ArtistAvailabilityResponse
+from app.settings import settings
 
 public_logger = logging.getLogger("app.public")
 router = APIRouter()
 
 @router.get("/artist/{user_id}", response_model=ArtistProfileOut)
-def get_public_artist_profile(user_id: int, db: Session = Depends(get_db)):
+def get_public_artist_profile(user_id: int, db: Session = Depends(get_read_db)):
     public_logger.debug("Getting public artist profile" , extra={"user_id": user_id})
     profile = db.query(ArtistProfile).filter(ArtistProfile.user_id == user_id).first()
     if not profile:
@@ -20,6 +26,60 @@ def get_public_artist_profile(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Artist not found")
     return profile
 
+@router.get("/artist/{user_id}/availability", response_model=ArtistAvailabilityResponse)
+async def get_artist_availability(
+    user_id: int,
+    request: Request,
+    start: Optional[date] = Query(None, description="First day (YYYY-MM-DD); default: first day of this month"),
+    end: Optional[date] = Query(None, description="Last day, inclusive; default: end of start's month"),
+    tz: str = Query("UTC", description="IANA time zone the days and intervals are given in"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Busy intervals and free / fully busy days of an artist, for the booking form's calendar.
+    Months are cached per artist (app.core.availability.month_cache); responses carry an ETag
+    and a short public max-age so nginx and browsers can cache them too.
+    """
+    try:
+        zone = get_zone(tz)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid time zone. Use an IANA name such as Europe/London")
+    start = start or month_start(datetime.now(zone).date())
+    end = end or next_month(month_start(start)) - timedelta(days=1)
+    if end < start or (end - start).days >= settings.AVAILABILITY_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"end must be on or after start and at most {settings.AVAILABILITY_MAX_DAYS} days later")
+
+    try:
+        months = await month_availability(db, user_id, start, end, tz)
+    except LookupError:
+        public_logger.error("Artist not found" , extra={"user_id": user_id})
+        raise HTTPException(status_code=404, detail="Artist not found")
+
+    range_start, range_end = to_utc(start, time.min, tz), to_utc(end + timedelta(days=1), time.min, tz)
+    busy = merge_intervals(
+        (max(s, range_start), min(e, range_end))
+        for m in months for s, e in m.busy if s < range_end and e > range_start
+    )
+    days = [(day, state) for m in months for day, state in m.days if start <= day <= end]
+    def local(dt: datetime) -> str:
+        return dt.replace(tzinfo=timezone.utc).astimezone(zone).isoformat()
+
+    body = json.dumps({
+        "artist_id": user_id,
+        "time_zone": tz,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "busy": [{"start": local(s), "end": local(e)} for s, e in busy],
+        "free_days": [day.isoformat() for day, state in days if state == "free"],
+        "busy_days": [day.isoformat() for day, state in days if state == "busy"],
+    }, separators=(",", ":")).encode()
+
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.AVAILABILITY_HTTP_MAX_AGE}"}
+    if etag in [t.strip().removeprefix("W/") for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 
 
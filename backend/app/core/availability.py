@@ -0,0 +1,222 @@
+# app/core/availability.py
+import itertools
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import event, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.models.models import ArtistProfile, BookingRequest, CalendarBlock
+from app.settings import settings
+
+# Bookings and calendar blocks as time intervals [starts_at, ends_at), stored in UTC (naive,
+# like every other DateTime column) next to the local date/time they were entered in.
+# The columns are filled by ORM listeners in app.models.models; migration 0006 backfills old rows.
+
+BUSY_STATUSES = ("pending", "accepted", "completed")
+
+# Longest performance validate_booking_data accepts.
+MAX_PERFORMANCE_MINUTES = 24 * 60
+
+# Longest interval a row can have, in UTC: a performance is at most MAX_PERFORMANCE_MINUTES,
+# a block covers one local day (or crosses midnight once) — 25h on a DST fall-back day,
+# more for zones with bigger shifts. Bounds the index range an overlap query scans to
+# [start - OVERLAP_LOOKBACK, end) instead of the artist's whole history.
+OVERLAP_LOOKBACK = timedelta(hours=26)
+
+DEFAULT_TIME_ZONE = "UTC"   # calendar blocks saved without a time_zone
+
+
+@dataclass(frozen=True)
+class Interval:
+    kind: str           # "booking" | "block"
+    id: int
+    starts_at: datetime  # UTC
+    ends_at: datetime
+
+
+@lru_cache(maxsize=512)
+def get_zone(name: Optional[str]) -> ZoneInfo:
+    """ZoneInfo for an IANA name ("Asia/Jerusalem"); raises ValueError for unknown names."""
+    try:
+        return ZoneInfo(name or DEFAULT_TIME_ZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {name}")
+
+
+def to_utc(day: date, at: time, zone: Optional[str]) -> datetime:
+    local = datetime.combine(day, at, tzinfo=get_zone(zone))
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def booking_interval(event_date: date, event_time: time, zone: str, duration_minutes: int) -> Tuple[datetime, datetime]:
+    start = to_utc(event_date, event_time, zone)
+    return start, start + timedelta(minutes=duration_minutes or 0)
+
+
+def block_interval(
+    block_date: date, start_time: Optional[time], end_time: Optional[time], zone: Optional[str]
+) -> Tuple[datetime, datetime]:
+    """A block without times covers the whole day; end <= start means it runs past midnight."""
+    start = to_utc(block_date, start_time or time.min, zone)
+    end_day = block_date
+    if end_time is None or end_time <= (start_time or time.min):
+        end_day = block_date + timedelta(days=1)
+    return start, to_utc(end_day, end_time or time.min, zone)
+
+
+def overlap_queries(artist_id: int, start: datetime, end: datetime, exclude_booking_id: Optional[int] = None):
+    lower = start - OVERLAP_LOOKBACK
+    blocks = select(
+        literal("block").label("kind"), CalendarBlock.id, CalendarBlock.starts_at, CalendarBlock.ends_at
+    ).where(
+        CalendarBlock.artist_id == artist_id,
+        CalendarBlock.starts_at >= lower,
+        CalendarBlock.starts_at < end,
+        CalendarBlock.ends_at > start,
+    )
+    bookings = select(
+        literal("booking").label("kind"), BookingRequest.id, BookingRequest.starts_at, BookingRequest.ends_at
+    ).where(
+        BookingRequest.artist_id == artist_id,
+        BookingRequest.status.in_(BUSY_STATUSES),
+        BookingRequest.starts_at >= lower,
+        BookingRequest.starts_at < end,
+        BookingRequest.ends_at > start,
+    )
+    if exclude_booking_id is not None:
+        bookings = bookings.where(BookingRequest.id != exclude_booking_id)
+    return blocks, bookings
+
+
+async def find_conflicts(
+    db: AsyncSession,
+    artist_id: int,
+    start: datetime,
+    end: datetime,
+    exclude_booking_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Interval]:
+    """Blocks and busy (BUSY_STATUSES) bookings of the artist overlapping [start, end) (UTC), in one query."""
+    stmt = union_all(*overlap_queries(artist_id, start, end, exclude_booking_id)).order_by("starts_at")
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [Interval(*row) for row in (await db.execute(stmt)).all()]
+
+
+async def is_free(
+    db: AsyncSession, artist_id: int, start: datetime, end: datetime, exclude_booking_id: Optional[int] = None
+) -> bool:
+    return not await find_conflicts(db, artist_id, start, end, exclude_booking_id, limit=1)
+
+
+# ---------- Month view (public availability calendar) ----------
+
+@dataclass(frozen=True)
+class MonthAvailability:
+    month: date                                 # first day of the month
+    busy: Tuple[Tuple[datetime, datetime], ...]  # merged busy intervals (UTC), clipped to the month
+    days: Tuple[Tuple[date, str], ...]           # (local day, "free" | "partial" | "busy")
+
+
+# Per worker. A commit that touches an artist's bookings or blocks bumps the artist's generation
+# here (see the session hooks below), which orphans the cached months; writes made by another
+# worker are picked up when the entry expires, so keep the TTL short.
+month_cache = TTLCache(maxsize=settings.AVAILABILITY_CACHE_MAX_ENTRIES, ttl=settings.AVAILABILITY_CACHE_TTL)
+_generations: Dict[int, int] = {}
+_generation_counter = itertools.count(1)
+
+
+def invalidate_artist(artist_id: int) -> None:
+    _generations[artist_id] = next(_generation_counter)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_calendar_changes(session, flush_context):
+    changed = session.info.setdefault("availability_changed", set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (BookingRequest, CalendarBlock)) and obj.artist_id is not None:
+            changed.add(obj.artist_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_calendar_changes(session):
+    for artist_id in session.info.pop("availability_changed", ()):
+        invalidate_artist(artist_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_calendar_changes(session):
+    session.info.pop("availability_changed", None)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(first: date) -> date:
+    return (first + timedelta(days=32)).replace(day=1)
+
+
+def merge_intervals(rows) -> List[Tuple[datetime, datetime]]:
+    """(start, end) pairs sorted by start -> non-overlapping, touching intervals joined."""
+    merged: List[Tuple[datetime, datetime]] = []
+    for start, end in rows:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _month_from_intervals(first: date, zone: str, merged: List[Tuple[datetime, datetime]]) -> MonthAvailability:
+    window = (to_utc(first, time.min, zone), to_utc(next_month(first), time.min, zone))
+    busy = tuple((max(s, window[0]), min(e, window[1])) for s, e in merged if s < window[1] and e > window[0])
+    days = []
+    i = 0
+    day = first
+    while day < next_month(first):
+        day_start, day_end = to_utc(day, time.min, zone), to_utc(day + timedelta(days=1), time.min, zone)
+        while i < len(busy) and busy[i][1] <= day_start:
+            i += 1
+        covered = timedelta()
+        j = i
+        while j < len(busy) and busy[j][0] < day_end:
+            covered += min(busy[j][1], day_end) - max(busy[j][0], day_start)
+            j += 1
+        days.append((day, "free" if not covered else "busy" if covered >= day_end - day_start else "partial"))
+        day += timedelta(days=1)
+    return MonthAvailability(first, busy, tuple(days))
+
+
+async def month_availability(db: AsyncSession, artist_id: int, first: date, last: date, zone: str) -> List[MonthAvailability]:
+    """
+    Busy intervals and per-day status for every month from `first` to `last` (local days in
+    `zone`). Months not in month_cache are computed together from one overlap query over the
+    artist's blocks and busy (BUSY_STATUSES) bookings. LookupError if the artist doesn't exist.
+    """
+    get_zone(zone)   # ValueError for unknown zones, before anything is cached under them
+    generation = _generations.get(artist_id, 0)   # read before querying: a concurrent commit must orphan what we compute
+    months = []
+    m = month_start(first)
+    while m <= last:
+        months.append(m)
+        m = next_month(m)
+    found = {m: month_cache.get((artist_id, generation, m, zone)) for m in months}
+    missing = [m for m, value in found.items() if value is None]
+    if missing:
+        if await db.scalar(select(ArtistProfile.user_id).where(ArtistProfile.user_id == artist_id)) is None:
+            raise LookupError(artist_id)
+        start, end = to_utc(missing[0], time.min, zone), to_utc(next_month(missing[-1]), time.min, zone)
+        rows = (await db.execute(union_all(*overlap_queries(artist_id, start, end)).order_by("starts_at"))).all()
+        merged = merge_intervals((row.starts_at, row.ends_at) for row in rows)
+        for m in missing:
+            found[m] = _month_from_intervals(m, zone, merged)
+            month_cache.set((artist_id, generation, m, zone), found[m])
+    return [found[m] for m in months]
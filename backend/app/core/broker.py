@@ -0,0 +1,158 @@
+# app/core/broker.py
+import abc
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+broker_logger = logging.getLogger("app.broker")
+
+
+class Subscription:
+    """
+    One subscriber's bounded inbox. Publishers never wait on it: when a slow consumer
+    lets the queue fill up, its backlog is dropped and the subscription is flagged as
+    overflowed, so the consumer can resync (e.g. close the socket and let the client refetch).
+    """
+
+    def __init__(self, broker: "Broker", channel: str, maxsize: int):
+        self.broker = broker
+        self.channel = channel
+        self.overflowed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, message: Dict[str, Any]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)   # wakes the consumer up
+            broker_logger.warning("Subscriber overflowed", extra={"channel": self.channel})
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """Next message, or None once the subscription overflowed."""
+        message = await self._queue.get()
+        return None if self.overflowed else message
+
+    async def close(self) -> None:
+        await self.broker.unsubscribe(self)
+
+
+class Broker(abc.ABC):
+    """
+    Channel pub/sub used for chat fan-out. Subclasses decide how a published message
+    reaches every worker; local delivery to Subscriptions is shared.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subs: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    @abc.abstractmethod
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        """Deliver `message` to the channel's subscribers in every worker."""
+
+    @abc.abstractmethod
+    async def subscribe(self, channel: str) -> Subscription:
+        """New local Subscription to `channel` (see _add_subscription)."""
+
+    def _add_subscription(self, channel: str) -> Subscription:
+        sub = Subscription(self, channel, self.queue_size)
+        self._subs[channel].add(sub)
+        return sub
+
+    async def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._subs.get(sub.channel)
+        if not subs or sub not in subs:
+            return
+        subs.discard(sub)
+        if not subs:
+            del self._subs[sub.channel]
+            await self._channel_closed(sub.channel)
+
+    def _dispatch(self, channel: str, message: Dict[str, Any]) -> None:
+        for sub in list(self._subs.get(channel, ())):
+            sub.put(message)
+
+    async def _channel_closed(self, channel: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryBroker(Broker):
+    """Single worker / dev: publish is a direct local dispatch."""
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self._dispatch(channel, message)
+
+    async def subscribe(self, channel: str) -> Subscription:
+        return self._add_subscription(channel)
+
+
+class RedisBroker(Broker):
+    """
+    Cross-worker fan-out over Redis PUBLISH/SUBSCRIBE. Each worker holds one pub/sub
+    connection subscribed to the channels it has local listeners for, and a reader task
+    dispatches incoming messages to them.
+    """
+
+    def __init__(self, client, queue_size: int = 100):
+        super().__init__(queue_size)
+        self._redis = client
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._reader: Optional[asyncio.Task] = None
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        await self._redis.publish(channel, json.dumps(message, default=str))
+
+    async def subscribe(self, channel: str) -> Subscription:
+        sub = self._add_subscription(channel)
+        if len(self._subs[channel]) == 1:   # first local listener
+            await self._pubsub.subscribe(channel)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read_loop())
+        return sub
+
+    async def _channel_closed(self, channel: str) -> None:
+        if not self._subs and self._reader is not None:
+            # redis-py drops the pub/sub connection once nothing is subscribed; stop reading first
+            self._reader.cancel()
+            self._reader = None
+        await self._pubsub.unsubscribe(channel)
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                msg = await self._pubsub.get_message(timeout=1.0)
+                if msg is None:
+                    continue
+                channel = msg["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                self._dispatch(channel, json.loads(msg["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                broker_logger.exception("Redis pub/sub read failed")
+                await asyncio.sleep(1.0)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+
+
+def create_broker(redis_url: Optional[str], queue_size: int = 100) -> Broker:
+    if redis_url:
+        import redis.asyncio as aioredis
+
+        return RedisBroker(aioredis.from_url(redis_url), queue_size=queue_size)
+    return InMemoryBroker(queue_size=queue_size)
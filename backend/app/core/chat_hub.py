@@ -0,0 +1,69 @@
+# app/core/chat_hub.py
+import asyncio
+import logging
+from typing import Any, Dict
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+from app.core.broker import Broker, create_broker
+from app.settings import settings
+
+chat_logger = logging.getLogger("app.chat")
+
+
+def chat_channel(booking_id: int) -> str:
+    return f"chat:{booking_id}"
+
+
+class ChatHub:
+    """
+    Chat events per booking on top of a Broker: the send / read paths publish, and every
+    WebSocket open on that booking — in any worker when the broker is Redis — receives them.
+    """
+
+    def __init__(self, broker: Broker):
+        self.broker = broker
+
+    async def publish(self, booking_id: int, event: Dict[str, Any]) -> None:
+        await self.broker.publish(chat_channel(booking_id), event)
+
+    async def serve(self, booking_id: int, websocket: WebSocket) -> None:
+        """Accept the socket and forward the booking's events until either side goes away."""
+        await websocket.accept()
+        sub = await self.broker.subscribe(chat_channel(booking_id))
+        tasks = {
+            asyncio.create_task(self._pump(sub, websocket)),
+            asyncio.create_task(self._drain(websocket)),
+        }
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    chat_logger.debug("Chat socket ended", extra={"booking_id": booking_id, "error": repr(task.exception())})
+        finally:
+            for task in tasks:
+                task.cancel()
+            await sub.close()
+
+    async def _drain(self, websocket: WebSocket) -> None:
+        try:
+            while True:
+                await websocket.receive_text()   # client frames are keep-alives only
+        except WebSocketDisconnect:
+            pass
+
+    async def _pump(self, sub, websocket: WebSocket) -> None:
+        while True:
+            event = await sub.get()
+            if event is None:
+                # Too slow to keep up: let the client reconnect and refetch the history
+                chat_logger.warning("Chat socket overflowed, closing", extra={"channel": sub.channel})
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+            await websocket.send_json(event)
+
+    async def close(self) -> None:
+        await self.broker.close()
+
+
+chat_hub = ChatHub(create_broker(settings.REDIS_URL, queue_size=settings.CHAT_SUBSCRIBER_QUEUE))
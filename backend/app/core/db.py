@@ -1,40 +1,113 @@
 import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 import logging
+from app.core.replicas import Replica, ReplicaPool, db_route_var, reads_pinned_to_primary
+from app.settings import settings
 logging.basicConfig(level=logging.INFO)
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL",)
 
-# 1. הוסף timeout ל-SQLite, והפעל pool_pre_ping
-sqlite_connect_args = {}
-if DATABASE_URL.startswith("sqlite"):
-    sqlite_connect_args = {
-        "check_same_thread": False,
-        "timeout": 60,          # Increased timeout to 60 seconds
-    }
-
-engine = create_engine(
-    DATABASE_URL,
-    connect_args=sqlite_connect_args,
-    pool_pre_ping=True,
-    echo=False,  # ב-prod כדאי False
-    future=True
-)
+def _async_url(url: str) -> str:
+    """Map the sync DATABASE_URL to its async driver (aiosqlite / asyncpg)."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+# Streaming replicas for read-only sessions (comma-separated sync URLs); empty = primary only
+DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+REPLICA_COOLDOWN_SECONDS = float(os.getenv("DB_REPLICA_COOLDOWN_SECONDS", "30"))
+# After a write, the client's reads stay on the primary this long (see RequestContextMiddleware)
+READ_YOUR_WRITES_SECONDS = int(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
 
 # 2. פרגמות ל-SQLite: WAL + busy_timeout, synchronous NORMAL (פחות נעילות)
-if DATABASE_URL.startswith("sqlite"):
-    @event.listens_for(engine, "connect")
-    def _set_sqlite_pragma(dbapi_conn, conn_record):
-        cur = dbapi_conn.cursor()
-        cur.execute("PRAGMA journal_mode=WAL;")
-        cur.execute("PRAGMA busy_timeout=30000;")  # 30 seconds
-        cur.execute("PRAGMA synchronous=NORMAL;")
-        cur.close()
+def _set_sqlite_pragma(dbapi_conn, conn_record):
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL;")
+    cur.execute("PRAGMA busy_timeout=30000;")  # 30 seconds
+    cur.execute("PRAGMA synchronous=NORMAL;")
+    cur.close()
+
+def _make_engines(url: str, async_url: str = None):
+    """Sync engine + async engine (bookings/chat/profile routers) for one database."""
+    is_sqlite = url.startswith("sqlite")
+    # 1. הוסף timeout ל-SQLite, והפעל pool_pre_ping
+    sync_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": 60} if is_sqlite else {},
+        pool_pre_ping=True,
+        echo=False,  # ב-prod כדאי False
+        future=True
+    )
+    a_engine = create_async_engine(
+        async_url or _async_url(url),
+        connect_args={"timeout": 60} if is_sqlite else {},
+        pool_pre_ping=True,
+        echo=False,
+    )
+    if is_sqlite:
+        event.listen(sync_engine, "connect", _set_sqlite_pragma)
+        event.listen(a_engine.sync_engine, "connect", _set_sqlite_pragma)
+    return sync_engine, a_engine
+
+engine, async_engine = _make_engines(DATABASE_URL, ASYNC_DATABASE_URL)
+
+# Per-request SQL accounting (same lifetime as request_id_var). RequestContextMiddleware sets a QueryStats in query_stats_var and
+# reports it in the access log and Server-Timing header; the cursor hooks below fill it in.
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+
+query_stats_var: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+slow_query_logger = logging.getLogger("app.db.slow")
+
+def _render_sql(statement, parameters) -> str:
+    # The SQL exactly as sent to the driver plus its bound values (literal_binds can't see
+    # values that are only resolved at execution time, e.g. Session.get)
+    params = repr(parameters)
+    if len(params) > 500:
+        params = params[:500] + "..."
+    return f"{statement} -- params={params}"
+
+# Registered on the Engine class so primary, replica and async engines are all covered
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._query_start) * 1000
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+    if elapsed_ms >= settings.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Slow query %.1fms: %s", elapsed_ms, _render_sql(statement, parameters),
+            extra={"elapsed_ms": round(elapsed_ms, 1)},   # request_id is added by RequestIdFilter
+        )
+
+replicas = ReplicaPool(
+    [Replica(url, *_make_engines(url)) for url in DATABASE_REPLICA_URLS],
+    cooldown=REPLICA_COOLDOWN_SECONDS,
+)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -43,6 +116,51 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,   # אופציונלי: למנוע טעינה מחדש של אובייקטים אחרי commit
 )
 
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,   # required for async: no implicit lazy refresh after commit
+)
+
+# Read-only variants for GET routes: never flushed/committed, released with a rollback
+ReadOnlySessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    expire_on_commit=False,
+    info={"read_only": True},
+)
+AsyncReadOnlySessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    info={"read_only": True},
+)
+
+@event.listens_for(Session, "after_begin")
+def _begin_read_only(session, transaction, connection):
+    # Postgres: lets the planner skip write bookkeeping and is replica-safe.
+    # SQLite has no per-transaction equivalent; not committing already avoids the write lock.
+    if session.info.get("read_only") and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+@event.listens_for(Session, "before_flush")
+def _block_read_only_flush(session, flush_context, instances):
+    if session.info.get("read_only"):
+        raise RuntimeError("Attempted to write through a read-only DB session")
+
+@event.listens_for(Session, "after_flush")
+def _mark_request_wrote(session, flush_context):
+    # Booking/chat writes pin this client's reads to the primary (read-your-writes)
+    state = db_route_var.get()
+    if state is not None:
+        state.wrote = True
+
+def _read_replica():
+    if not len(replicas) or reads_pinned_to_primary():
+        return None
+    return replicas.pick()
+
 Base = declarative_base()
 
 # ייבוא המודלים
@@ -56,10 +174,19 @@ from app.models.models import (
     Earning,
     Notification,
 )
+from app.core import stats  # noqa: E402,F401  registers the flush hook that keeps artist_stats in step
+
+# 3. הסכמה נוצרת רק ע"י מיגרציות alembic (migrations/README) — גם בבדיקות וב-bench
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
 
-# 3. אל תיצור טבלאות בזמן ייבוא — עשה זאת באירוע startup של FastAPI או בסקריפט init_db
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    """`alembic upgrade head` on DATABASE_URL, without alembic.ini's logging setup."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
 
 # 4. תלות ל-FastAPI: טרנזקציה קצרה + commit/rollback
 def get_db():
@@ -78,3 +205,53 @@ def get_db():
     finally:
         db.close()           # תמיד לסגור!
         logging.info("[DB] Session closed")
+
+def get_read_db():
+    """Read-only counterpart of get_db: no commit, ends with a rollback. Served by a replica when configured."""
+    replica = _read_replica()
+    db = ReadOnlySessionLocal()
+    if replica:
+        candidate = ReadOnlySessionLocal(bind=replica.engine)
+        try:
+            candidate.connection()   # fail over to the primary now rather than mid-handler
+            db = candidate
+        except DBAPIError as exc:
+            candidate.close()
+            replicas.mark_down(replica, exc)
+    try:
+        yield db
+    finally:
+        db.close()               # close() rolls back the (read) transaction
+
+async def get_async_db():
+    """
+    Async equivalent of get_db for `async def` routes: DB I/O is awaited instead of
+    blocking the worker's event loop. Relationships are not lazy-loadable here —
+    use joinedload/selectinload or explicit queries.
+    """
+    db = AsyncSessionLocal()
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+async def get_async_read_db():
+    """Read-only counterpart of get_async_db for GET routes and auth lookups."""
+    replica = _read_replica()
+    db = AsyncReadOnlySessionLocal()
+    if replica:
+        candidate = AsyncReadOnlySessionLocal(bind=replica.async_engine)
+        try:
+            await candidate.connection()
+            db = candidate
+        except DBAPIError as exc:
+            await candidate.close()
+            replicas.mark_down(replica, exc)
+    try:
+        yield db
+    finally:
+        await db.close()
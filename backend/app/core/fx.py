@@ -0,0 +1,196 @@
+# app/core/fx.py
+"""
+Currency conversion from the local fx_rates table (USD per unit, per currency and day).
+Rates come from a file or POST /api/fx/rates; nothing is fetched from a live service.
+
+An amount is converted at the rate in effect on the first day of its event month (the latest
+rate on or before that day, else the currency's earliest rate). Every report uses the same
+rate whatever its granularity, so day, month and year views add up to the same totals, and a
+report over N months needs at most N rates per currency. Those are looked up together, in
+one query per MAX_KEYS_PER_QUERY keys, and kept in rate_cache.
+
+    cd backend && python -m app.core.fx load rates.csv     # header: date,currency,rate
+
+or POST /api/fx/rates, open to users listed in ADMIN_EMAILS (or with role "admin").
+"""
+import argparse
+import csv
+import logging
+import sys
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, String, bindparam, event, func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.db import engine  # before the models: app.core.db imports them (python -m entry point)
+from app.core.cache import TTLCache
+from app.models.models import FxRate
+from app.settings import settings
+
+fx_logger = logging.getLogger("app.fx")
+
+BASE_CURRENCY = "USD"       # fx_rates.rate is USD per unit
+MAX_KEYS_PER_QUERY = 200    # SQLite allows at most 500 terms in a compound SELECT
+
+# (currency, day) -> Decimal | None. Per worker; cleared once a load commits (never before, or a
+# concurrent reader could re-cache the old rows), loads made by another process are picked up
+# when entries expire.
+rate_cache = TTLCache(maxsize=settings.FX_CACHE_MAX_ENTRIES, ttl=settings.FX_CACHE_TTL)
+_MISS = object()
+
+Key = Tuple[str, date]
+
+
+def rate_date(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _rates_query(n: int):
+    """
+    n rate lookups in one statement, each two primary-key seeks. Plain text: building and
+    compiling the equivalent 200-way Core union costs more than running it.
+    """
+    parts = [
+        f"SELECT {i} AS i, coalesce("
+        f"(SELECT rate FROM fx_rates WHERE currency = :c{i} AND day <= :d{i} ORDER BY day DESC LIMIT 1), "
+        f"(SELECT rate FROM fx_rates WHERE currency = :c{i} ORDER BY day LIMIT 1)) AS rate"
+        for i in range(n)
+    ]
+    return text(" UNION ALL ".join(parts)).bindparams(
+        *(bindparam(f"c{i}", type_=String) for i in range(n)),
+        *(bindparam(f"d{i}", type_=Date) for i in range(n)),
+    )
+
+
+async def get_rates(db: AsyncSession, keys: Iterable[Key]) -> Dict[Key, Optional[Decimal]]:
+    """USD per unit for each (currency, day); None for a currency without any rates."""
+    rates: Dict[Key, Optional[Decimal]] = {}
+    missing: List[Key] = []
+    for key in set(keys):
+        if key[0] == BASE_CURRENCY:
+            rates[key] = Decimal(1)
+            continue
+        cached = rate_cache.get(key, _MISS)
+        if cached is _MISS:
+            missing.append(key)
+        else:
+            rates[key] = cached
+    for start in range(0, len(missing), MAX_KEYS_PER_QUERY):
+        chunk = missing[start:start + MAX_KEYS_PER_QUERY]
+        params = {**{f"c{i}": c for i, (c, _) in enumerate(chunk)}, **{f"d{i}": d for i, (_, d) in enumerate(chunk)}}
+        found = dict((await db.execute(_rates_query(len(chunk)), params)).all())
+        for i, (currency, day) in enumerate(chunk):
+            rate = found.get(i)
+            rate = Decimal(str(rate)) if rate is not None else None
+            rates[(currency, day)] = rate
+            rate_cache.set((currency, day), rate)
+    return rates
+
+
+async def conversion_factors(db: AsyncSession, keys: Iterable[Key], to_currency: str) -> Dict[Key, Optional[Decimal]]:
+    """Multiplier from each key's currency into `to_currency` on the key's day; None without rates."""
+    keys = set(keys)
+    rates = await get_rates(db, keys | {(to_currency, day) for _, day in keys})
+    factors: Dict[Key, Optional[Decimal]] = {}
+    for currency, day in keys:
+        if currency == to_currency:
+            factors[(currency, day)] = Decimal(1)
+            continue
+        source, target = rates[(currency, day)], rates[(to_currency, day)]
+        factors[(currency, day)] = source / target if source is not None and target else None
+    return factors
+
+
+async def convert_amounts(
+    db: AsyncSession, rows: Sequence[Tuple[str, date, Decimal]], to_currency: str
+) -> List[Optional[Decimal]]:
+    """[(currency, event day, amount)] -> each amount in `to_currency` (None where no rate is known)."""
+    keys = [(currency, rate_date(day)) for currency, day, _ in rows]
+    factors = await conversion_factors(db, keys, to_currency)
+    return [
+        Decimal(str(amount)) * factors[key] if factors[key] is not None else None
+        for key, (_, _, amount) in zip(keys, rows)
+    ]
+
+
+# ---------- Loading ----------
+
+def parse_rates(records: Iterable[dict]) -> List[dict]:
+    """Validate {date, currency, rate} records (CSV rows or JSON); ValueError names the bad record."""
+    rates = []
+    for n, rec in enumerate(records, start=1):
+        try:
+            day = rec["date"] if isinstance(rec["date"], date) else datetime.strptime(str(rec["date"]).strip(), "%Y-%m-%d").date()
+            currency = str(rec["currency"]).strip().upper()
+            rate = Decimal(str(rec["rate"]).strip())
+        except (KeyError, ValueError, InvalidOperation) as e:
+            raise ValueError(f"record {n}: expected date (YYYY-MM-DD), currency and rate ({e!r})")
+        if not 0 < len(currency) <= 10 or not rate.is_finite() or rate <= 0:
+            raise ValueError(f"record {n}: invalid currency or rate")
+        rates.append({"currency": currency, "day": day, "rate": rate})
+    return rates
+
+
+def load_rates(conn: Connection, rates: List[dict]) -> int:
+    """
+    Upsert parsed rates on `conn`; returns the number of rows written. Leaves rate_cache alone:
+    the caller clears it after committing (load_rates_in_session does that through the hooks below).
+    """
+    if not rates:
+        return 0
+    table = FxRate.__table__
+    insert = (postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert)(table)
+    conn.execute(
+        insert.on_conflict_do_update(
+            index_elements=[table.c.currency, table.c.day],
+            set_={"rate": insert.excluded.rate, "updated_at": func.now()},
+        ),
+        [{**r, "updated_at": datetime.utcnow()} for r in rates],
+    )
+    fx_logger.info("FX rates loaded", extra={"rows": len(rates), "currencies": sorted({r["currency"] for r in rates})})
+    return len(rates)
+
+
+def load_rates_in_session(session: Session, rates: List[dict]) -> int:
+    """load_rates in the session's transaction; rate_cache is cleared when that commits."""
+    loaded = load_rates(session.connection(), rates)
+    session.info["fx_rates_loaded"] = True
+    return loaded
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_rates_after_commit(session):
+    if session.info.pop("fx_rates_loaded", False):
+        rate_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rates_loaded(session):
+    session.info.pop("fx_rates_loaded", None)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.core.fx")
+    ap.add_argument("command", choices=("load",))
+    ap.add_argument("file", help="CSV with a date,currency,rate header (rate = USD per unit)")
+    args = ap.parse_args()
+    with open(args.file, newline="") as f:
+        try:
+            rates = parse_rates(csv.DictReader(f))
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+    with engine.begin() as conn:
+        loaded = load_rates(conn, rates)
+    rate_cache.clear()
+    print(f"loaded {loaded} rate(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
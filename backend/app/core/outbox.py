@@ -0,0 +1,258 @@
+# app/core/outbox.py
+import asyncio
+import itertools
+import logging
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.db import AsyncSessionLocal
+from app.models.models import OutboxMessage
+from app.settings import settings
+
+outbox_logger = logging.getLogger("app.outbox")
+
+
+def enqueue(db: AsyncSession, kind: str, payload: Dict[str, Any], booking_id: Optional[int] = None) -> OutboxMessage:
+    """Add an outgoing message to the caller's transaction; it is only sent if that transaction commits."""
+    msg = OutboxMessage(kind=kind, payload=payload, booking_request_id=booking_id)
+    db.add(msg)
+    return msg
+
+
+# ---------- Transports ----------
+
+# A transport turns each row into a message with prepare(kind, payload) and delivers a list
+# of them with send_batch(), which returns, in order, the provider message id or the
+# exception of each message.
+
+class GmailTransport:
+    """
+    Sends through app.api.mail; `kind` picks the message builder, `payload` is its kwargs.
+    A batch goes out as GmailClient.send_batch requests (GMAIL_BATCH_LIMIT messages each).
+    """
+
+    def __init__(self, client_factory: Optional[Callable[[], Any]] = None):
+        from app.api.mail import build_booking_confirmation_message, get_gmail_client
+        self.client_factory = client_factory or get_gmail_client
+        self.builders: Dict[str, Callable[..., Any]] = {
+            "booking_confirmation": build_booking_confirmation_message,
+        }
+
+    def prepare(self, kind: str, payload: Dict[str, Any]):
+        return self.builders[kind](**payload, sender=self.client_factory().sender)
+
+    def send_batch(self, messages: List[Any]) -> List[Union[str, Exception]]:
+        return self.client_factory().send_batch(messages)
+
+
+class FakeGmailTransport:
+    """
+    Local stand-in for Gmail: records what would have been sent and returns fake message
+    ids. `latency` (seconds per batch request of up to `batch_limit` messages) and
+    `fail_rate` (per message) simulate a slow / flaky provider.
+    """
+
+    def __init__(self, latency: float = 0.0, fail_rate: float = 0.0, batch_limit: int = 50):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.batch_limit = batch_limit
+        self.sent: List[Dict[str, Any]] = []
+        self.requests = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def prepare(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {"kind": kind, "payload": payload}
+
+    def send_batch(self, messages: List[Dict[str, Any]]) -> List[Union[str, Exception]]:
+        results: List[Union[str, Exception]] = []
+        for start in range(0, len(messages), self.batch_limit):
+            if self.latency:
+                time.sleep(self.latency)
+            with self._lock:
+                self.requests += 1
+                for message in messages[start:start + self.batch_limit]:
+                    if self.fail_rate and random.random() < self.fail_rate:
+                        results.append(ConnectionError("fake gmail: simulated failure"))
+                        continue
+                    message_id = f"fake-{next(self._ids)}"
+                    self.sent.append({"id": message_id, **message})
+                    results.append(message_id)
+        return results
+
+
+def create_transport(name: str):
+    if name == "fake":
+        return FakeGmailTransport()
+    return GmailTransport()
+
+
+# ---------- Drain worker ----------
+
+class OutboxDrainer:
+    """
+    Delivers outbox rows. Each round claims up to `batch_size` due rows by stamping them with
+    a lease (locked_by / locked_until) in one UPDATE, builds their messages on a thread pool
+    (`concurrency` at a time), hands them to the transport as one send_batch call, then records
+    each message's provider id or schedules its retry with exponential backoff.
+
+    The lease makes concurrent drainers (one per gunicorn worker, or a separate process) safe
+    on SQLite; on Postgres the candidate SELECT also uses FOR UPDATE SKIP LOCKED so claimers
+    don't queue behind each other. A drainer that dies mid-send loses its lease after
+    `lease_seconds` and the rows are picked up again (at-least-once delivery).
+    """
+
+    def __init__(
+        self,
+        transport,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        batch_size: int = 20,
+        lease_seconds: float = 120.0,
+        max_attempts: int = 8,
+        retry_base: float = 5.0,
+        retry_max: float = 3600.0,
+        poll_interval: float = 5.0,
+        concurrency: int = 4,
+    ):
+        self.transport = transport
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="outbox")
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # --- claim / send / record ---
+
+    async def claim(self, db: AsyncSession) -> List[OutboxMessage]:
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        claimable = (
+            OutboxMessage.status == "pending",
+            OutboxMessage.available_at <= now,
+            or_(OutboxMessage.locked_until.is_(None), OutboxMessage.locked_until < now),
+        )
+        candidates = select(OutboxMessage.id).where(*claimable).order_by(OutboxMessage.id).limit(self.batch_size)
+        if db.get_bind().dialect.name == "postgresql":
+            candidates = candidates.with_for_update(skip_locked=True)
+        # claimable is repeated on the UPDATE: on SQLite two claimers may read the same candidates,
+        # only the first UPDATE still matches them
+        await db.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(candidates.scalar_subquery()), *claimable)
+            .values(locked_by=token, locked_until=now + timedelta(seconds=self.lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return list((await db.scalars(
+            select(OutboxMessage).where(OutboxMessage.locked_by == token).order_by(OutboxMessage.id)
+        )).all())
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _send(self, batch: List[OutboxMessage]) -> List[Union[str, Exception]]:
+        """Provider message id or exception per row; a row that fails to build isn't sent."""
+        loop = asyncio.get_running_loop()
+        results: List[Union[str, Exception]] = list(await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self.transport.prepare, msg.kind, msg.payload) for msg in batch),
+            return_exceptions=True,
+        ))
+        ready = [i for i, r in enumerate(results) if not isinstance(r, BaseException)]
+        if ready:
+            try:
+                sent = await loop.run_in_executor(self._executor, self.transport.send_batch, [results[i] for i in ready])
+            except Exception as e:   # the whole request failed: every message in it is retried
+                sent = [e] * len(ready)
+            for i, result in zip(ready, sent):
+                results[i] = result
+        return results
+
+    def _outcome(self, msg: OutboxMessage, result: Union[str, Exception]) -> Dict[str, Any]:
+        if not isinstance(result, BaseException):
+            return {"status": "sent", "provider_message_id": result, "sent_at": datetime.utcnow(), "last_error": None}
+        attempts = msg.attempts + 1
+        if attempts >= self.max_attempts:
+            outbox_logger.error("Outbox message failed permanently", extra={"outbox_id": msg.id, "kind": msg.kind, "attempts": attempts, "error": result})
+            return {"status": "failed", "last_error": repr(result)}
+        delay = self.backoff(attempts)
+        outbox_logger.warning("Outbox send failed, retrying", extra={"outbox_id": msg.id, "kind": msg.kind, "attempts": attempts, "retry_in": round(delay, 1), "error": result})
+        return {"status": "pending", "last_error": repr(result), "available_at": datetime.utcnow() + timedelta(seconds=delay)}
+
+    async def drain_once(self) -> int:
+        """Claim, send and record one batch; returns how many rows were claimed."""
+        async with self.session_factory() as db:
+            batch = await self.claim(db)
+            if not batch:
+                return 0
+            results = [self._outcome(msg, result) for msg, result in zip(batch, await self._send(batch))]
+            for msg, values in zip(batch, results):
+                # only while we still hold the lease: an expired one may have been re-claimed
+                await db.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id == msg.id, OutboxMessage.locked_by == msg.locked_by)
+                    .values(attempts=OutboxMessage.attempts + 1, locked_by=None, locked_until=None, **values)
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+            sent = sum(1 for v in results if v["status"] == "sent")
+            outbox_logger.debug("Outbox batch drained", extra={"claimed": len(batch), "sent": sent})
+            return len(batch)
+
+    # --- background loop ---
+
+    def notify(self) -> None:
+        """Wake the loop now instead of at the next poll (called after enqueue + commit)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self) -> None:
+        outbox_logger.info("Outbox drainer started", extra={"batch_size": self.batch_size})
+        while True:
+            try:
+                if await self.drain_once() == self.batch_size:
+                    continue   # probably more waiting
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                outbox_logger.exception("Outbox drain round failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+outbox_drainer = OutboxDrainer(
+    create_transport(settings.MAIL_TRANSPORT),
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    poll_interval=settings.OUTBOX_POLL_SECONDS,
+    concurrency=settings.OUTBOX_SEND_CONCURRENCY,
+)
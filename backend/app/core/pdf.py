@@ -0,0 +1,279 @@
+# app/core/pdf.py
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Optional, Tuple, Union
+
+from jinja2 import Environment, FileSystemLoader, Template
+
+from app.settings import settings
+
+pdf_logger = logging.getLogger("app.pdf")
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assest")
+BOOKING_SUMMARY_TEMPLATE = "template_booking_summary.html"
+
+# One environment per process: templates are parsed and compiled on first use only.
+# auto_reload=False also skips the mtime check Jinja does on every get_template().
+_jinja_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), auto_reload=False)
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Template:
+    return _jinja_env.get_template(name)
+
+
+def render_booking_summary_html(
+    artist_name: str, booking_details: dict, chat_url: str, as_of: Optional[Union[datetime, str]] = None
+) -> str:
+    """
+    `as_of` is the booking's updated_at (UTC). The summary is stamped with it rather than the
+    render time, so the same booking version always renders to the same bytes and PdfCache
+    stores it once. Renders outside the cache may omit it and get the current time.
+    """
+    if isinstance(as_of, str):
+        as_of = datetime.fromisoformat(as_of)
+    as_of = as_of or datetime.utcnow()
+    return get_template(BOOKING_SUMMARY_TEMPLATE).render(
+        artist_name=artist_name,
+        booking_details=booking_details,
+        chat_url=chat_url or "",
+        date=as_of.strftime("%Y-%m-%d"),
+        time=as_of.strftime("%H:%M"),
+    )
+
+
+# ---------- Renderer processes ----------
+
+def _warm_worker() -> None:
+    """Pool initializer: pay WeasyPrint's import + font setup once per process, not per PDF."""
+    try:
+        from weasyprint import HTML
+        HTML(string="<p>warm-up</p>").write_pdf()
+    except Exception as e:   # missing system libs: every render will raise the real error
+        pdf_logger.warning("PDF renderer warm-up failed", extra={"error": repr(e)})
+
+
+def html_to_pdf(html: str) -> bytes:
+    from weasyprint import HTML
+    return HTML(string=html).write_pdf()
+
+
+class RendererBusy(Exception):
+    pass
+
+
+class PdfCache:
+    """
+    Content-addressed PDF store: objects/<sha256>.pdf, plus refs/booking_<id>_<updated_at>
+    files holding the digest of that booking version's PDF. The digest doubles as the HTTP
+    ETag, so a conditional request is answered from the ref alone.
+
+    evict() drops objects not used for `max_age` seconds, then the least recently used ones
+    until the store is under `max_bytes` (hits touch the object's mtime); refs whose object
+    is gone are removed with them. put() runs it at most every `evict_interval` seconds.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 500 * 2**20, max_age: float = 30 * 86_400, evict_interval: float = 60.0):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.refs_dir = os.path.join(root, "refs")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.evict_interval = evict_interval
+        self._last_evict = 0.0
+        self._evict_lock = threading.Lock()
+
+    @staticmethod
+    def _ref_name(booking_id: int, updated_at: Union[datetime, str]) -> str:
+        if isinstance(updated_at, str):
+            updated_at = datetime.fromisoformat(updated_at)
+        return f"booking_{booking_id}_{updated_at:%Y%m%dT%H%M%S%f}"
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, f"{digest}.pdf")
+
+    def lookup(self, booking_id: int, updated_at: Union[datetime, str]) -> Optional[str]:
+        """Digest of the cached PDF for this booking version, or None."""
+        try:
+            with open(os.path.join(self.refs_dir, self._ref_name(booking_id, updated_at))) as f:
+                digest = f.read().strip()
+            os.utime(self.object_path(digest))   # LRU for evict(); raises if the object was evicted
+            return digest
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def _atomic_write(directory: str, path: str, data: bytes) -> None:
+        # write + rename so a concurrent reader never sees a half-written file
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def put(self, booking_id: int, updated_at: Union[datetime, str], pdf: bytes) -> str:
+        digest = hashlib.sha256(pdf).hexdigest()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            self._atomic_write(self.objects_dir, path, pdf)
+        self._atomic_write(self.refs_dir, os.path.join(self.refs_dir, self._ref_name(booking_id, updated_at)), digest.encode())
+        if time.monotonic() - self._last_evict >= self.evict_interval:
+            self.evict()
+        return digest
+
+    def evict(self) -> Tuple[int, int]:
+        """Apply the age and size limits; returns (files removed, bytes removed)."""
+        if not self._evict_lock.acquire(blocking=False):
+            return 0, 0
+        try:
+            self._last_evict = time.monotonic()
+            now = time.time()
+            objects = []
+            for entry in os.scandir(self.objects_dir) if os.path.isdir(self.objects_dir) else ():
+                if entry.is_file():
+                    st = entry.stat()
+                    objects.append((st.st_mtime, st.st_size, entry.path))
+            objects.sort()   # least recently used first
+            total = sum(size for _, size, _ in objects)
+            removed = removed_bytes = 0
+            for mtime, size, path in objects:
+                if now - mtime <= self.max_age and total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+                removed_bytes += size
+            if removed:
+                live = {os.path.basename(p)[:-4] for _, _, p in objects if os.path.exists(p)}
+                for entry in os.scandir(self.refs_dir):
+                    try:
+                        with open(entry.path) as f:
+                            if f.read().strip() not in live:
+                                os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+                pdf_logger.info("PDF cache evicted", extra={"files": removed, "bytes": removed_bytes, "remaining_bytes": total})
+            return removed, removed_bytes
+        finally:
+            self._evict_lock.release()
+
+
+class PdfRenderer:
+    """
+    WeasyPrint is CPU-bound and holds the GIL, so PDFs are rendered in a warm pool of
+    `workers` processes. At most `max_pending` renders wait behind the running ones; beyond
+    that submit() fails fast (RendererBusy) or, for background callers, waits for a slot.
+
+    Rendered booking PDFs are also kept in a PdfCache, looked up by booking id + updated_at:
+    any change to the booking bumps updated_at, so a stale file is never served.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 16,
+        cache: Optional[PdfCache] = None,
+        render_func: Callable[[str], bytes] = html_to_pdf,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache = cache or PdfCache(tempfile.mkdtemp(prefix="pdf-cache-"))
+        self.render_func = render_func
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: forking a worker that already runs an event loop + threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_warm_worker,
+                    )
+        return self._executor
+
+    def warm(self) -> None:
+        """Start every renderer process now (in the background) instead of on the first PDF."""
+        pool = self._pool()
+        for _ in range(self.workers):
+            pool.submit(int)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, html: str, wait: Optional[float] = 0) -> "Future[bytes]":
+        """Queue one render. `wait`: seconds to wait for a queue slot (None = forever, 0 = fail fast)."""
+        if not self._slots.acquire(blocking=wait != 0, timeout=wait if wait else None):
+            raise RendererBusy("PDF render queue is full")
+        try:
+            future = self._pool().submit(self.render_func, html)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def render(self, html: str, wait: Optional[float] = None) -> bytes:
+        return self.submit(html, wait=wait).result()
+
+    async def render_async(self, html: str) -> bytes:
+        return await asyncio.wrap_future(self.submit(html))
+
+    # --- cached booking PDFs ---
+
+    def booking_pdf(
+        self, booking_id: int, updated_at: Union[datetime, str], html_factory: Callable[[], str], wait: Optional[float] = None
+    ) -> bytes:
+        """The booking's PDF from the cache, rendering (and caching) it on a miss. Blocking."""
+        digest = self.cache.lookup(booking_id, updated_at)
+        if digest is not None:
+            try:
+                with open(self.cache.object_path(digest), "rb") as f:
+                    pdf_logger.debug("PDF cache hit", extra={"booking_id": booking_id})
+                    return f.read()
+            except FileNotFoundError:   # evicted in between
+                pass
+        pdf = self.render(html_factory(), wait=wait)
+        self.cache.put(booking_id, updated_at, pdf)
+        return pdf
+
+    async def booking_pdf_file(
+        self, booking_id: int, updated_at: Union[datetime, str], html_factory: Callable[[], str]
+    ) -> Tuple[str, str]:
+        """(digest, path) of the booking's cached PDF for serving; renders on a miss (RendererBusy when full)."""
+        digest = await asyncio.to_thread(self.cache.lookup, booking_id, updated_at)
+        if digest is None:
+            pdf = await self.render_async(html_factory())
+            digest = await asyncio.to_thread(self.cache.put, booking_id, updated_at, pdf)
+        return digest, self.cache.object_path(digest)
+
+
+pdf_renderer = PdfRenderer(
+    workers=settings.PDF_RENDER_WORKERS,
+    max_pending=settings.PDF_RENDER_QUEUE,
+    cache=PdfCache(
+        settings.PDF_CACHE_DIR,
+        max_bytes=settings.PDF_CACHE_MAX_MB * 2**20,
+        max_age=settings.PDF_CACHE_MAX_AGE_DAYS * 86_400,
+    ),
+)
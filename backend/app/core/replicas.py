@@ -0,0 +1,92 @@
+# app/core/replicas.py
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+db_logger = logging.getLogger("app.db")
+
+
+@dataclass
+class DBRouteState:
+    """
+    Per-request routing flags. The middleware puts one in db_route_var and the object is
+    mutated in place, so writes made inside the handler are visible when the response goes out.
+    """
+    sticky: bool = False   # the client wrote recently (read-your-writes cookie) -> read from primary
+    wrote: bool = False    # this request flushed a write on the primary
+
+
+db_route_var: ContextVar[Optional[DBRouteState]] = ContextVar("db_route", default=None)
+
+
+def reads_pinned_to_primary() -> bool:
+    state = db_route_var.get()
+    return bool(state and (state.sticky or state.wrote))
+
+
+class Replica:
+    def __init__(self, url: str, engine: Engine, async_engine: AsyncEngine):
+        self.url = url
+        self.engine = engine
+        self.async_engine = async_engine
+        self.down_until = 0.0
+
+
+class ReplicaPool:
+    """
+    Round-robin over read replicas. A replica whose connection fails is skipped for
+    `cooldown` seconds and then retried; when none is healthy callers fall back to the primary.
+    """
+
+    def __init__(self, replicas: List[Replica], cooldown: float = 30.0):
+        self.replicas = replicas
+        self.cooldown = cooldown
+        self._rr = itertools.count()
+        for replica in replicas:
+            for eng in (replica.engine, replica.async_engine.sync_engine):
+                event.listen(eng, "handle_error", self._error_listener(replica))
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def _error_listener(self, replica: Replica):
+        def _on_error(ctx):
+            # connection is None when the failure happened while connecting
+            if ctx.is_disconnect or ctx.connection is None:
+                self.mark_down(replica, ctx.original_exception)
+        return _on_error
+
+    def mark_down(self, replica: Replica, exc: Optional[BaseException] = None) -> None:
+        now = time.monotonic()
+        already_down = replica.down_until > now
+        replica.down_until = now + self.cooldown
+        if not already_down:
+            db_logger.warning("Replica marked down", extra={"replica": replica.url, "error": repr(exc)})
+
+    def pick(self) -> Optional[Replica]:
+        n = len(self.replicas)
+        if not n:
+            return None
+        now = time.monotonic()
+        start = next(self._rr)
+        for i in range(n):
+            replica = self.replicas[(start + i) % n]
+            if replica.down_until <= now:
+                return replica
+        return None
+
+    def healthy(self) -> List[str]:
+        now = time.monotonic()
+        return [r.url for r in self.replicas if r.down_until <= now]
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            replica.engine.dispose()
+            await replica.async_engine.dispose()
@@ -0,0 +1,478 @@
+# app/core/stats.py
+"""
+Materialized dashboard numbers, all derived from booking_requests:
+
+  artist_stats             one row per artist: request counts by status, upcoming accepted events
+  earnings                 one row per accepted/completed booking (the earnings ledger)
+  artist_revenue_daily     earnings per artist / currency / event day
+  artist_revenue_monthly   earnings per artist / currency / event month
+
+Every flush that inserts, changes or deletes a BookingRequest applies the difference between
+the booking's old and new contribution as upserts on the flush's own connection, so the
+tables commit or roll back together with the booking. Writes that bypass the ORM (bulk
+inserts, raw SQL) are not seen — run `rebuild` after those.
+
+    cd backend && python -m app.core.stats rebuild [--artist ID]
+    cd backend && python -m app.core.stats check [--artist ID]     # exit 1 on any mismatch
+"""
+import argparse
+import logging
+import sys
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Date, and_, case, delete, event, func, inspect, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.db import engine  # before the models: app.core.db imports them (python -m entry point)
+from app.core.fx import convert_amounts
+from app.models.models import ArtistRevenueDaily, ArtistRevenueMonthly, ArtistStats, BookingRequest, Earning
+
+stats_logger = logging.getLogger("app.stats")
+
+STATUS_COLUMNS = {
+    "pending": "pending_count",
+    "accepted": "accepted_count",
+    "rejected": "rejected_count",
+    "cancelled": "cancelled_count",
+    "completed": "completed_count",
+}
+EARNED_STATUSES = ("accepted", "completed")
+DEFAULT_CURRENCY = "USD"
+TRACKED = ("artist_id", "status", "event_date", "budget", "currency")
+# (table, bucket column): the revenue rollups, finest first
+ROLLUPS = ((ArtistRevenueDaily.__table__, "day"), (ArtistRevenueMonthly.__table__, "month"))
+COUNT_COLUMNS = ("total_requests", *STATUS_COLUMNS.values(), "active_upcoming")
+
+
+@dataclass(frozen=True)
+class Contribution:
+    """What one booking adds to its artist's stats."""
+    booking_id: int
+    artist_id: int
+    status: Optional[str]
+    event_date: Optional[date]
+    budget: Decimal
+    currency: str
+
+    @property
+    def earned(self) -> bool:
+        return self.status in EARNED_STATUSES and self.event_date is not None
+
+    def bucket(self, key: str) -> date:
+        return self.event_date.replace(day=1) if key == "month" else self.event_date
+
+
+def _contribution(booking_id: int, values: Dict[str, Any]) -> Optional[Contribution]:
+    if values["artist_id"] is None:
+        return None
+    return Contribution(
+        booking_id=booking_id,
+        artist_id=values["artist_id"],
+        status=values["status"] or "pending",
+        event_date=values["event_date"],
+        budget=Decimal(str(values["budget"] or 0)),
+        currency=values["currency"] or DEFAULT_CURRENCY,
+    )
+
+
+def _committed_values(booking: BookingRequest) -> Dict[str, Any]:
+    attrs = inspect(booking).attrs
+    values = {}
+    for name in TRACKED:
+        history = attrs[name].history
+        if history.deleted:
+            values[name] = history.deleted[0]
+        elif history.unchanged:
+            values[name] = history.unchanged[0]
+        else:
+            values[name] = getattr(booking, name)
+    return values
+
+
+def _current_values(booking: BookingRequest) -> Dict[str, Any]:
+    return {name: getattr(booking, name) for name in TRACKED}
+
+
+# ---------- Incremental maintenance ----------
+
+def _insert(conn: Connection, table):
+    return (postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert)(table)
+
+
+def apply_contribution(conn: Connection, c: Contribution, sign: int, today: Optional[date] = None) -> None:
+    """Add (sign=1) or remove (sign=-1) one booking's contribution, as upserts on `conn`."""
+    today = today or date.today()
+    stats = ArtistStats.__table__
+    accepted = c.status == "accepted"
+    counts = {"total_requests": sign}
+    if c.status in STATUS_COLUMNS:
+        counts[STATUS_COLUMNS[c.status]] = sign
+    upcoming_if = case(
+        (literal(c.event_date, Date) >= stats.c.active_as_of, sign), else_=0
+    ) if accepted and c.event_date else 0
+
+    insert = _insert(conn, stats).values(
+        artist_id=c.artist_id,
+        active_as_of=today,
+        active_upcoming=sign if accepted and c.event_date and c.event_date >= today else 0,
+        **{col: counts.get(col, 0) for col in ("total_requests", *STATUS_COLUMNS.values())},
+    )
+    conn.execute(insert.on_conflict_do_update(
+        index_elements=[stats.c.artist_id],
+        set_={
+            **{col: stats.c[col] + delta for col, delta in counts.items()},
+            "active_upcoming": stats.c.active_upcoming + upcoming_if,
+            "updated_at": func.now(),
+        },
+    ))
+
+    if c.earned:
+        amount = c.budget * sign
+        for table, key in ROLLUPS:
+            insert = _insert(conn, table).values(
+                artist_id=c.artist_id, currency=c.currency, amount=amount, bookings=sign, **{key: c.bucket(key)},
+            )
+            conn.execute(insert.on_conflict_do_update(
+                index_elements=[table.c.artist_id, table.c.currency, table.c[key]],
+                set_={"amount": table.c.amount + amount, "bookings": table.c.bookings + sign},
+            ))
+
+
+def sync_earning(conn: Connection, old: Optional[Contribution], new: Optional[Contribution]) -> None:
+    """Keep the booking's Earning row in step: present exactly while the booking is earned."""
+    earnings = Earning.__table__
+    if new is not None and new.earned:
+        values = dict(artist_id=new.artist_id, amount=new.budget, currency=new.currency, date=new.event_date)
+        conn.execute(_insert(conn, earnings).values(booking_id=new.booking_id, **values).on_conflict_do_update(
+            index_elements=[earnings.c.booking_id], set_=values,
+        ))
+    elif old is not None and old.earned:
+        conn.execute(delete(earnings).where(earnings.c.booking_id == old.booking_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_booking_changes(session, flush_context):
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, BookingRequest):
+            changes.append((None, _contribution(obj.id, _current_values(obj))))
+    for obj in session.dirty:
+        if isinstance(obj, BookingRequest) and any(inspect(obj).attrs[name].history.has_changes() for name in TRACKED):
+            changes.append((_contribution(obj.id, _committed_values(obj)), _contribution(obj.id, _current_values(obj))))
+    for obj in session.deleted:
+        if isinstance(obj, BookingRequest):
+            changes.append((_contribution(obj.id, _committed_values(obj)), None))
+    if not changes:
+        return
+    conn = session.connection()
+    today = date.today()
+    for old, new in changes:
+        if old == new:
+            continue
+        if old is not None:
+            apply_contribution(conn, old, -1, today)
+        if new is not None:
+            apply_contribution(conn, new, 1, today)
+        sync_earning(conn, old, new)
+
+
+# ---------- Reading ----------
+
+async def load_artist_stats(db: AsyncSession, artist_id: int, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    The artist's counters (primary-key lookup) and monthly revenue rows (primary-key prefix).
+    `revenue` is [(currency, month, amount, bookings)].
+    """
+    today = today or date.today()
+    row = await db.get(ArtistStats, artist_id)
+    revenue = (await db.execute(
+        select(
+            ArtistRevenueMonthly.currency, ArtistRevenueMonthly.month,
+            ArtistRevenueMonthly.amount, ArtistRevenueMonthly.bookings,
+        ).where(ArtistRevenueMonthly.artist_id == artist_id, ArtistRevenueMonthly.bookings != 0)
+    )).all()
+    if row is None:
+        return {"revenue": revenue, **{col: 0 for col in COUNT_COLUMNS}}
+    active = row.active_upcoming
+    if row.active_as_of < today:
+        # accepted events that took place since active_as_of are no longer upcoming
+        active -= await db.scalar(select(func.count()).select_from(BookingRequest).where(
+            BookingRequest.artist_id == artist_id,
+            BookingRequest.status == "accepted",
+            BookingRequest.event_date >= row.active_as_of,
+            BookingRequest.event_date < today,
+        ))
+    return {
+        "total_requests": row.total_requests,
+        "active_upcoming": active,
+        "revenue": revenue,
+        **{col: getattr(row, col) for col in STATUS_COLUMNS.values()},
+    }
+
+
+GRANULARITIES = ("day", "month", "year")
+
+
+@dataclass
+class EarningsBucket:
+    start: date                                   # first day of the day / month / year
+    amounts: Dict[str, Decimal] = field(default_factory=dict)   # per currency
+    bookings: int = 0
+    converted: Decimal = Decimal(0)               # in earnings_series' to_currency (app.core.fx)
+    unconverted: Dict[str, Decimal] = field(default_factory=dict)  # per currency without rates
+
+
+def period_start(day: date, granularity: str) -> date:
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_period(start: date, granularity: str) -> date:
+    if granularity == "year":
+        return start.replace(year=start.year + 1)
+    if granularity == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def count_periods(start: date, end: date, granularity: str) -> int:
+    if granularity == "year":
+        return end.year - start.year + 1
+    if granularity == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return (end - start).days + 1
+
+
+async def earnings_series(
+    db: AsyncSession, artist_id: int, start: date, end: date, granularity: str = "month",
+    to_currency: Optional[str] = None,
+) -> List[EarningsBucket]:
+    """
+    Earnings per day / month / year for event dates in [start, end], zero-filled, from the
+    rollups only: months wholly inside the range come from artist_revenue_monthly, the partial
+    months at either edge (and day granularity) from artist_revenue_daily. One query, at most
+    ~60 daily rows + one row per month and currency. With `to_currency`, every row is also
+    converted (app.core.fx: one rate lookup per currency and month) into `converted`.
+    """
+    daily, monthly = ArtistRevenueDaily, ArtistRevenueMonthly
+    stop = end + timedelta(days=1)
+    full_from = start if start.day == 1 else next_period(start.replace(day=1), "month")
+    full_to = stop.replace(day=1)            # [full_from, full_to) are whole months
+
+    def daily_rows(lo: date, hi: date):
+        return select(daily.day.label("day"), daily.currency, daily.amount, daily.bookings).where(
+            daily.artist_id == artist_id, daily.day >= lo, daily.day < hi, daily.bookings != 0,
+        )
+
+    if granularity != "day" and full_from < full_to:
+        queries = [
+            daily_rows(start, full_from),
+            select(monthly.month, monthly.currency, monthly.amount, monthly.bookings).where(
+                monthly.artist_id == artist_id, monthly.month >= full_from, monthly.month < full_to,
+                monthly.bookings != 0,
+            ),
+            daily_rows(full_to, stop),
+        ]
+    else:
+        queries = [daily_rows(start, stop)]
+    rows = (await db.execute(union_all(*queries))).all()
+
+    buckets: Dict[date, EarningsBucket] = {}
+    p = period_start(start, granularity)
+    while p <= end:
+        buckets[p] = EarningsBucket(p)
+        p = next_period(p, granularity)
+    converted = await convert_amounts(db, [(r.currency, r.day, r.amount) for r in rows], to_currency) if to_currency else None
+    for i, (day, currency, amount, bookings) in enumerate(rows):
+        bucket = buckets[period_start(day, granularity)]
+        amount = Decimal(str(amount))
+        bucket.amounts[currency] = bucket.amounts.get(currency, Decimal(0)) + amount
+        bucket.bookings += bookings
+        if converted is None:
+            continue
+        if converted[i] is None:
+            bucket.unconverted[currency] = bucket.unconverted.get(currency, Decimal(0)) + amount
+        else:
+            bucket.converted += converted[i]
+    return list(buckets.values())
+
+
+# ---------- Rebuild / check ----------
+
+def bucket_of(conn: Connection, key: str, column):
+    if key == "day":
+        return column
+    if conn.dialect.name == "postgresql":
+        return func.date_trunc("month", column).cast(Date)
+    return func.date(column, "start of month")
+
+
+def expected_stats_query(today: date, artist_id: Optional[int] = None):
+    accepted = BookingRequest.status == "accepted"
+    stmt = select(
+        BookingRequest.artist_id,
+        func.count().label("total_requests"),
+        *(
+            func.coalesce(func.sum(case((BookingRequest.status == status, 1), else_=0)), 0).label(col)
+            for status, col in STATUS_COLUMNS.items()
+        ),
+        func.coalesce(func.sum(case((and_(accepted, BookingRequest.event_date >= today), 1), else_=0)), 0)
+        .label("active_upcoming"),
+    ).group_by(BookingRequest.artist_id)
+    if artist_id is not None:
+        stmt = stmt.where(BookingRequest.artist_id == artist_id)
+    return stmt
+
+
+def _earned(artist_id: Optional[int]):
+    conds = [BookingRequest.status.in_(EARNED_STATUSES), BookingRequest.event_date.is_not(None)]
+    if artist_id is not None:
+        conds.append(BookingRequest.artist_id == artist_id)
+    return and_(*conds)
+
+
+def expected_earnings_query(artist_id: Optional[int] = None):
+    return select(
+        BookingRequest.artist_id,
+        BookingRequest.id.label("booking_id"),
+        BookingRequest.budget.label("amount"),
+        func.coalesce(BookingRequest.currency, DEFAULT_CURRENCY).label("currency"),
+        BookingRequest.event_date.label("date"),
+    ).where(_earned(artist_id))
+
+
+def expected_rollup_query(conn: Connection, key: str, artist_id: Optional[int] = None):
+    bucket = bucket_of(conn, key, BookingRequest.event_date)
+    currency = func.coalesce(BookingRequest.currency, DEFAULT_CURRENCY)
+    return select(
+        BookingRequest.artist_id,
+        currency.label("currency"),
+        bucket.label(key),
+        func.sum(BookingRequest.budget).label("amount"),
+        func.count().label("bookings"),
+    ).where(_earned(artist_id)).group_by(BookingRequest.artist_id, currency, bucket)
+
+
+def rebuild(conn: Connection, artist_id: Optional[int] = None, today: Optional[date] = None) -> int:
+    """Recompute every table from booking_requests (all artists, or one); returns the artists written."""
+    today = today or date.today()
+    stats, earnings = ArtistStats.__table__, Earning.__table__
+    for table in (stats, *(t for t, _ in ROLLUPS)):
+        stmt = delete(table)
+        if artist_id is not None:
+            stmt = stmt.where(table.c.artist_id == artist_id)
+        conn.execute(stmt)
+    stmt = delete(earnings).where(earnings.c.booking_id.is_not(None))
+    if artist_id is not None:
+        stmt = stmt.where(earnings.c.artist_id == artist_id)
+    conn.execute(stmt)
+
+    expected = expected_stats_query(today, artist_id).subquery()
+    columns = ["artist_id", *COUNT_COLUMNS]
+    written = conn.execute(stats.insert().from_select(
+        [*columns, "active_as_of"],
+        select(*(expected.c[col] for col in columns), literal(today, Date)),
+    )).rowcount
+    conn.execute(earnings.insert().from_select(
+        ["artist_id", "booking_id", "amount", "currency", "date"], expected_earnings_query(artist_id),
+    ))
+    for table, key in ROLLUPS:
+        conn.execute(table.insert().from_select(
+            ["artist_id", "currency", key, "amount", "bookings"], expected_rollup_query(conn, key, artist_id),
+        ))
+    stats_logger.info("Artist stats rebuilt", extra={"artist_id": artist_id, "artists": written})
+    return written
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def _compare(problems: List[str], what: str, expected: Dict, stored: Dict) -> None:
+    for key in sorted(expected.keys() | stored.keys()):
+        want, have = expected.get(key), stored.get(key)
+        if want != have:
+            problems.append(f"{what} {key}: is {have}, expected {want}")
+
+
+def check(conn: Connection, artist_id: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """Compare every table with a recomputation; returns one line per mismatch."""
+    today = today or date.today()
+    problems = []
+
+    expected = {r.artist_id: r._asdict() for r in conn.execute(expected_stats_query(today, artist_id))}
+    stored_q = select(ArtistStats.__table__)
+    if artist_id is not None:
+        stored_q = stored_q.where(ArtistStats.artist_id == artist_id)
+    stored = {r.artist_id: r._asdict() for r in conn.execute(stored_q)}
+    for aid in sorted(expected.keys() | stored.keys()):
+        want, have = expected.get(aid), stored.get(aid)
+        if have is None:
+            problems.append(f"artist {aid}: artist_stats row missing")
+            continue
+        if want is None:
+            want = {col: 0 for col in COUNT_COLUMNS}
+        if have["active_as_of"] < today:
+            # same correction load_artist_stats applies
+            have["active_upcoming"] -= conn.scalar(select(func.count()).select_from(BookingRequest).where(
+                BookingRequest.artist_id == aid, BookingRequest.status == "accepted",
+                BookingRequest.event_date >= have["active_as_of"], BookingRequest.event_date < today,
+            ))
+        for col in COUNT_COLUMNS:
+            if have[col] != want[col]:
+                problems.append(f"artist {aid}: {col} is {have[col]}, expected {want[col]}")
+
+    def money(value) -> Decimal:
+        return Decimal(str(value or 0)).quantize(Decimal("0.01"))
+
+    earnings = Earning.__table__
+    stored_q = select(earnings).where(earnings.c.booking_id.is_not(None))
+    if artist_id is not None:
+        stored_q = stored_q.where(earnings.c.artist_id == artist_id)
+    _compare(
+        problems, "earning for booking",
+        {r.booking_id: (r.artist_id, money(r.amount), r.currency, _as_date(r.date)) for r in conn.execute(expected_earnings_query(artist_id))},
+        {r.booking_id: (r.artist_id, money(r.amount), r.currency, _as_date(r.date)) for r in conn.execute(stored_q)},
+    )
+
+    for table, key in ROLLUPS:
+        stored_q = select(table).where(table.c.bookings != 0)
+        if artist_id is not None:
+            stored_q = stored_q.where(table.c.artist_id == artist_id)
+        _compare(
+            problems, table.name,
+            {(r.artist_id, r.currency, _as_date(r[key])): (money(r.amount), r.bookings)
+             for r in conn.execute(expected_rollup_query(conn, key, artist_id)).mappings()},
+            {(r.artist_id, r.currency, _as_date(r[key])): (money(r.amount), r.bookings)
+             for r in conn.execute(stored_q).mappings()},
+        )
+    return problems
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.core.stats")
+    ap.add_argument("command", choices=("rebuild", "check"))
+    ap.add_argument("--artist", type=int, default=None)
+    args = ap.parse_args()
+    with engine.begin() as conn:
+        if args.command == "rebuild":
+            print(f"rebuilt stats for {rebuild(conn, args.artist)} artist(s)")
+            return 0
+        problems = check(conn, args.artist)
+    for line in problems:
+        print(line)
+    print(f"{len(problems)} mismatch(es)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,16 +5,20 @@ import os
 import logging
 from app.logging_conf import configure_logging
 from app.middlewares import RequestContextMiddleware
+from app.core.chat_hub import chat_hub
+from app.core.outbox import outbox_drainer
+from app.core.pdf import pdf_renderer
+from app.settings import settings
 
 
 
-# Import database configuration to ensure tables are created
-from app.core import db  # This ensures tables are created on startup
+from app.core import db
 from app.api.profile import router as profile_router
 from app.api.public import router as public_artist
 from app.api.auth import router as auth_router
 from app.api.bookings import router as bookings_router
 from app.api.chat import router as chat_router
+from app.api.fx import router as fx_router
 
 configure_logging()
 
@@ -28,13 +32,22 @@ app.add_middleware(RequestContextMiddleware)
 
 main_logger = logging.getLogger("app.main")
 
-# Ensure database tables are created
+# The schema is managed by alembic (migrations/README); run `alembic upgrade head` before starting
 @app.on_event("startup")
 async def startup_event():
-    """Create database tables on startup"""
     main_logger.info("Starting up...")
-    db.Base.metadata.create_all(bind=db.engine)
-    print("✅ Database tables created/verified successfully!")
+    if settings.OUTBOX_DRAIN_IN_APP:
+        outbox_drainer.start()
+    if settings.PDF_WARM_ON_STARTUP:
+        pdf_renderer.warm()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await db.async_engine.dispose()
+    await db.replicas.dispose()
+    await chat_hub.close()
+    await outbox_drainer.stop()
+    pdf_renderer.shutdown()
 
 # CORS configuration - hardened for production
 #ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
@@ -55,6 +68,7 @@ app.include_router(public_artist, prefix="/api/public", tags=["public"])
 app.include_router(bookings_router, prefix="/api/bookings", tags=["bookings"])
 
 app.include_router(chat_router, prefix="/api/chat", tags=["chat"])
+app.include_router(fx_router, prefix="/api/fx", tags=["fx"])
 
 
 @app.get("/")
@@ -5,31 +5,66 @@ import logging
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.logging_conf import request_id_var
+from app.core.db import replicas, READ_YOUR_WRITES_SECONDS, QueryStats, query_stats_var
+from app.core.replicas import DBRouteState, db_route_var
 
 access_logger = logging.getLogger("app.access")
 
+# Holds an epoch deadline; while it's in the future the client's reads go to the primary
+STICKY_COOKIE = "db_primary_until"
+
+def _sticky_from_cookie(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
 class RequestContextMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         token = None
+        route_token = None
+        stats_token = None
         try:
             # request_id מלקוח (x-request-id) או יצירה מקומית
             request_id = request.headers.get("x-request-id") or str(uuid.uuid4())
             token = request_id_var.set(request_id)
+            route_state = DBRouteState(sticky=_sticky_from_cookie(request))
+            route_token = db_route_var.set(route_state)
+            query_stats = QueryStats()
+            stats_token = query_stats_var.set(query_stats)
 
             start = time.perf_counter()
             response = await call_next(request)
+            if route_state.wrote and len(replicas):
+                response.set_cookie(
+                    STICKY_COOKIE,
+                    str(time.time() + READ_YOUR_WRITES_SECONDS),
+                    max_age=READ_YOUR_WRITES_SECONDS,
+                    httponly=True,
+                    samesite="lax",
+                )
             elapsed_ms = int((time.perf_counter() - start) * 1000)
 
+            response.headers["Server-Timing"] = (
+                f'db;dur={query_stats.total_ms:.1f};desc="{query_stats.count} queries", app;dur={elapsed_ms}'
+            )
+            response.headers["X-DB-Query-Count"] = str(query_stats.count)
             access_logger.info(
-                "HTTP %s %s -> %s in %dms ua=%s ip=%s",
+                "HTTP %s %s -> %s in %dms db=%d/%.1fms ua=%s ip=%s",
                 request.method,
                 request.url.path,
                 getattr(response, "status_code", "?"),
                 elapsed_ms,
+                query_stats.count,
+                query_stats.total_ms,
                 request.headers.get("user-agent", "-"),
                 request.client.host if request.client else "-",
             )
             return response
         finally:
+            if stats_token is not None:
+                query_stats_var.reset(stats_token)
+            if route_token is not None:
+                db_route_var.reset(route_token)
             if token is not None:
                 request_id_var.reset(token)
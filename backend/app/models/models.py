@@ -1,7 +1,7 @@
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, DateTime, Boolean,
-    ForeignKey, Numeric, Text, Date, Time , Index, func
+    ForeignKey, Numeric, Text, Date, Time , Index, func, DDL, event, JSON
 )
 from sqlalchemy.orm import relationship
 from app.core.db import Base  # שים לב: מייבא מ-app.core.db את Base
@@ -32,7 +32,7 @@ class UserSession(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    token = Column(String(500), nullable=False)
+    token = Column(String(500), nullable=False, index=True)  # looked up by get_current_user / logout
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -85,10 +85,25 @@ class BookingRequest(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     chat_token = Column(String, unique=True, default=generate_uuid, index=True)
+    # unread chat messages per side, kept by the chat send / read paths (app.api.chat)
+    artist_unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    booker_unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # event_date/event_time in time_zone + performance_duration, as a UTC interval (app.core.availability)
+    starts_at = Column(DateTime, nullable=True)
+    ends_at = Column(DateTime, nullable=True)
 
     artist = relationship("ArtistProfile", back_populates="bookings")
     messages = relationship("ChatMessage", back_populates="booking", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # listings (get_artist_bookings): artist_id [+ status] [+ event_date range]
+        # ORDER BY event_date, event_time, id — the keyset cursor; SQLite appends the rowid (id) itself
+        Index("ix_booking_requests_artist_status_date_time", "artist_id", "status", "event_date", "event_time"),
+        Index("ix_booking_requests_artist_date_time", "artist_id", "event_date", "event_time"),
+        # overlap checks (app.core.availability); covers the whole query
+        Index("ix_booking_requests_artist_interval", "artist_id", "starts_at", "ends_at", "status"),
+    )
+
 
 
     def to_pdf_dict(self) -> dict:
@@ -113,6 +128,13 @@ class BookingRequest(Base):
         }
 
 
+# listings filtered by country [+ city]; matched case-insensitively
+Index(
+    "ix_booking_requests_artist_location",
+    BookingRequest.artist_id, func.lower(BookingRequest.country), func.lower(BookingRequest.city),
+    BookingRequest.event_date, BookingRequest.event_time,
+)
+
 
 
 class ChatMessage(Base):
@@ -152,6 +174,32 @@ class ChatMessage(Base):
     )
 
 
+# Full-text search over chat messages (GET /api/chat/search). Not ORM-mapped:
+# SQLite gets an FTS5 external-content table that triggers keep in sync with chat_messages,
+# Postgres a GIN expression index on to_tsvector('simple', message) ('simple': Hebrew + English).
+# Runs on create_all for new databases; migration 0004 adds it to existing ones.
+CHAT_FTS_SQLITE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chat_messages_fts USING fts5("
+    "message, content='chat_messages', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ai AFTER INSERT ON chat_messages BEGIN "
+    "INSERT INTO chat_messages_fts(rowid, message) VALUES (new.id, new.message); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ad AFTER DELETE ON chat_messages BEGIN "
+    "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, message) VALUES ('delete', old.id, old.message); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_au AFTER UPDATE OF message ON chat_messages BEGIN "
+    "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, message) VALUES ('delete', old.id, old.message); "
+    "INSERT INTO chat_messages_fts(rowid, message) VALUES (new.id, new.message); END",
+)
+CHAT_FTS_POSTGRES = (
+    "CREATE INDEX IF NOT EXISTS ix_chat_messages_fts ON chat_messages "
+    "USING gin (to_tsvector('simple', message))",
+)
+
+for _ddl in CHAT_FTS_SQLITE:
+    event.listen(ChatMessage.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+for _ddl in CHAT_FTS_POSTGRES:
+    event.listen(ChatMessage.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+
+
 class CalendarBlock(Base):
     __tablename__ = "calendar_blocks"
 
@@ -161,20 +209,67 @@ class CalendarBlock(Base):
     start_time = Column(Time)
     end_time = Column(Time)
     reason = Column(Text)
+    time_zone = Column(String(100), nullable=True)  # IANA name; NULL = UTC
+    # block_date/start_time/end_time in time_zone as a UTC interval (app.core.availability)
+    starts_at = Column(DateTime, nullable=True)
+    ends_at = Column(DateTime, nullable=True)
 
     artist = relationship("ArtistProfile", back_populates="blocks")
 
+    __table_args__ = (
+        # overlap checks (app.core.availability)
+        Index("ix_calendar_blocks_artist_interval", "artist_id", "starts_at", "ends_at"),
+    )
+
+
+# Keep starts_at / ends_at in step with the local fields on every insert / update,
+# whichever code path writes the row.
+@event.listens_for(BookingRequest, "before_insert")
+@event.listens_for(BookingRequest, "before_update")
+def _set_booking_interval(mapper, connection, target):
+    from app.core.availability import booking_interval
+    if target.event_date and target.event_time:   # an empty time_zone is UTC, as in booking validation
+        try:
+            target.starts_at, target.ends_at = booking_interval(
+                target.event_date, target.event_time, target.time_zone, target.performance_duration
+            )
+        except ValueError:   # unknown time_zone on an old row: keep it out of overlap checks
+            target.starts_at = target.ends_at = None
+
+
+@event.listens_for(CalendarBlock, "before_insert")
+@event.listens_for(CalendarBlock, "before_update")
+def _set_block_interval(mapper, connection, target):
+    from app.core.availability import block_interval
+    if target.block_date:
+        try:
+            target.starts_at, target.ends_at = block_interval(
+                target.block_date, target.start_time, target.end_time, target.time_zone
+            )
+        except ValueError:
+            target.starts_at = target.ends_at = None
+
 class Earning(Base):
+    """
+    One row per accepted/completed booking (budget, currency, event date), written by
+    app.core.stats in the same flush as the booking; rows without booking_id are not
+    counted in the revenue rollups.
+    """
     __tablename__ = "earnings"
 
     id = Column(Integer, primary_key=True, index=True)
     artist_id = Column(Integer, ForeignKey("artist_profiles.user_id"), nullable=False, index=True)
+    booking_id = Column(Integer, ForeignKey("booking_requests.id", ondelete="CASCADE", name="fk_earnings_booking_id"), nullable=True)
     amount = Column(Numeric)
     currency = Column(String(10))
     date = Column(Date)
 
     artist = relationship("ArtistProfile", back_populates="earnings")
 
+    __table_args__ = (
+        Index("ux_earnings_booking_id", "booking_id", unique=True),   # upsert target
+    )
+
 class Notification(Base):
     __tablename__ = "notifications"
 
@@ -186,3 +281,86 @@ class Notification(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="notifications")
+
+
+class OutboxMessage(Base):
+    """
+    Outgoing email written in the same transaction as the change that triggers it and
+    delivered later by app.core.outbox.OutboxDrainer, so a crash after commit can't lose it.
+    """
+    __tablename__ = "outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)                 # e.g. "booking_confirmation"
+    booking_request_id = Column(
+        Integer, ForeignKey("booking_requests.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    payload = Column(JSON, nullable=False)                    # arguments for the transport
+    status = Column(String(20), nullable=False, default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # not before (retry backoff)
+    locked_by = Column(String(64), nullable=True)             # claim token of the drainer holding the lease
+    locked_until = Column(DateTime, nullable=True)            # lease expiry; expired leases are re-claimable
+    last_error = Column(Text, nullable=True)
+    provider_message_id = Column(String(255), nullable=True)  # Gmail message id once sent
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # claim query: status = 'pending' AND available_at <= now ORDER BY id
+        Index("ix_outbox_status_available", "status", "available_at", "id"),
+    )
+
+
+class ArtistStats(Base):
+    """
+    Dashboard counters per artist, kept in step with booking_requests by app.core.stats
+    (same transaction as the booking write). Rebuild / check: python -m app.core.stats.
+    """
+    __tablename__ = "artist_stats"
+
+    artist_id = Column(Integer, ForeignKey("artist_profiles.user_id", ondelete="CASCADE"), primary_key=True)
+    total_requests = Column(Integer, nullable=False, default=0)
+    pending_count = Column(Integer, nullable=False, default=0)
+    accepted_count = Column(Integer, nullable=False, default=0)
+    rejected_count = Column(Integer, nullable=False, default=0)
+    cancelled_count = Column(Integer, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # accepted bookings with event_date >= active_as_of; readers subtract the ones that have
+    # since passed (see app.core.stats.load_artist_stats), rebuild moves active_as_of to today
+    active_upcoming = Column(Integer, nullable=False, default=0)
+    active_as_of = Column(Date, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ArtistRevenueMonthly(Base):
+    """Earnings (accepted + completed bookings) per artist, currency and event month (app.core.stats)."""
+    __tablename__ = "artist_revenue_monthly"
+
+    artist_id = Column(Integer, ForeignKey("artist_profiles.user_id", ondelete="CASCADE"), primary_key=True)
+    currency = Column(String(10), primary_key=True)
+    month = Column(Date, primary_key=True)                   # first day of the event month
+    amount = Column(Numeric(14, 2), nullable=False, default=0)
+    bookings = Column(Integer, nullable=False, default=0)
+
+
+class ArtistRevenueDaily(Base):
+    """Earnings per artist, currency and event day; the month table's rows are sums of these."""
+    __tablename__ = "artist_revenue_daily"
+
+    artist_id = Column(Integer, ForeignKey("artist_profiles.user_id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)              # before currency: series queries range over days
+    currency = Column(String(10), primary_key=True)
+    amount = Column(Numeric(14, 2), nullable=False, default=0)
+    bookings = Column(Integer, nullable=False, default=0)
+
+
+class FxRate(Base):
+    """Exchange rates loaded from a file or POST /api/fx/rates (app.core.fx); no live feed."""
+    __tablename__ = "fx_rates"
+
+    currency = Column(String(10), primary_key=True)
+    day = Column(Date, primary_key=True)                     # in effect from this day until the next row
+    rate = Column(Numeric(20, 10), nullable=False)           # USD per 1 unit of currency
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
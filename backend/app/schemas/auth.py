@@ -162,7 +162,7 @@ class BookingRequestResponse(BaseModel):
         return value.strftime('%H:%M') if value else None
 
 class BookingStatusUpdate(BaseModel):
-    status: str  # accepted, rejected, cancelled
+    status: str  # accepted, rejected, cancelled, completed
 
 
 class BookingRequestUpdate(BaseModel):
@@ -172,6 +172,42 @@ class BookingRequestUpdate(BaseModel):
     budget: Optional[float] = None
 
 
+class BookingListItem(BaseModel):
+    id: int
+    event_date: date
+    event_time: time
+    time_zone: str
+    status: str
+    venue_name: str
+    city: str
+    country: str
+    performance_duration: int
+    budget: float
+    currency: str
+    client_first_name: str
+    client_last_name: str
+    client_email: str
+    artist_unread_count: int
+    created_at: datetime
+    updated_at: datetime
+
+class BookingListResponse(BaseModel):
+    bookings: List[BookingListItem]
+    has_more: bool = False
+    next_cursor: Optional[str] = None      # pass as cursor for the next page
+    total: Optional[int] = None            # only with include_total=true
+
+class BookingJobResponse(BaseModel):
+    id: int
+    kind: str                              # e.g. "booking_confirmation"
+    status: str                            # pending | sent | failed
+    attempts: int
+    last_error: Optional[str] = None
+    next_attempt_at: Optional[datetime] = None
+    provider_message_id: Optional[str] = None   # Gmail message id once sent
+    created_at: datetime
+    updated_at: datetime
+
 class ArtistDashboardStats(BaseModel):
     total_requests: int
     active_bookings: int
@@ -182,6 +218,8 @@ class ArtistDashboardStats(BaseModel):
     this_month_earnings: float
     avg_booking_fee: float
     total_bookings: int
+    currency: str = "USD"                        # earnings above are converted into this (profile currency)
+    unconverted_earnings: Dict[str, float] = {}  # per currency with no FX rate; not in the totals
 
     class Config:
         from_attributes = True
@@ -192,13 +230,44 @@ class ArtistDashboardStats(BaseModel):
 
 class ArtistDashboardResponse(BaseModel):
     profile: ArtistProfileOut
-    bookings: List[BookingRequestResponse]
-    stats: ArtistDashboardStats
+    bookings: List[BookingRequestResponse]   # latest by event date, at most bookings_limit
+    stats: ArtistDashboardStats              # over all bookings
+    bookings_has_more: bool = False
+    bookings_next_cursor: Optional[str] = None   # cursor for GET /api/bookings/artist/{artist_id}
     
     class Config:
         from_attributes = True
 
 
+class EarningsPoint(BaseModel):
+    period: date                 # first day of the day / month / year
+    amounts: Dict[str, float]    # per currency; empty when nothing was earned
+    amount: float                # all of them converted into the response currency
+    bookings: int
+
+class EarningsSeriesResponse(BaseModel):
+    start: date
+    end: date
+    granularity: str             # day | month | year
+    currency: str                # the artist's display currency
+    total: float                 # converted, over the whole range
+    totals: Dict[str, float]     # per currency, over the whole range
+    unconverted: Dict[str, float] = {}   # per currency with no FX rate; not in amount / total
+    series: List[EarningsPoint]
+
+
+class FxRateIn(BaseModel):
+    date: date
+    currency: str
+    rate: float                  # USD per 1 unit of currency
+
+class FxRatesUpload(BaseModel):
+    rates: List[FxRateIn]
+
+class FxRatesLoadResponse(BaseModel):
+    loaded: int
+
+
 
 
 ###  Chat schemas
@@ -222,8 +291,55 @@ class MessageResponse(BaseModel):
 
 class ChatResponse(BaseModel):
     messages: List[MessageResponse]
-    total_count: int
+    total_count: int                       # messages in this response
+    has_more: bool = False                 # the page was cut at `limit`
+    next_before_id: Optional[int] = None   # pass as before_id to load older messages
+    next_after_id: Optional[int] = None    # pass as after_id to poll for new messages only
 
+class ChatPreview(BaseModel):
+    id: int
+    sender_type: str
+    message: str                           # truncated to UNREAD_PREVIEW_CHARS
+    timestamp: datetime
+
+class BookingUnread(BaseModel):
+    booking_id: int
+    client_name: str
+    event_date: date
+    status: str
+    unread_count: int                      # booker messages the artist hasn't read
+    last_message: Optional[ChatPreview] = None
+
+class UnreadSummaryResponse(BaseModel):
+    bookings: List[BookingUnread]
+    total_unread: int
+
+class ChatSearchHit(BaseModel):
+    message_id: int
+    booking_id: int
+    client_name: str
+    sender_type: str
+    timestamp: datetime
+    snippet: str                           # matches wrapped in SEARCH_MARK_START / SEARCH_MARK_END
+
+class ChatSearchResponse(BaseModel):
+    hits: List[ChatSearchHit]
+    has_more: bool = False
+    next_offset: Optional[int] = None      # pass as offset for the next page
 
 
 
+
+
+class BusyInterval(BaseModel):
+    start: datetime                        # in the requested time zone
+    end: datetime
+
+class ArtistAvailabilityResponse(BaseModel):
+    artist_id: int
+    time_zone: str
+    start: date
+    end: date
+    busy: List[BusyInterval]               # merged: blocks and busy (BUSY_STATUSES) bookings alike
+    free_days: List[date]                  # nothing booked or blocked that day
+    busy_days: List[date]                  # booked or blocked the whole day
@@ -10,6 +10,51 @@ class Settings(BaseSettings):
     LOG_MAX_BYTES: int = Field(default=10_000_000)
     LOG_BACKUPS: int = Field(default=5)
 
+    # Auth session cache (per worker; hits still check the session row) — see app.api.auth.authenticate_token
+    SESSION_CACHE_TTL: int = Field(default=60)          # seconds
+    SESSION_CACHE_MAX_ENTRIES: int = Field(default=10_000)
+
+    # Comma-separated emails treated as admins (users are created as "artist"), e.g. for POST /api/fx/rates
+    ADMIN_EMAILS: str = Field(default="")
+
+    # SQL statements slower than this go to the "app.db.slow" logger with rendered SQL
+    SLOW_QUERY_MS: float = Field(default=200.0)
+
+    # Chat fan-out: Redis pub/sub across workers when set, in-process otherwise
+    REDIS_URL: str | None = Field(default=None)
+    CHAT_SUBSCRIBER_QUEUE: int = Field(default=100)     # events buffered per socket before it's dropped
+
+    # Transactional outbox for outgoing email — see app.core.outbox
+    MAIL_TRANSPORT: str = Field(default="gmail")        # gmail | fake (records instead of sending)
+    OUTBOX_DRAIN_IN_APP: bool = Field(default=True)     # run a drainer in every app worker
+    OUTBOX_BATCH_SIZE: int = Field(default=20)
+    OUTBOX_LEASE_SECONDS: float = Field(default=120.0)  # a claimed row is retried after this if not recorded
+    OUTBOX_MAX_ATTEMPTS: int = Field(default=8)
+    OUTBOX_POLL_SECONDS: float = Field(default=5.0)
+    OUTBOX_SEND_CONCURRENCY: int = Field(default=4)
+
+    # PDF rendering (WeasyPrint in a process pool) — see app.core.pdf
+    PDF_RENDER_WORKERS: int = Field(default=2)
+    PDF_RENDER_QUEUE: int = Field(default=16)           # renders waiting beyond the running ones
+    PDF_CACHE_DIR: str = Field(default="cache/pdf")
+    PDF_CACHE_MAX_MB: int = Field(default=500)          # least recently used PDFs go first beyond this
+    PDF_CACHE_MAX_AGE_DAYS: float = Field(default=30)   # PDFs not served for this long are removed
+    PDF_WARM_ON_STARTUP: bool = Field(default=True)
+
+    # Artist dashboard — see app.api.profile.get_artist_dashboard
+    DASHBOARD_BOOKINGS_LIMIT: int = Field(default=50)     # bookings embedded in the response; the rest via the listing
+    EARNINGS_MAX_POINTS: int = Field(default=3700)        # buckets per earnings series (~10 years of days)
+
+    # Currency conversion — see app.core.fx
+    FX_CACHE_TTL: int = Field(default=3600)               # seconds; per worker, cleared on local loads
+    FX_CACHE_MAX_ENTRIES: int = Field(default=50_000)     # one per (currency, month)
+
+    # Public availability calendar — see app.core.availability.month_availability
+    AVAILABILITY_CACHE_TTL: int = Field(default=60)            # seconds; per worker, dropped early on local writes
+    AVAILABILITY_CACHE_MAX_ENTRIES: int = Field(default=10_000)  # one per artist / month / time zone
+    AVAILABILITY_HTTP_MAX_AGE: int = Field(default=30)         # Cache-Control max-age for browsers and nginx
+    AVAILABILITY_MAX_DAYS: int = Field(default=186)            # longest range one request may ask for
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -0,0 +1,109 @@
+# bench/async_db.py
+"""
+Sync Session vs AsyncSession inside `async def` handlers.
+
+Runs the get_artist_bookings query from N concurrent tasks and reports throughput
+plus the worst event-loop stall seen by a heartbeat task (what every other request
+on the worker would wait).
+
+    cd backend && python -m bench.async_db [--rows 2000] [--concurrency 50] [--requests 500]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import select  # noqa: E402
+
+from app.core import db  # noqa: E402
+from app.models.models import ArtistProfile, BookingRequest, User  # noqa: E402
+
+ARTIST_ID = 1
+
+
+def seed(rows: int) -> None:
+    db.init_db()
+    s = db.SessionLocal()
+    if s.get(User, ARTIST_ID) is None:
+        s.add(User(id=ARTIST_ID, email="bench@example.com", name="Bench"))
+        s.add(ArtistProfile(user_id=ARTIST_ID, stage_name="Bench"))
+        s.flush()
+        s.add_all(
+            BookingRequest(
+                artist_id=ARTIST_ID, event_date=date.today() + timedelta(days=i % 365), event_time=dtime(20, 0),
+                time_zone="UTC", budget=100 + i, venue_name="V", city="C", country="X",
+                performance_duration=60, participant_count=10, client_first_name="F",
+                client_last_name="L", client_email=f"c{i}@example.com",
+            )
+            for i in range(rows)
+        )
+    s.commit()
+    s.close()
+
+
+def _stmt():
+    return (
+        select(BookingRequest)
+        .where(BookingRequest.artist_id == ARTIST_ID)
+        .order_by(BookingRequest.event_date.desc())
+    )
+
+
+async def sync_handler() -> int:
+    s = db.SessionLocal()
+    try:
+        return len(s.scalars(_stmt()).all())
+    finally:
+        s.close()
+
+
+async def async_handler() -> int:
+    async with db.AsyncSessionLocal() as s:
+        return len((await s.scalars(_stmt())).all())
+
+
+async def run(handler, concurrency: int, requests: int):
+    stalls = []
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        while not stop.is_set():
+            t = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append(time.perf_counter() - t - 0.001)
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            await handler()
+
+    hb = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await hb
+    return requests / elapsed, max(stalls or [0.0]) * 1000
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--requests", type=int, default=500)
+    args = ap.parse_args()
+
+    seed(args.rows)
+    for name, handler in (("sync Session", sync_handler), ("AsyncSession", async_handler)):
+        rps, stall_ms = await run(handler, args.concurrency, args.requests)
+        print(f"{name:<14} {rps:8.1f} req/s   max loop stall {stall_ms:7.1f} ms")
+    await db.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
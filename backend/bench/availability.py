@@ -0,0 +1,119 @@
+# bench/availability.py
+"""
+Booking conflict check on an artist with a big calendar.
+
+Seeds one artist with --blocks calendar blocks and --bookings bookings spread over a few
+years (mixed time zones, some blocks crossing midnight), then runs --checks random
+"is [start, start + duration) free?" probes two ways:
+
+  python scan     load the artist's blocks + busy bookings and compare intervals in Python
+                  (what a duration/time-zone aware check costs without stored intervals)
+  indexed query   app.core.availability.find_conflicts: one UNION over the interval indexes
+
+Both must agree on every probe. Prints p50 / p99 per probe.
+
+    cd backend && python -m bench.availability [--blocks 10000] [--bookings 2000] [--checks 500]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, time as dtime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import select  # noqa: E402
+
+from app.core import db  # noqa: E402
+from app.core.availability import BUSY_STATUSES, block_interval, booking_interval, find_conflicts  # noqa: E402
+from app.models.models import ArtistProfile, BookingRequest, CalendarBlock, User  # noqa: E402
+
+ARTIST_ID = 1
+ZONES = ("UTC", "Europe/London", "Asia/Jerusalem", "America/New_York", "Asia/Tokyo")
+SPAN_DAYS = 3 * 365
+
+
+def seed(blocks: int, bookings: int) -> None:
+    db.init_db()
+    rnd = random.Random(1)
+    first = date.today()
+    s = db.SessionLocal()
+    s.add(User(id=ARTIST_ID, email="bench@example.com", name="Bench"))
+    s.add(ArtistProfile(user_id=ARTIST_ID, stage_name="Bench"))
+    for i in range(blocks):
+        start = dtime(rnd.randrange(24), rnd.choice((0, 30)))
+        end = dtime((start.hour + rnd.randint(1, 6)) % 24, start.minute)   # some cross midnight
+        s.add(CalendarBlock(
+            artist_id=ARTIST_ID, block_date=first + timedelta(days=rnd.randrange(SPAN_DAYS)),
+            start_time=start, end_time=end, time_zone=rnd.choice(ZONES), reason=f"b{i}",
+        ))
+    for i in range(bookings):
+        s.add(BookingRequest(
+            artist_id=ARTIST_ID, event_date=first + timedelta(days=rnd.randrange(SPAN_DAYS)),
+            event_time=dtime(rnd.randrange(24), 0), time_zone=rnd.choice(ZONES),
+            performance_duration=rnd.choice((60, 90, 120, 240)), status=rnd.choice(("pending", "accepted", "rejected")),
+            budget=100, venue_name="V", city="C", country="X", participant_count=10,
+            client_first_name="F", client_last_name="L", client_email=f"c{i}@example.com",
+        ))
+    s.commit()
+    s.close()
+
+
+async def python_scan(start: datetime, end: datetime) -> bool:
+    async with db.AsyncSessionLocal() as s:
+        blocks = (await s.execute(select(
+            CalendarBlock.block_date, CalendarBlock.start_time, CalendarBlock.end_time, CalendarBlock.time_zone
+        ).where(CalendarBlock.artist_id == ARTIST_ID))).all()
+        bookings = (await s.execute(select(
+            BookingRequest.event_date, BookingRequest.event_time, BookingRequest.time_zone, BookingRequest.performance_duration
+        ).where(BookingRequest.artist_id == ARTIST_ID, BookingRequest.status.in_(BUSY_STATUSES)))).all()
+    intervals = [block_interval(*b) for b in blocks] + [booking_interval(*b) for b in bookings]
+    return not any(s < end and e > start for s, e in intervals)
+
+
+async def indexed_query(start: datetime, end: datetime) -> bool:
+    async with db.AsyncSessionLocal() as s:
+        return not await find_conflicts(s, ARTIST_ID, start, end, limit=1)
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--blocks", type=int, default=10_000)
+    ap.add_argument("--bookings", type=int, default=2_000)
+    ap.add_argument("--checks", type=int, default=500)
+    args = ap.parse_args()
+
+    logging.getLogger("app.db.slow").disabled = True
+    t = time.perf_counter()
+    seed(args.blocks, args.bookings)
+    print(f"seeded {args.blocks} blocks + {args.bookings} bookings in {time.perf_counter() - t:.1f}s")
+
+    rnd = random.Random(2)
+    base = datetime.combine(date.today(), dtime.min)
+    probes = []
+    for _ in range(args.checks):
+        start = base + timedelta(minutes=30 * rnd.randrange(SPAN_DAYS * 48))
+        probes.append((start, start + timedelta(minutes=rnd.choice((60, 120, 180)))))
+
+    answers = {}
+    for name, check in (("python scan", python_scan), ("indexed query", indexed_query)):
+        ms = []
+        answers[name] = []
+        for start, end in probes:
+            t = time.perf_counter()
+            answers[name].append(await check(start, end))
+            ms.append((time.perf_counter() - t) * 1000)
+        ms.sort()
+        p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+        free = sum(answers[name])
+        print(f"{name:<14} p50 {statistics.median(ms):8.2f} ms  p99 {p99:8.2f} ms   free {free}/{len(probes)}")
+    assert answers["python scan"] == answers["indexed query"], "methods disagree"
+    await db.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
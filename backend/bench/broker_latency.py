@@ -0,0 +1,69 @@
+# bench/broker_latency.py
+"""
+Publish-to-receive latency of the chat broker backends.
+
+One publisher, --subscribers listeners on the same channel; prints p50/p99/max
+latency per backend. The Redis backend uses --redis-url (e.g. a local redis-server)
+or fakeredis when no URL is given.
+
+    cd backend && python -m bench.broker_latency [--messages 2000] [--subscribers 10] [--redis-url redis://localhost:6379/0]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.broker import InMemoryBroker, RedisBroker, create_broker
+
+
+async def measure(broker, messages: int, subscribers: int) -> list:
+    subs = [await broker.subscribe("chat:bench") for _ in range(subscribers)]
+    latencies = []
+
+    async def consume(sub):
+        for _ in range(messages):
+            event = await sub.get()
+            latencies.append(time.perf_counter() - event["sent"])
+
+    consumers = [asyncio.create_task(consume(s)) for s in subs]
+    for i in range(messages):
+        await broker.publish("chat:bench", {"type": "message", "n": i, "sent": time.perf_counter()})
+        if i % 50 == 0:
+            await asyncio.sleep(0)   # keep queues under the backpressure limit
+    await asyncio.gather(*consumers)
+    for s in subs:
+        await s.close()
+    await broker.close()
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    ms = sorted(x * 1000 for x in latencies)
+    p99 = ms[int(len(ms) * 0.99) - 1]
+    print(f"{name:<10} n={len(ms):6d}  p50 {statistics.median(ms):7.3f} ms  p99 {p99:7.3f} ms  max {ms[-1]:7.3f} ms")
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=2000)
+    ap.add_argument("--subscribers", type=int, default=10)
+    ap.add_argument("--redis-url", default=None)
+    args = ap.parse_args()
+    queue_size = args.messages + 1   # measure latency, not drops
+
+    report("memory", await measure(InMemoryBroker(queue_size), args.messages, args.subscribers))
+
+    if args.redis_url:
+        redis_broker = create_broker(args.redis_url, queue_size=queue_size)
+    else:
+        try:
+            from fakeredis import FakeAsyncRedis
+        except ImportError:
+            print("redis     skipped (pass --redis-url or pip install fakeredis)")
+            return
+        redis_broker = RedisBroker(FakeAsyncRedis(), queue_size=queue_size)
+    report("redis", await measure(redis_broker, args.messages, args.subscribers))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+# bench/chat_read_contention.py
+"""
+Chat polling vs sending on one booking.
+
+--pollers tasks fetch the artist side of the chat in a loop while one booker task keeps
+sending. "always update" is the old read path (UPDATE ... SET is_read + COMMIT on every
+fetch); "unread counter" is mark_messages_read, which only writes when something is unread.
+Prints poll throughput and send latency for each.
+
+    cd backend && python -m bench.chat_read_contention [--pollers 20] [--sends 200] [--history 500]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, time as dtime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import update  # noqa: E402
+
+from app.api.chat import bump_unread, fetch_messages_page, mark_messages_read  # noqa: E402
+from app.core import db  # noqa: E402
+from app.models.models import ArtistProfile, BookingRequest, ChatMessage, User  # noqa: E402
+
+ARTIST_ID = 1
+
+
+def seed(history: int) -> int:
+    db.init_db()
+    s = db.SessionLocal()
+    s.add(User(id=ARTIST_ID, email="bench@example.com", name="Bench"))
+    s.add(ArtistProfile(user_id=ARTIST_ID, stage_name="Bench"))
+    booking = BookingRequest(
+        artist_id=ARTIST_ID, event_date=date.today() + timedelta(days=30), event_time=dtime(20, 0),
+        time_zone="UTC", budget=100, venue_name="V", city="C", country="X",
+        performance_duration=60, participant_count=10, client_first_name="F",
+        client_last_name="L", client_email="c@example.com",
+    )
+    s.add(booking)
+    s.flush()
+    s.add_all(
+        ChatMessage(
+            booking_request_id=booking.id, sender_type="booker" if i % 2 else "artist",
+            sender_user_id=None if i % 2 else ARTIST_ID, message=f"m{i}",
+            timestamp=datetime.utcnow(), is_read=True,
+        )
+        for i in range(history)
+    )
+    s.commit()
+    booking_id = booking.id
+    s.close()
+    return booking_id
+
+
+async def legacy_poll(booking_id: int) -> None:
+    async with db.AsyncSessionLocal() as s:
+        await s.get(BookingRequest, booking_id)
+        await fetch_messages_page(s, booking_id, limit=50)
+        await s.execute(
+            update(ChatMessage)
+            .where(
+                ChatMessage.booking_request_id == booking_id,
+                ChatMessage.sender_type == "booker",
+                ChatMessage.is_read == False,  # noqa: E712
+            )
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        await s.commit()
+
+
+async def counter_poll(booking_id: int) -> None:
+    async with db.AsyncSessionLocal() as s:
+        booking = await s.get(BookingRequest, booking_id)
+        await fetch_messages_page(s, booking_id, limit=50)
+        await mark_messages_read(s, booking, "artist")
+        await s.commit()
+
+
+async def send(booking_id: int, n: int) -> None:
+    async with db.AsyncSessionLocal() as s:
+        s.add(ChatMessage(
+            booking_request_id=booking_id, sender_type="booker", message=f"new {n}",
+            timestamp=datetime.utcnow(), is_read=False,
+        ))
+        await bump_unread(s, booking_id, "booker")
+        await s.commit()
+
+
+async def run(poll, booking_id: int, pollers: int, sends: int):
+    stop = asyncio.Event()
+    polls = 0
+    send_ms = []
+
+    async def poller():
+        nonlocal polls
+        while not stop.is_set():
+            await poll(booking_id)
+            polls += 1
+
+    async def sender():
+        for n in range(sends):
+            t = time.perf_counter()
+            await send(booking_id, n)
+            send_ms.append((time.perf_counter() - t) * 1000)
+            await asyncio.sleep(0.005)
+        stop.set()
+
+    start = time.perf_counter()
+    await asyncio.gather(sender(), *(poller() for _ in range(pollers)))
+    elapsed = time.perf_counter() - start
+    return polls / elapsed, send_ms
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pollers", type=int, default=20)
+    ap.add_argument("--sends", type=int, default=200)
+    ap.add_argument("--history", type=int, default=500)
+    args = ap.parse_args()
+
+    logging.getLogger("app.db.slow").disabled = True   # lock waits would flood the output
+    booking_id = seed(args.history)
+    for name, poll in (("always update", legacy_poll), ("unread counter", counter_poll)):
+        rps, send_ms = await run(poll, booking_id, args.pollers, args.sends)
+        send_ms.sort()
+        p99 = send_ms[min(len(send_ms) - 1, int(len(send_ms) * 0.99))]
+        print(
+            f"{name:<15} polls {rps:8.1f}/s   send p50 {statistics.median(send_ms):7.2f} ms"
+            f"  p99 {p99:7.2f} ms  max {send_ms[-1]:7.2f} ms"
+        )
+    await db.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+# bench/chat_serialization.py
+"""
+Chat history serialization over one long conversation.
+
+"orm + pydantic" is the old path: ChatMessage entities with the sender relationship
+selectin-loaded, a MessageResponse per message, then the ChatResponse validation and JSON
+encoding FastAPI does for response_model. "rows + dict" is fetch_messages_page +
+chat_page_response. Both bodies are checked to be identical before timing.
+
+    cd backend && python -m bench.chat_serialization [--messages 5000] [--rounds 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import date, datetime, time as dtime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.api.chat import booker_display_name, chat_page_response, fetch_messages_page  # noqa: E402
+from app.core import db  # noqa: E402
+from app.models.models import ArtistProfile, BookingRequest, ChatMessage, User  # noqa: E402
+from app.schemas.auth import ChatResponse, MessageResponse  # noqa: E402
+
+ARTIST_ID = 1
+
+
+def seed(messages: int) -> int:
+    db.init_db()
+    s = db.SessionLocal()
+    s.add(User(id=ARTIST_ID, email="bench@example.com", name="Bench"))
+    s.add(ArtistProfile(user_id=ARTIST_ID, stage_name="Bench"))
+    booking = BookingRequest(
+        artist_id=ARTIST_ID, event_date=date.today() + timedelta(days=30), event_time=dtime(20, 0),
+        time_zone="UTC", budget=100, venue_name="V", city="C", country="X",
+        performance_duration=60, participant_count=10, client_first_name="F",
+        client_last_name="L", client_email="c@example.com",
+    )
+    s.add(booking)
+    s.flush()
+    start = datetime.utcnow() - timedelta(days=30)
+    s.add_all(
+        ChatMessage(
+            booking_request_id=booking.id, sender_type="booker" if i % 2 else "artist",
+            sender_user_id=None if i % 2 else ARTIST_ID, message=f"message number {i} " * 4,
+            timestamp=start + timedelta(seconds=i, microseconds=i % 7), is_read=bool(i % 3),
+        )
+        for i in range(messages)
+    )
+    s.commit()
+    booking_id = booking.id
+    s.close()
+    return booking_id
+
+
+async def orm_pydantic(booking_id: int) -> bytes:
+    async with db.AsyncSessionLocal() as s:
+        booking = await s.get(BookingRequest, booking_id)
+        messages = (await s.scalars(
+            select(ChatMessage)
+            .options(selectinload(ChatMessage.sender))
+            .where(ChatMessage.booking_request_id == booking_id)
+            .order_by(ChatMessage.timestamp, ChatMessage.id)
+        )).all()
+        items = [
+            MessageResponse(
+                id=m.id,
+                booking_request_id=m.booking_request_id,
+                sender_user_id=m.sender_user_id if m.sender_type == "artist" else None,
+                sender_type=m.sender_type,
+                message=m.message,
+                timestamp=m.timestamp,
+                is_read=m.is_read,
+                sender_name=booker_display_name(booking) if m.sender_type == "booker" else m.sender.name,
+            )
+            for m in messages
+        ]
+        body = ChatResponse(messages=items, total_count=len(items), next_after_id=items[-1].id if items else None)
+        # FastAPI re-validates the returned model against response_model, then encodes it
+        body = ChatResponse.model_validate(body.model_dump())
+        return json.dumps(body.model_dump(mode="json")).encode()
+
+
+async def rows_dict(booking_id: int) -> bytes:
+    async with db.AsyncSessionLocal() as s:
+        booking = await s.get(BookingRequest, booking_id)
+        rows, has_more = await fetch_messages_page(s, booking_id)
+        return chat_page_response(rows, booking, "Bench", has_more, None).body
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=5000)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    booking_id = seed(args.messages)
+    old, new = await orm_pydantic(booking_id), await rows_dict(booking_id)
+    assert json.loads(old) == json.loads(new), "serialization paths disagree"
+
+    for name, path in (("orm + pydantic", orm_pydantic), ("rows + dict", rows_dict)):
+        timings = []
+        for _ in range(args.rounds):
+            t = time.perf_counter()
+            await path(booking_id)
+            timings.append((time.perf_counter() - t) * 1000)
+        timings.sort()
+        print(f"{name:<15} {args.messages} msgs   median {timings[len(timings) // 2]:7.1f} ms   best {timings[0]:7.1f} ms")
+    await db.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
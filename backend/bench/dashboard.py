@@ -0,0 +1,161 @@
+# bench/dashboard.py
+"""
+Artist dashboard cost as booking history grows.
+
+"load all" is the old get_artist_dashboard: every BookingRequest loaded, stats summed in
+Python, every booking serialized into the response. "sql aggregate" computes the stats with
+conditional aggregates over the artist's bookings; "materialized" (the current endpoint) reads
+them from artist_stats / artist_revenue_monthly (app.core.stats). Both aggregate variants add
+the latest DASHBOARD_BOOKINGS_LIMIT bookings. Prints latency and response payload size per
+history size.
+
+    cd backend && python -m bench.dashboard [--sizes 100,1000,10000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import and_, case, func, select  # noqa: E402
+
+from app.core import db  # noqa: E402
+from app.core.stats import load_artist_stats, rebuild  # noqa: E402
+from app.models.models import ArtistProfile, BookingRequest, User  # noqa: E402
+from app.schemas.auth import BookingRequestResponse  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+
+def seed(artist_id: int, count: int) -> None:
+    rnd = random.Random(artist_id)
+    s = db.SessionLocal()
+    s.add(User(id=artist_id, email=f"bench{artist_id}@example.com", name="Bench"))
+    s.add(ArtistProfile(user_id=artist_id, stage_name="Bench"))
+    s.bulk_insert_mappings(BookingRequest, [
+        dict(
+            artist_id=artist_id, event_date=date.today() + timedelta(days=rnd.randint(-1000, 365)),
+            event_time=dtime(rnd.randrange(24), 0), time_zone="UTC", budget=rnd.choice((100, 250, 1000)),
+            currency="USD", venue_name="Venue", city="City", country="Country", performance_duration=60,
+            participant_count=100, client_first_name="First", client_last_name="Last",
+            client_email="client@example.com", client_message="Looking forward to it!",
+            status=rnd.choice(("pending", "accepted", "rejected", "cancelled")),
+        )
+        for _ in range(count)
+    ])
+    s.commit()
+    s.close()
+    with db.engine.begin() as conn:   # bulk inserts skip the flush hook
+        rebuild(conn, artist_id)
+
+
+def dashboard_stats_query(artist_id: int, today: date):
+    month_start = today.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    accepted = BookingRequest.status == "accepted"
+
+    def count_if(*conds):
+        return func.coalesce(func.sum(case((and_(*conds), 1), else_=0)), 0)
+
+    def budget_if(*conds):
+        return func.coalesce(func.sum(case((and_(*conds), BookingRequest.budget), else_=0)), 0)
+
+    return select(
+        func.count().label("total_requests"),
+        count_if(BookingRequest.status == "pending").label("pending"),
+        count_if(accepted).label("accepted"),
+        count_if(BookingRequest.status == "cancelled").label("cancelled"),
+        count_if(accepted, BookingRequest.event_date >= today).label("active_bookings"),
+        budget_if(accepted).label("total_earnings"),
+        budget_if(accepted, BookingRequest.event_date >= month_start, BookingRequest.event_date < next_month)
+        .label("this_month_earnings"),
+    ).where(BookingRequest.artist_id == artist_id)
+
+
+async def latest_bookings(s, artist_id: int) -> list:
+    bookings = (await s.scalars(
+        select(BookingRequest).where(BookingRequest.artist_id == artist_id)
+        .order_by(BookingRequest.event_date.desc(), BookingRequest.event_time.desc(), BookingRequest.id.desc())
+        .limit(settings.DASHBOARD_BOOKINGS_LIMIT + 1)
+    )).all()
+    return [
+        BookingRequestResponse.model_validate(b, from_attributes=True).model_dump(mode="json")
+        for b in bookings[:settings.DASHBOARD_BOOKINGS_LIMIT]
+    ]
+
+
+async def load_all(artist_id: int) -> bytes:
+    async with db.AsyncSessionLocal() as s:
+        bookings = (await s.scalars(
+            select(BookingRequest).where(BookingRequest.artist_id == artist_id).order_by(BookingRequest.event_date.desc())
+        )).all()
+        today = date.today()
+        accepted = [b for b in bookings if b.status == "accepted"]
+        stats = {
+            "total_requests": len(bookings),
+            "pending": sum(1 for b in bookings if b.status == "pending"),
+            "accepted": len(accepted),
+            "cancelled": sum(1 for b in bookings if b.status == "cancelled"),
+            "active_bookings": sum(1 for b in accepted if b.event_date >= today),
+            "total_earnings": float(sum(b.budget for b in accepted)),
+            "this_month_earnings": float(sum(
+                b.budget for b in accepted if (b.event_date.year, b.event_date.month) == (today.year, today.month)
+            )),
+        }
+        items = [BookingRequestResponse.model_validate(b, from_attributes=True).model_dump(mode="json") for b in bookings]
+    return json.dumps({"stats": stats, "bookings": items}).encode()
+
+
+async def sql_aggregate(artist_id: int) -> bytes:
+    async with db.AsyncSessionLocal() as s:
+        row = (await s.execute(dashboard_stats_query(artist_id, date.today()))).one()
+        stats = {k: float(v) for k, v in row._mapping.items()}
+        items = await latest_bookings(s, artist_id)
+    return json.dumps({"stats": stats, "bookings": items}).encode()
+
+
+async def materialized(artist_id: int) -> bytes:
+    async with db.AsyncSessionLocal() as s:
+        today = date.today()
+        row = await load_artist_stats(s, artist_id, today)
+        stats = {
+            "total_requests": row["total_requests"],
+            "pending": row["pending_count"],
+            "accepted": row["accepted_count"],
+            "cancelled": row["cancelled_count"],
+            "active_bookings": row["active_upcoming"],
+            "total_earnings": float(sum(r.amount for r in row["revenue"])),
+            "this_month_earnings": float(sum(r.amount for r in row["revenue"] if r.month == today.replace(day=1))),
+        }
+        items = await latest_bookings(s, artist_id)
+    return json.dumps({"stats": stats, "bookings": items}).encode()
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="100,1000,10000")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    logging.getLogger("app.db.slow").disabled = True
+    db.init_db()
+    for artist_id, size in enumerate((int(n) for n in args.sizes.split(",")), start=1):
+        seed(artist_id, size)
+        for name, fn in (("load all", load_all), ("sql aggregate", sql_aggregate), ("materialized", materialized)):
+            ms = []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                body = await fn(artist_id)
+                ms.append((time.perf_counter() - t) * 1000)
+            print(f"{size:>6} bookings  {name:<14} p50 {statistics.median(ms):8.2f} ms   payload {len(body) / 1024:8.1f} KiB")
+    await db.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
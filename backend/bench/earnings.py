@@ -0,0 +1,167 @@
+# bench/earnings.py
+"""
+Earnings time series over long ranges.
+
+"booking scan" groups the artist's accepted/completed bookings by period on every request
+(what the series costs without rollups); "rollups" is app.core.stats.earnings_series, which
+reads artist_revenue_monthly plus the daily rows of the partial edge months. Both must agree.
+Then the 10-year monthly series converted to EUR (daily FX rates seeded for every currency):
+"per-row lookup" queries the two rates of each rollup row, "fx batched" is
+earnings_series(to_currency=...) with app.core.fx's rate_cache cleared before every run,
+"fx cached" with it warm. Prints p50 per case.
+
+    cd backend && python -m bench.earnings [--bookings 100000] [--years 10] [--repeat 20]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from sqlalchemy import select  # noqa: E402
+
+from app.core import db  # noqa: E402
+from app.core.fx import BASE_CURRENCY, load_rates, rate_cache, rate_date  # noqa: E402
+from app.core.stats import EARNED_STATUSES, EarningsBucket, earnings_series, period_start, next_period, rebuild  # noqa: E402
+from app.models.models import ArtistProfile, ArtistRevenueMonthly, BookingRequest, FxRate, User  # noqa: E402
+
+ARTIST_ID = 1
+
+
+def seed(bookings: int, years: int) -> None:
+    db.init_db()
+    rnd = random.Random(1)
+    s = db.SessionLocal()
+    s.add(User(id=ARTIST_ID, email="bench@example.com", name="Bench"))
+    s.add(ArtistProfile(user_id=ARTIST_ID, stage_name="Bench"))
+    s.bulk_insert_mappings(BookingRequest, [
+        dict(
+            artist_id=ARTIST_ID, event_date=date.today() - timedelta(days=rnd.randrange(years * 365)),
+            event_time=dtime(rnd.randrange(24), 0), time_zone="UTC", budget=rnd.choice((100, 250, 1000)),
+            currency=rnd.choice(("USD", "EUR", "ILS")), venue_name="Venue", city="City", country="Country",
+            performance_duration=60, participant_count=100, client_first_name="First", client_last_name="Last",
+            client_email="client@example.com", status=rnd.choice(("pending", "accepted", "rejected", "completed")),
+        )
+        for _ in range(bookings)
+    ])
+    s.commit()
+    s.close()
+    with db.engine.begin() as conn:   # bulk inserts skip the flush hook
+        rebuild(conn, ARTIST_ID)
+        day = date.today() - timedelta(days=years * 365 + 31)
+        rates = []
+        while day <= date.today():
+            rates += [
+                {"currency": "EUR", "day": day, "rate": Decimal("1.05") + Decimal(rnd.randrange(100)) / 1000},
+                {"currency": "ILS", "day": day, "rate": Decimal("0.25") + Decimal(rnd.randrange(50)) / 1000},
+            ]
+            day += timedelta(days=1)
+        load_rates(conn, rates)
+
+
+async def booking_scan(start: date, end: date, granularity: str):
+    async with db.AsyncSessionLocal() as s:
+        rows = (await s.execute(select(BookingRequest.event_date, BookingRequest.currency, BookingRequest.budget).where(
+            BookingRequest.artist_id == ARTIST_ID, BookingRequest.status.in_(EARNED_STATUSES),
+            BookingRequest.event_date >= start, BookingRequest.event_date <= end,
+        ))).all()
+    buckets = {}
+    p = period_start(start, granularity)
+    while p <= end:
+        buckets[p] = EarningsBucket(p)
+        p = next_period(p, granularity)
+    for day, currency, budget in rows:
+        b = buckets[period_start(day, granularity)]
+        b.amounts[currency] = b.amounts.get(currency, Decimal(0)) + Decimal(str(budget))
+        b.bookings += 1
+    return list(buckets.values())
+
+
+async def rollups(start: date, end: date, granularity: str):
+    async with db.AsyncSessionLocal() as s:
+        return await earnings_series(s, ARTIST_ID, start, end, granularity)
+
+
+async def per_row_lookup(start: date, end: date, to_currency: str) -> Decimal:
+    async def rate(s, currency, day):
+        if currency == BASE_CURRENCY:
+            return Decimal(1)
+        return Decimal(str(await s.scalar(
+            select(FxRate.rate).where(FxRate.currency == currency, FxRate.day <= day).order_by(FxRate.day.desc()).limit(1)
+        )))
+
+    async with db.AsyncSessionLocal() as s:
+        rows = (await s.execute(select(ArtistRevenueMonthly).where(
+            ArtistRevenueMonthly.artist_id == ARTIST_ID, ArtistRevenueMonthly.month >= start, ArtistRevenueMonthly.month <= end,
+        ))).scalars().all()
+        total = Decimal(0)
+        for r in rows:
+            month = rate_date(r.month)
+            total += Decimal(str(r.amount)) * await rate(s, r.currency, month) / await rate(s, to_currency, month)
+    return total
+
+
+async def fx_batched(start: date, end: date, to_currency: str, cold: bool = True) -> Decimal:
+    if cold:
+        rate_cache.clear()
+    async with db.AsyncSessionLocal() as s:
+        return sum(b.converted for b in await earnings_series(s, ARTIST_ID, start, end, "month", to_currency=to_currency))
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bookings", type=int, default=100_000)
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    logging.getLogger("app.db.slow").disabled = True
+    t = time.perf_counter()
+    seed(args.bookings, args.years)
+    print(f"seeded {args.bookings} bookings over {args.years} years in {time.perf_counter() - t:.1f}s")
+
+    today = date.today()
+    cases = (
+        (today - timedelta(days=90), today, "day"),
+        (today - timedelta(days=args.years * 365), today, "month"),
+        (today - timedelta(days=args.years * 365), today, "year"),
+    )
+    for start, end, granularity in cases:
+        results = {}
+        for name, fn in (("booking scan", booking_scan), ("rollups", rollups)):
+            ms = []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                results[name] = await fn(start, end, granularity)
+                ms.append((time.perf_counter() - t) * 1000)
+            print(f"{(end - start).days:>5} days by {granularity:<5}  {name:<12} p50 {statistics.median(ms):8.2f} ms   points {len(results[name])}")
+        assert results["booking scan"] == results["rollups"], "methods disagree"
+
+    start, end = date.today().replace(day=1) - timedelta(days=args.years * 365), date.today()
+    start = start.replace(day=1)   # whole months, so every variant reads the same rollup rows
+    end = next_period(end.replace(day=1), "month") - timedelta(days=1)
+    totals = {}
+    for name, fn in (
+        ("per-row lookup", per_row_lookup),
+        ("fx batched", fx_batched),
+        ("fx cached", lambda a, b, c: fx_batched(a, b, c, cold=False)),
+    ):
+        ms = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            totals[name] = await fn(start, end, "EUR")
+            ms.append((time.perf_counter() - t) * 1000)
+        print(f"{args.years} years by month in EUR  {name:<15} p50 {statistics.median(ms):8.2f} ms   total {totals[name]:.2f}")
+    assert len({round(t, 2) for t in totals.values()}) == 1, "conversions disagree"
+    await db.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+# bench/gmail_client.py
+"""
+GmailClient against a local stub of the Google token + Gmail endpoints.
+
+Compares a client per email (what send_pdf_via_gmail used to do: new credentials, token
+exchange and HTTP stack every time) with one shared GmailClient from --threads threads,
+and with send_batch. Prints msgs/s, token exchanges and TCP connections the stub saw, and
+checks that a failing message inside a batch is reported without failing the others.
+
+    cd backend && python -m bench.gmail_client [--messages 300] [--threads 8] [--latency-ms 5]
+"""
+import argparse
+import base64
+import itertools
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.api.mail import GmailClient, GmailError, build_pdf_message
+
+
+class StubGmail(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.tokens = self.connections = self.sent = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def deliver(self, raw: str):
+        """(status, body) for one send; recipients at fail@ are rejected."""
+        time.sleep(self.latency)
+        if b"fail@" in base64.urlsafe_b64decode(raw):
+            return 400, {"error": {"code": 400, "message": "Invalid To header"}}
+        with self.lock:
+            self.sent += 1
+            return 200, {"id": f"msg-{next(self.ids)}", "labelIds": ["SENT"]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so connection reuse is visible
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/token":
+            with self.server.lock:
+                self.server.tokens += 1
+            return self._reply(200, json.dumps({"access_token": f"tok-{self.server.tokens}", "expires_in": 3600, "token_type": "Bearer"}).encode())
+        if not self.headers.get("Authorization", "").startswith("Bearer tok-"):
+            return self._reply(401, b'{"error": "unauthorized"}')
+        if self.path == "/gmail/v1/users/me/messages/send":
+            status, payload = self.server.deliver(json.loads(body)["raw"])
+            return self._reply(status, json.dumps(payload).encode())
+        if self.path == "/batch/gmail/v1":
+            boundary = re.search(r"boundary=([^;]+)", self.headers["Content-Type"]).group(1)
+            out = []
+            for part in body.decode().split(f"--{boundary}"):
+                cid = re.search(r"Content-ID: <item-(\d+)>", part)
+                if not cid:
+                    continue
+                raw = json.loads(part.strip().rsplit("\r\n\r\n", 1)[1])["raw"]
+                status, payload = self.server.deliver(raw)
+                out.append(
+                    f"--resp\r\nContent-Type: application/http\r\nContent-ID: <response-item-{cid.group(1)}>\r\n\r\n"
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Bad Request'}\r\n"
+                    f"Content-Type: application/json; charset=UTF-8\r\n\r\n{json.dumps(payload)}\r\n"
+                )
+            return self._reply(200, ("".join(out) + "--resp--\r\n").encode(), "multipart/mixed; boundary=resp")
+        self._reply(404, b"{}")
+
+
+def message(i: int, to: str = "client@example.com"):
+    return build_pdf_message(to, f"Booking Confirmation #{i}", "Thanks!", b"%PDF-1.4 stub" * 200, f"booking_{i}.pdf", sender="me@example.com")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=300)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--latency-ms", type=float, default=5.0, help="stub latency per message")
+    args = ap.parse_args()
+
+    stub = StubGmail(args.latency_ms / 1000)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    def new_client() -> GmailClient:
+        return GmailClient("id", "secret", "refresh", "me@example.com", token_uri=f"{stub.url}/token", api_base=stub.url)
+
+    def per_email(i):
+        client = new_client()
+        try:
+            return client.send(message(i))
+        finally:
+            client.close()
+
+    shared = new_client()
+    runs = {
+        "client per email": lambda: list(ThreadPoolExecutor(args.threads).map(per_email, range(args.messages))),
+        "shared client": lambda: list(ThreadPoolExecutor(args.threads).map(lambda i: shared.send(message(i)), range(args.messages))),
+        "send_batch": lambda: shared.send_batch([message(i) for i in range(args.messages)]),
+    }
+    for name, run in runs.items():
+        stub.reset()
+        start = time.perf_counter()
+        ids = run()
+        elapsed = time.perf_counter() - start
+        assert len(ids) == args.messages and all(isinstance(x, str) for x in ids)
+        print(f"{name:<17} {args.messages / elapsed:8.1f} msgs/s   token exchanges {stub.tokens:4d}   TCP connections {stub.connections:4d}")
+
+    mixed = shared.send_batch([message(0), message(1, to="fail@example.com"), message(2)])
+    assert isinstance(mixed[0], str) and isinstance(mixed[1], GmailError) and isinstance(mixed[2], str), mixed
+    print(f"batch with one bad recipient: {[m if isinstance(m, str) else f'error {m.status}' for m in mixed]}")
+    shared.close()
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# bench/pdf_render.py
+"""
+Booking summary PDF: template compile cache, renderer process pool, disk cache.
+
+1. Jinja: a new Environment + FileSystemLoader per PDF (the old generate_pdf_in_memory)
+   vs the module-level compiled template in app.core.pdf.
+2. WeasyPrint inline vs PdfRenderer's warm process pool from --threads threads, then a
+   second pass over the same bookings served from the disk cache. Needs WeasyPrint's
+   system libraries (pango); skipped with a message when they are missing.
+
+    cd backend && python -m bench.pdf_render [--renders 200] [--pdfs 40] [--workers 2] [--threads 8]
+"""
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from jinja2 import Environment, FileSystemLoader
+
+from app.core.pdf import (
+    BOOKING_SUMMARY_TEMPLATE, TEMPLATE_DIR, PdfCache, PdfRenderer, html_to_pdf, render_booking_summary_html,
+)
+
+DETAILS = {
+    "Event Date": "2030-06-01", "Event Time": "20:00", "Time Zone": "Asia/Jerusalem",
+    "Budget": "2500.00 USD", "Venue": "Barby", "City": "Tel Aviv", "Country": "Israel",
+    "Performance Duration": "90 minutes", "Participants": 300, "Client Name": "Dana Levi",
+    "Client Email": "dana@example.com", "Message": "Looking forward!",
+}
+
+
+def uncached_html() -> str:
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    return env.get_template(BOOKING_SUMMARY_TEMPLATE).render(
+        artist_name="Bench", booking_details=DETAILS, chat_url="http://x", date="2030-01-01", time="10:00"
+    )
+
+
+def timed(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--renders", type=int, default=200, help="template renders per variant")
+    ap.add_argument("--pdfs", type=int, default=40)
+    ap.add_argument("--workers", type=int, default=2)
+    ap.add_argument("--threads", type=int, default=8)
+    args = ap.parse_args()
+
+    html = lambda: render_booking_summary_html("Bench", DETAILS, "http://x")
+    print(f"template  new Environment per PDF {timed(uncached_html, args.renders):7.3f} ms   compiled once {timed(html, args.renders):7.3f} ms")
+
+    try:
+        html_to_pdf("<p>probe</p>")
+    except Exception as e:
+        print(f"pdf       skipped: WeasyPrint unavailable here ({type(e).__name__})")
+        return
+
+    start = time.perf_counter()
+    for _ in range(args.pdfs):
+        html_to_pdf(html())
+    inline = time.perf_counter() - start
+
+    renderer = PdfRenderer(workers=args.workers, max_pending=args.pdfs, cache=PdfCache(tempfile.mkdtemp()))
+    renderer.warm()
+    renderer.render("<p>wait for the pool</p>")
+    stamp = datetime.utcnow()
+
+    def one(i):
+        return renderer.booking_pdf(i, stamp, html)
+
+    passes = []
+    for _ in range(2):   # second pass: disk cache hits
+        start = time.perf_counter()
+        list(ThreadPoolExecutor(args.threads).map(one, range(args.pdfs)))
+        passes.append(time.perf_counter() - start)
+    renderer.shutdown()
+    print(f"pdf       inline {args.pdfs / inline:7.1f}/s   pool x{args.workers} {args.pdfs / passes[0]:7.1f}/s   cached {args.pdfs / passes[1]:9.1f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# migrations/env.py
+import warnings
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.core.db import Base, engine, DATABASE_URL
+
+config = context.config
+# app.core.db.init_db runs migrations in-process and keeps the app's logging
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+# SQLite can't ALTER most things in place — batch mode recreates the table
+render_as_batch = DATABASE_URL.startswith("sqlite")
+
+# Expression indexes (ix_booking_requests_artist_location) can't be reflected, so autogenerate
+# skips them — they're written by hand in their migration.
+warnings.filterwarnings("ignore", message="autogenerate skipping metadata-specified expression-based index")
+warnings.filterwarnings("ignore", message="Skipped unsupported reflection of expression-based index")
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # chat full-text search objects are raw DDL (see CHAT_FTS_* in app.models.models)
+    if reflected and compare_to is None and name and name.startswith(("chat_messages_fts", "ix_chat_messages_fts")):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=render_as_batch,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=render_as_batch,
+            include_object=include_object,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,43 @@
+"""chat unread counters on booking_requests
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('artist_unread_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('booker_unread_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the messages that are unread today
+    for column, sender_type in (('artist_unread_count', 'booker'), ('booker_unread_count', 'artist')):
+        op.execute(
+            sa.text(
+                f"UPDATE booking_requests SET {column} = ("
+                "SELECT count(*) FROM chat_messages "
+                "WHERE chat_messages.booking_request_id = booking_requests.id "
+                "AND chat_messages.sender_type = :sender_type AND chat_messages.is_read = :unread)"
+            ).bindparams(sender_type=sender_type, unread=False)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+        batch_op.drop_column('booker_unread_count')
+        batch_op.drop_column('artist_unread_count')
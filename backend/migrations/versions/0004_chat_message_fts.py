@@ -0,0 +1,61 @@
+"""full-text search over chat messages
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chat_messages_fts USING fts5("
+    "message, content='chat_messages', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ai AFTER INSERT ON chat_messages BEGIN "
+    "INSERT INTO chat_messages_fts(rowid, message) VALUES (new.id, new.message); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ad AFTER DELETE ON chat_messages BEGIN "
+    "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, message) VALUES ('delete', old.id, old.message); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_messages_fts_au AFTER UPDATE OF message ON chat_messages BEGIN "
+    "INSERT INTO chat_messages_fts(chat_messages_fts, rowid, message) VALUES ('delete', old.id, old.message); "
+    "INSERT INTO chat_messages_fts(rowid, message) VALUES (new.id, new.message); END",
+    # index the messages that already exist
+    "INSERT INTO chat_messages_fts(chat_messages_fts) VALUES ('rebuild')",
+)
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS chat_messages_fts_au",
+    "DROP TRIGGER IF EXISTS chat_messages_fts_ad",
+    "DROP TRIGGER IF EXISTS chat_messages_fts_ai",
+    "DROP TABLE IF EXISTS chat_messages_fts",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for stmt in SQLITE_UPGRADE:
+            op.execute(stmt)
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_chat_messages_fts ON chat_messages "
+            "USING gin (to_tsvector('simple', message))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for stmt in SQLITE_DOWNGRADE:
+            op.execute(stmt)
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_chat_messages_fts")
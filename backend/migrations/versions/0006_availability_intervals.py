@@ -0,0 +1,85 @@
+"""UTC intervals on booking_requests and calendar_blocks for availability checks
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from datetime import datetime, time, timedelta, timezone
+from typing import Sequence, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same arithmetic as app.core.availability at this revision, frozen here so later changes
+# to the app can't alter what this migration writes.
+def _to_utc(day, at, zone):
+    local = datetime.combine(day, at, tzinfo=ZoneInfo(zone or "UTC"))
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('starts_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('ends_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_booking_requests_artist_interval', ['artist_id', 'starts_at', 'ends_at', 'status'], unique=False)
+
+    with op.batch_alter_table('calendar_blocks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('time_zone', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('starts_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('ends_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_calendar_blocks_artist_interval', ['artist_id', 'starts_at', 'ends_at'], unique=False)
+
+    # Backfill from the local date/time + time_zone
+    bookings = sa.table(
+        'booking_requests',
+        sa.column('id', sa.Integer), sa.column('event_date', sa.Date), sa.column('event_time', sa.Time),
+        sa.column('time_zone', sa.String), sa.column('performance_duration', sa.Integer),
+        sa.column('starts_at', sa.DateTime), sa.column('ends_at', sa.DateTime),
+    )
+    blocks = sa.table(
+        'calendar_blocks',
+        sa.column('id', sa.Integer), sa.column('block_date', sa.Date), sa.column('start_time', sa.Time),
+        sa.column('end_time', sa.Time), sa.column('starts_at', sa.DateTime), sa.column('ends_at', sa.DateTime),
+    )
+    conn = op.get_bind()
+    for row in conn.execute(sa.select(bookings)).all():
+        try:
+            starts_at = _to_utc(row.event_date, row.event_time, row.time_zone)
+        except (ZoneInfoNotFoundError, ValueError):   # unknown time_zone: stays out of overlap checks
+            continue
+        ends_at = starts_at + timedelta(minutes=row.performance_duration or 0)
+        conn.execute(bookings.update().where(bookings.c.id == row.id).values(starts_at=starts_at, ends_at=ends_at))
+    for row in conn.execute(sa.select(blocks).where(blocks.c.block_date.is_not(None))).all():
+        # Existing blocks have no time_zone (UTC). No times = whole day; end <= start = past midnight.
+        start_time = row.start_time or time.min
+        end_day = row.block_date
+        if row.end_time is None or row.end_time <= start_time:
+            end_day = row.block_date + timedelta(days=1)
+        starts_at = _to_utc(row.block_date, start_time, None)
+        ends_at = _to_utc(end_day, row.end_time or time.min, None)
+        conn.execute(blocks.update().where(blocks.c.id == row.id).values(starts_at=starts_at, ends_at=ends_at))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('calendar_blocks', schema=None) as batch_op:
+        batch_op.drop_index('ix_calendar_blocks_artist_interval')
+        batch_op.drop_column('ends_at')
+        batch_op.drop_column('starts_at')
+        batch_op.drop_column('time_zone')
+
+    with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_requests_artist_interval')
+        batch_op.drop_column('ends_at')
+        batch_op.drop_column('starts_at')
@@ -0,0 +1,41 @@
+"""indexes for filtered, keyset-paginated booking listings
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_booking_requests_artist_status_date'))
+        batch_op.create_index('ix_booking_requests_artist_status_date_time', ['artist_id', 'status', 'event_date', 'event_time'], unique=False)
+
+    # expression index: autogenerate can't compare these, see ix_booking_requests_artist_location in app.models.models
+    op.create_index(
+        'ix_booking_requests_artist_location',
+        'booking_requests',
+        ['artist_id', sa.text('lower(country)'), sa.text('lower(city)'), 'event_date', 'event_time'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_booking_requests_artist_location', table_name='booking_requests')
+    with op.batch_alter_table('booking_requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_requests_artist_status_date_time')
+        batch_op.create_index(batch_op.f('ix_booking_requests_artist_status_date'), ['artist_id', 'status', 'event_date'], unique=False)
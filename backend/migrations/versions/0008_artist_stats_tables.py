@@ -0,0 +1,76 @@
+"""materialized per-artist dashboard stats
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('artist_revenue_monthly',
+    sa.Column('artist_id', sa.Integer(), nullable=False),
+    sa.Column('currency', sa.String(length=10), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['artist_id'], ['artist_profiles.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('artist_id', 'currency', 'month')
+    )
+    op.create_table('artist_stats',
+    sa.Column('artist_id', sa.Integer(), nullable=False),
+    sa.Column('total_requests', sa.Integer(), nullable=False),
+    sa.Column('pending_count', sa.Integer(), nullable=False),
+    sa.Column('accepted_count', sa.Integer(), nullable=False),
+    sa.Column('rejected_count', sa.Integer(), nullable=False),
+    sa.Column('cancelled_count', sa.Integer(), nullable=False),
+    sa.Column('active_upcoming', sa.Integer(), nullable=False),
+    sa.Column('active_as_of', sa.Date(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['artist_id'], ['artist_profiles.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('artist_id')
+    )
+
+    # backfill from existing bookings; same numbers as `python -m app.core.stats rebuild`
+    if op.get_bind().dialect.name == 'postgresql':
+        today, month = 'CURRENT_DATE', "date_trunc('month', event_date)::date"
+    else:
+        today, month = "date('now')", "date(event_date, 'start of month')"
+    op.execute(f"""
+        INSERT INTO artist_stats (artist_id, total_requests, pending_count, accepted_count, rejected_count,
+                                  cancelled_count, active_upcoming, active_as_of, updated_at)
+        SELECT b.artist_id, count(*),
+               sum(CASE WHEN b.status = 'pending' THEN 1 ELSE 0 END),
+               sum(CASE WHEN b.status = 'accepted' THEN 1 ELSE 0 END),
+               sum(CASE WHEN b.status = 'rejected' THEN 1 ELSE 0 END),
+               sum(CASE WHEN b.status = 'cancelled' THEN 1 ELSE 0 END),
+               sum(CASE WHEN b.status = 'accepted' AND b.event_date >= {today} THEN 1 ELSE 0 END),
+               {today}, CURRENT_TIMESTAMP
+        FROM booking_requests b JOIN artist_profiles a ON a.user_id = b.artist_id
+        GROUP BY b.artist_id
+    """)
+    op.execute(f"""
+        INSERT INTO artist_revenue_monthly (artist_id, currency, month, amount, bookings)
+        SELECT b.artist_id, coalesce(b.currency, 'USD'), {month}, sum(b.budget), count(*)
+        FROM booking_requests b JOIN artist_profiles a ON a.user_id = b.artist_id
+        WHERE b.status = 'accepted' AND b.event_date IS NOT NULL
+        GROUP BY b.artist_id, coalesce(b.currency, 'USD'), {month}
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('artist_stats')
+    op.drop_table('artist_revenue_monthly')
@@ -0,0 +1,69 @@
+"""earnings ledger (earnings.booking_id), daily revenue rollup, completed bookings count
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('artist_revenue_daily',
+    sa.Column('artist_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('currency', sa.String(length=10), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['artist_id'], ['artist_profiles.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('artist_id', 'day', 'currency')
+    )
+    with op.batch_alter_table('artist_stats', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('completed_count', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('earnings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('booking_id', sa.Integer(), nullable=True))
+        batch_op.create_index('ux_earnings_booking_id', ['booking_id'], unique=True)
+        batch_op.create_foreign_key('fk_earnings_booking_id', 'booking_requests', ['booking_id'], ['id'], ondelete='CASCADE')
+
+    # backfill: no booking was 'completed' before this revision, so artist_stats and
+    # artist_revenue_monthly are already right; the ledger and the daily rollup start from
+    # the accepted bookings (same rows as `python -m app.core.stats rebuild`)
+    op.execute("""
+        INSERT INTO earnings (artist_id, booking_id, amount, currency, date)
+        SELECT b.artist_id, b.id, b.budget, coalesce(b.currency, 'USD'), b.event_date
+        FROM booking_requests b JOIN artist_profiles a ON a.user_id = b.artist_id
+        WHERE b.status = 'accepted' AND b.event_date IS NOT NULL
+    """)
+    op.execute("""
+        INSERT INTO artist_revenue_daily (artist_id, day, currency, amount, bookings)
+        SELECT b.artist_id, b.event_date, coalesce(b.currency, 'USD'), sum(b.budget), count(*)
+        FROM booking_requests b JOIN artist_profiles a ON a.user_id = b.artist_id
+        WHERE b.status = 'accepted' AND b.event_date IS NOT NULL
+        GROUP BY b.artist_id, b.event_date, coalesce(b.currency, 'USD')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM earnings WHERE booking_id IS NOT NULL")
+    with op.batch_alter_table('earnings', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_earnings_booking_id', type_='foreignkey')
+        batch_op.drop_index('ux_earnings_booking_id')
+        batch_op.drop_column('booking_id')
+
+    with op.batch_alter_table('artist_stats', schema=None) as batch_op:
+        batch_op.drop_column('completed_count')
+
+    op.drop_table('artist_revenue_daily')
@@ -0,0 +1,43 @@
+"""UTC intervals for bookings saved with an empty time_zone
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Validation treated "" as UTC but the interval listener skipped it, leaving these rows
+    # out of overlap checks. UTC needs no zone arithmetic.
+    bookings = sa.table(
+        'booking_requests',
+        sa.column('id', sa.Integer), sa.column('event_date', sa.Date), sa.column('event_time', sa.Time),
+        sa.column('time_zone', sa.String), sa.column('performance_duration', sa.Integer),
+        sa.column('starts_at', sa.DateTime), sa.column('ends_at', sa.DateTime),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(bookings).where(bookings.c.time_zone == '', bookings.c.starts_at.is_(None))).all()
+    for row in rows:
+        starts_at = datetime.combine(row.event_date, row.event_time)
+        ends_at = starts_at + timedelta(minutes=row.performance_duration or 0)
+        conn.execute(bookings.update().where(bookings.c.id == row.id).values(starts_at=starts_at, ends_at=ends_at))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The intervals are correct for these rows; nothing to undo.
+    pass
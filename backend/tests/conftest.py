@@ -0,0 +1,63 @@
+import asyncio
+import os
+import tempfile
+from datetime import date, time
+
+# app.core.db reads DATABASE_URL at import time
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+import pytest  # noqa: E402
+
+from app.core import db  # noqa: E402
+from app.models.models import ArtistProfile, BookingRequest, User  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    db.init_db()
+
+
+@pytest.fixture
+def run_async():
+    """run_async(fn, *args): `await fn(session, *args)` with an AsyncSession, on a fresh event loop."""
+    def run(fn, *args):
+        async def main():
+            try:
+                async with db.AsyncSessionLocal() as s:
+                    return await fn(s, *args)
+            finally:
+                await db.async_engine.dispose()   # its pooled connections belong to this loop
+        return asyncio.run(main())
+    return run
+
+
+@pytest.fixture
+def artist_id():
+    s = db.SessionLocal()
+    user = User(email=f"artist{os.urandom(4).hex()}@example.com", name="Artist")
+    s.add(user)
+    s.flush()
+    s.add(ArtistProfile(user_id=user.id, stage_name="Artist"))
+    s.commit()
+    s.close()
+    return user.id
+
+
+@pytest.fixture
+def make_booking(artist_id):
+    """make_booking(**columns) -> a committed booking of `artist_id` (pending, 1000 USD unless overridden)."""
+    def make(**columns):
+        s = db.SessionLocal()
+        booking = BookingRequest(**{
+            "artist_id": artist_id, "event_date": date(2026, 11, 20), "event_time": time(20, 0),
+            "time_zone": "UTC", "budget": 1000, "currency": "USD", "venue_name": "Venue", "city": "City",
+            "country": "Country", "performance_duration": 60, "participant_count": 100,
+            "client_first_name": "First", "client_last_name": "Last", "client_email": "client@example.com",
+            "status": "pending", **columns,
+        })
+        s.add(booking)
+        s.commit()
+        s.expunge(booking)
+        s.close()
+        return booking
+    return make
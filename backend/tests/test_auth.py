@@ -0,0 +1,73 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete
+
+from app.api import auth
+from app.core import db
+from app.models.models import User, UserSession
+
+
+@pytest.fixture
+def replica():
+    """(async engine, sync engine) of a second database, standing in for a lagging replica."""
+    engine, async_engine = db._make_engines(f"sqlite:///{tempfile.mkdtemp()}/replica.db")
+    db.Base.metadata.create_all(engine)
+    yield async_engine, engine
+    engine.dispose()
+
+
+@pytest.fixture
+def logged_in(monkeypatch):
+    """(token, user row, session row) of a session that exists on the primary."""
+    monkeypatch.setattr(auth, "SECRET_KEY", "test-secret")
+    s = db.SessionLocal()
+    user = User(email=f"user{os.urandom(4).hex()}@example.com", name="User", role="artist")
+    s.add(user)
+    s.flush()
+    token = auth.create_access_token({"sub": str(user.id)})
+    session = UserSession(user_id=user.id, token=token, expires_at=datetime.utcnow() + timedelta(hours=1))
+    s.add(session)
+    s.commit()
+    s.close()
+    auth.session_cache.clear()
+    yield token, user, session
+    auth.session_cache.clear()
+
+
+def copy_to(engine, *rows):
+    with engine.begin() as conn:
+        for row in rows:
+            table = row.__table__
+            conn.execute(table.insert().values({c.name: getattr(row, c.name) for c in table.columns}))
+
+
+def logout_on_primary(token):
+    with db.engine.begin() as conn:
+        conn.execute(delete(UserSession).where(UserSession.token == token))
+
+
+@pytest.mark.parametrize("cached", [True, False])
+def test_logged_out_token_is_rejected_while_the_replica_lags(run_async, replica, logged_in, cached):
+    replica_async_engine, replica_engine = replica
+    token, user, session = logged_in
+    copy_to(replica_engine, user, session)   # replicated before the logout
+
+    async def authenticate(s):
+        try:
+            async with db.AsyncReadOnlySessionLocal(bind=replica_async_engine) as lagging:
+                return await auth.authenticate_token(token, lagging)
+        finally:
+            await replica_async_engine.dispose()   # pooled connections belong to this event loop
+
+    assert run_async(authenticate).id == user.id
+    if not cached:
+        auth.session_cache.clear()
+    logout_on_primary(token)   # not replicated yet
+
+    with pytest.raises(HTTPException) as exc:
+        run_async(authenticate)
+    assert exc.value.status_code == 401
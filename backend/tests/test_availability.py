@@ -0,0 +1,45 @@
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.core import db
+from app.core.availability import OVERLAP_LOOKBACK, block_interval, booking_interval, find_conflicts
+from app.models.models import BookingRequest, CalendarBlock
+
+FALL_BACK = date(2026, 10, 25)   # Europe/London: 02:00 BST -> 01:00 GMT
+
+
+def test_all_day_block_lasts_25_hours_on_fall_back_day():
+    start, end = block_interval(FALL_BACK, None, None, "Europe/London")
+    assert end - start == timedelta(hours=25)
+    assert end - start <= OVERLAP_LOOKBACK
+
+
+@pytest.mark.parametrize("start_time, end_time", [
+    (None, None),                    # whole day
+    (time(0, 15), time(0, 0)),       # runs past midnight: 24h45m
+])
+def test_block_on_fall_back_day_conflicts_with_late_booking(artist_id, run_async, start_time, end_time):
+    s = db.SessionLocal()
+    s.add(CalendarBlock(
+        artist_id=artist_id, block_date=FALL_BACK, start_time=start_time, end_time=end_time,
+        time_zone="Europe/London", reason="holiday",
+    ))
+    s.commit()
+    s.close()
+
+    start, end = booking_interval(FALL_BACK, time(23, 30), "Europe/London", 60)
+    found = run_async(find_conflicts, artist_id, start, end)
+    assert [c.kind for c in found] == ["block"]
+
+
+def test_booking_with_empty_time_zone_is_checked_as_utc(make_booking, run_async):
+    booking = make_booking(event_date=FALL_BACK, event_time=time(21, 0), time_zone="")
+    assert (booking.starts_at, booking.ends_at) == booking_interval(FALL_BACK, time(21, 0), "UTC", 60)
+
+    start, end = booking_interval(FALL_BACK, time(21, 30), "UTC", 60)
+    s = db.SessionLocal()
+    s.execute(BookingRequest.__table__.update().where(BookingRequest.id == booking.id).values(status="accepted"))
+    s.commit()
+    s.close()
+    assert [c.id for c in run_async(find_conflicts, booking.artist_id, start, end)] == [booking.id]
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from app.core.broker import InMemoryBroker, RedisBroker
+from app.core.chat_hub import ChatHub, chat_channel
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def redis_hubs(n):
+    """n ChatHubs on RedisBrokers sharing one (fake) Redis server, like n app workers."""
+    server = fakeredis.FakeServer()
+    return [ChatHub(RedisBroker(fakeredis.FakeAsyncRedis(server=server))) for _ in range(n)]
+
+
+async def receive(sub, timeout=2.0):
+    return await asyncio.wait_for(sub.get(), timeout)
+
+
+async def until(condition, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+def test_events_fan_out_to_subscribers_of_every_hub():
+    async def run():
+        a, b = redis_hubs(2)
+        subs = [await hub.broker.subscribe(chat_channel(7)) for hub in (a, b, b)]
+        other = await b.broker.subscribe(chat_channel(8))
+        await a.publish(7, {"type": "message", "id": 1})
+        assert [await receive(s) for s in subs] == [{"type": "message", "id": 1}] * 3
+        assert other._queue.empty()
+        await a.close()
+        await b.close()
+    asyncio.run(run())
+
+
+def test_reader_stops_with_the_last_subscriber_and_restarts_on_the_next():
+    async def run():
+        a, b = redis_hubs(2)
+        sub = await b.broker.subscribe(chat_channel(7))
+        reader = b.broker._reader
+        assert reader is not None and not reader.done()
+
+        await sub.close()
+        assert b.broker._reader is None
+        await until(reader.done)
+        assert not b.broker._subs
+
+        sub = await b.broker.subscribe(chat_channel(7))
+        assert b.broker._reader is not reader
+        await a.publish(7, {"type": "read", "reader": "artist"})
+        assert await receive(sub) == {"type": "read", "reader": "artist"}
+
+        reader = b.broker._reader
+        await b.close()
+        await until(reader.done)
+        await a.close()
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("transport", ["memory", "redis"])
+def test_full_queue_flags_the_subscription_and_drops_its_backlog(transport):
+    async def run():
+        if transport == "memory":
+            hub = publisher = ChatHub(InMemoryBroker(queue_size=2))
+        else:
+            publisher, hub = redis_hubs(2)
+            hub.broker.queue_size = 2
+        slow = await hub.broker.subscribe(chat_channel(7))
+        for i in range(3):
+            await publisher.publish(7, {"id": i})
+        await until(lambda: slow.overflowed)
+
+        assert await receive(slow) is None          # the consumer is told to resync
+        await publisher.publish(7, {"id": 3})
+        await asyncio.sleep(0.05)
+        assert slow._queue.empty()                  # and gets nothing more on this subscription
+
+        fresh = await hub.broker.subscribe(chat_channel(7))
+        await publisher.publish(7, {"id": 4})
+        assert await receive(fresh) == {"id": 4}
+        await hub.close()
+        if publisher is not hub:
+            await publisher.close()
+    asyncio.run(run())
+
+
+def test_reader_survives_a_failed_read():
+    async def run():
+        a, b = redis_hubs(2)
+        sub = await b.broker.subscribe(chat_channel(7))
+        pubsub = b.broker._pubsub
+        get_message, failures = pubsub.get_message, []
+
+        async def flaky_get_message(**kwargs):
+            if not failures:
+                failures.append(1)
+                raise ConnectionError("connection reset")
+            return await get_message(**kwargs)
+
+        pubsub.get_message = flaky_get_message
+        await until(lambda: failures)
+        await a.publish(7, {"id": 1})
+        assert await receive(sub, timeout=5.0) == {"id": 1}   # after the reader's 1s back-off
+        assert not b.broker._reader.done()
+        await a.close()
+        await b.close()
+    asyncio.run(run())
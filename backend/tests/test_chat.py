@@ -0,0 +1,38 @@
+from sqlalchemy import select
+
+from app.api.chat import mark_messages_read
+from app.core import db
+from app.models.models import BookingRequest, ChatMessage
+
+
+def add_message(booking_id, sender_type):
+    s = db.SessionLocal()
+    s.add(ChatMessage(booking_request_id=booking_id, sender_type=sender_type, message="hi", is_read=False))
+    s.execute(
+        BookingRequest.__table__.update().where(BookingRequest.id == booking_id)
+        .values(artist_unread_count=BookingRequest.artist_unread_count + (sender_type == "booker"))
+    )
+    s.commit()
+    s.close()
+
+
+def read_as_artist(run_async, booking_id):
+    async def run(s):
+        booking = await s.get(BookingRequest, booking_id)
+        marked = await mark_messages_read(s, booking, "artist")
+        counter = await s.scalar(select(BookingRequest.artist_unread_count).where(BookingRequest.id == booking_id))
+        return marked, counter
+    return run_async(run)
+
+
+def test_reading_subtracts_what_was_marked(make_booking, run_async):
+    booking = make_booking()
+    add_message(booking.id, "booker")
+    add_message(booking.id, "booker")
+    assert read_as_artist(run_async, booking.id) == (2, 0)
+
+
+def test_counter_is_kept_when_nothing_was_marked(make_booking, run_async):
+    # a bump whose message wasn't visible to the marking UPDATE: it must stay counted
+    booking = make_booking(artist_unread_count=1)
+    assert read_as_artist(run_async, booking.id) == (0, 1)
@@ -0,0 +1,42 @@
+from datetime import date
+from decimal import Decimal
+
+from app.api.fx import is_admin
+from app.core import db
+from app.core.fx import get_rates, load_rates_in_session, parse_rates, rate_cache
+from app.models.models import User
+from app.settings import settings
+
+DAY = date(2026, 9, 1)
+
+
+def test_rate_cache_cleared_only_after_the_load_commits(run_async):
+    rate_cache.clear()
+    assert run_async(get_rates, [("GBP", DAY)]) == {("GBP", DAY): None}   # cached as "no rates"
+
+    s = db.SessionLocal()
+    load_rates_in_session(s, parse_rates([{"date": "2026-09-01", "currency": "GBP", "rate": "1.25"}]))
+    assert rate_cache.get(("GBP", DAY), "missing") is None   # not committed: readers still see no rows
+    s.commit()
+    s.close()
+
+    assert rate_cache.get(("GBP", DAY), "missing") == "missing"
+    assert run_async(get_rates, [("GBP", DAY)]) == {("GBP", DAY): Decimal("1.25")}
+
+
+def test_rolled_back_load_keeps_the_cache(run_async):
+    rate_cache.clear()
+    run_async(get_rates, [("CHF", DAY)])
+    s = db.SessionLocal()
+    load_rates_in_session(s, parse_rates([{"date": "2026-09-01", "currency": "CHF", "rate": "1.1"}]))
+    s.rollback()
+    s.close()
+    assert rate_cache.get(("CHF", DAY), "missing") is None
+    assert run_async(get_rates, [("CHF", DAY)]) == {("CHF", DAY): None}
+
+
+def test_admin_emails_open_the_rates_upload(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", "ops@example.com, Finance@Example.com")
+    assert is_admin(User(email="finance@example.com", role="artist"))
+    assert is_admin(User(email="someone@example.com", role="admin"))
+    assert not is_admin(User(email="artist@example.com", role="artist"))
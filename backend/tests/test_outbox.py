@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from app.core import db
+from app.api.mail import GmailError
+from app.core.outbox import FakeGmailTransport, GmailTransport, OutboxDrainer
+from app.models.models import OutboxMessage
+
+
+@pytest.fixture(autouse=True)
+def empty_outbox():
+    with db.engine.begin() as conn:
+        conn.execute(delete(OutboxMessage))
+
+
+def enqueue(n=1):
+    s = db.SessionLocal()
+    rows = [OutboxMessage(kind="booking_confirmation", payload={"n": i}) for i in range(n)]
+    s.add_all(rows)
+    s.commit()
+    ids = [r.id for r in rows]
+    s.close()
+    return ids
+
+
+def rows():
+    s = db.SessionLocal()
+    result = s.scalars(select(OutboxMessage).order_by(OutboxMessage.id)).all()
+    s.close()
+    return result
+
+
+def set_columns(**values):
+    with db.engine.begin() as conn:
+        conn.execute(update(OutboxMessage).values(**values))
+
+
+def drainer(transport=None, **kwargs):
+    return OutboxDrainer(transport or FakeGmailTransport(), **{"lease_seconds": 60, "retry_base": 10, **kwargs})
+
+
+def test_row_with_an_expired_lease_is_claimed_again(run_async):
+    [row_id] = enqueue()
+    dead, alive = drainer(), drainer()
+    assert [m.id for m in run_async(dead.claim)] == [row_id]   # claimed, then its drainer dies mid-send
+    assert run_async(lambda s: alive.drain_once()) == 0        # lease still held
+
+    set_columns(locked_until=datetime.utcnow() - timedelta(seconds=1))
+    assert run_async(lambda s: alive.drain_once()) == 1
+    [row] = rows()
+    assert (row.status, row.attempts, row.locked_by, row.locked_until) == ("sent", 1, None, None)
+    assert row.provider_message_id == alive.transport.sent[0]["id"]
+
+
+def test_transport_error_counts_the_attempt_and_backs_off(run_async):
+    enqueue()
+    flaky = drainer(FakeGmailTransport(fail_rate=1.0), max_attempts=3)
+
+    for attempts, max_delay in ((1, 10), (2, 20)):
+        before = datetime.utcnow()
+        assert run_async(lambda s: flaky.drain_once()) == 1
+        [row] = rows()
+        assert (row.status, row.attempts, row.locked_by) == ("pending", attempts, None)
+        assert "simulated failure" in row.last_error
+        # backoff: retry_base * 2^(attempts-1), jittered down to half of that
+        assert before + timedelta(seconds=max_delay / 2) <= row.available_at <= datetime.utcnow() + timedelta(seconds=max_delay)
+        assert run_async(lambda s: flaky.drain_once()) == 0     # not due yet
+        set_columns(available_at=datetime.utcnow() - timedelta(seconds=1))
+
+    assert run_async(lambda s: flaky.drain_once()) == 1
+    [row] = rows()
+    assert (row.status, row.attempts) == ("failed", 3)         # max_attempts reached
+    assert run_async(lambda s: flaky.drain_once()) == 0
+
+
+def test_concurrent_drainers_never_claim_the_same_row(run_async):
+    ids = enqueue(40)
+    transport = FakeGmailTransport()
+    drainers = [drainer(transport, batch_size=7) for _ in range(3)]
+
+    async def claim(d):
+        async with db.AsyncSessionLocal() as session:
+            return [m.id for m in await d.claim(session)]
+
+    async def claim_all(s):
+        return await asyncio.gather(*(claim(d) for d in drainers))
+
+    claimed = run_async(claim_all)
+    flat = [i for batch in claimed for i in batch]
+    assert len(flat) == len(set(flat)) == 21
+
+    set_columns(locked_by=None, locked_until=None)
+
+    async def drain_all(s):
+        while sum(await asyncio.gather(*(d.drain_once() for d in drainers))):
+            pass
+
+    run_async(drain_all)
+    assert sorted(m["payload"]["n"] for m in transport.sent) == list(range(40))   # each row sent exactly once
+    assert {r.status for r in rows()} == {"sent"} and [r.id for r in rows()] == ids
+
+
+def test_claimed_rows_go_out_as_one_batch(run_async):
+    enqueue(5)
+    d = drainer(batch_size=20)
+    assert run_async(lambda s: d.drain_once()) == 5
+    assert d.transport.requests == 1
+    assert {r.status for r in rows()} == {"sent"}
+
+
+class StubGmailClient:
+    sender = "me@example.com"
+
+    def __init__(self, results):
+        self.results = results
+        self.batches = []
+
+    def send_batch(self, messages):
+        self.batches.append(messages)
+        if isinstance(self.results, Exception):
+            raise self.results
+        return self.results
+
+
+def test_per_message_gmail_errors_map_to_their_rows(run_async):
+    first, second, third = enqueue(3)
+    client = StubGmailClient(["gmail-1", GmailError(400, "Invalid To header")])
+    transport = GmailTransport(client_factory=lambda: client)
+    transport.builders["booking_confirmation"] = lambda n, sender: f"message {n} from {sender}"
+    transport.builders["broken"] = lambda n, sender: 1 / 0
+    with db.engine.begin() as conn:
+        conn.execute(update(OutboxMessage).where(OutboxMessage.id == third).values(kind="broken"))
+
+    assert run_async(lambda s: drainer(transport).drain_once()) == 3
+    assert client.batches == [["message 0 from me@example.com", "message 1 from me@example.com"]]   # unbuildable row not sent
+    sent, rejected, broken = rows()
+    assert (sent.status, sent.provider_message_id, sent.attempts) == ("sent", "gmail-1", 1)
+    assert (rejected.status, rejected.provider_message_id, rejected.attempts) == ("pending", None, 1)
+    assert "Invalid To header" in rejected.last_error and rejected.available_at > datetime.utcnow()
+    assert (broken.status, broken.attempts) == ("pending", 1) and "ZeroDivisionError" in broken.last_error
+
+
+def test_failed_batch_request_retries_every_message(run_async):
+    enqueue(2)
+    client = StubGmailClient(GmailError(503, "backend error"))   # raised for the whole request
+    transport = GmailTransport(client_factory=lambda: client)
+    transport.builders["booking_confirmation"] = lambda n, sender: n
+
+    assert run_async(lambda s: drainer(transport).drain_once()) == 2
+    assert [(r.status, r.attempts) for r in rows()] == [("pending", 1), ("pending", 1)]
+    assert all("backend error" in r.last_error for r in rows())
@@ -0,0 +1,63 @@
+"""EXPLAIN QUERY PLAN for the hot booking/session queries: each must search an index, never scan."""
+from datetime import date, datetime, time
+
+import pytest
+from sqlalchemy import func, select, tuple_
+
+from app.core import db
+from app.core.availability import overlap_queries
+from app.models.models import BookingRequest, UserSession
+
+HOT_QUERIES = {
+    "session lookup (get_current_user/logout)":
+        select(UserSession).where(UserSession.token == "t"),
+    "artist listing / dashboard":
+        select(BookingRequest).where(BookingRequest.artist_id == 1).order_by(BookingRequest.event_date.desc()),
+    "listing by status":
+        select(BookingRequest).where(BookingRequest.artist_id == 1, BookingRequest.status == "pending")
+        .order_by(BookingRequest.event_date.desc()),
+    "listing page, keyset cursor (get_artist_bookings)":
+        select(BookingRequest.id).where(
+            BookingRequest.artist_id == 1,
+            tuple_(BookingRequest.event_date, BookingRequest.event_time, BookingRequest.id)
+            < tuple_(date(2030, 1, 1), time(20, 0), 500),
+        ).order_by(BookingRequest.event_date.desc(), BookingRequest.event_time.desc(), BookingRequest.id.desc()),
+    "listing page, status + date range":
+        select(BookingRequest.id).where(
+            BookingRequest.artist_id == 1, BookingRequest.status == "pending",
+            BookingRequest.event_date >= date(2030, 1, 1), BookingRequest.event_date <= date(2030, 3, 1),
+        ).order_by(BookingRequest.event_date.desc(), BookingRequest.event_time.desc(), BookingRequest.id.desc()),
+    "listing page, country + city":
+        select(BookingRequest.id).where(
+            BookingRequest.artist_id == 1,
+            func.lower(BookingRequest.country) == "israel", func.lower(BookingRequest.city) == "tel aviv",
+        ).order_by(BookingRequest.event_date.desc(), BookingRequest.event_time.desc(), BookingRequest.id.desc()),
+    **{
+        f"availability overlap, {name} (validate_booking_data)": stmt
+        for name, stmt in zip(
+            ("blocks", "bookings"), overlap_queries(1, datetime(2030, 1, 1, 20), datetime(2030, 1, 1, 22))
+        )
+    },
+}
+
+
+def explain(conn, stmt) -> list:
+    sql = str(stmt.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+
+
+def uses_index(plan: list) -> bool:
+    # "SEARCH t USING INDEX ..." is good; a bare "SCAN t" (or a temp B-tree for ORDER BY) is not
+    return all(
+        "USING INDEX" in step or "USING COVERING INDEX" in step or "USING INTEGER PRIMARY KEY" in step
+        for step in plan
+        if step.startswith(("SCAN", "SEARCH", "USE TEMP B-TREE"))
+    )
+
+
+@pytest.mark.skipif(db.engine.dialect.name != "sqlite", reason="plans are read from SQLite's EXPLAIN QUERY PLAN")
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_an_index(name):
+    with db.engine.connect() as conn:
+        plan = explain(conn, HOT_QUERIES[name])
+    assert uses_index(plan), " | ".join(plan)
@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+from app.core import db
+from app.core.stats import check, rebuild
+from app.models.models import BookingRequest
+
+PAST, FUTURE = date(2020, 3, 14), date(2030, 6, 30)
+
+
+def change(booking_id, **columns):
+    """Update a booking through the ORM, so the after_flush hook sees it."""
+    s = db.SessionLocal()
+    booking = s.get(BookingRequest, booking_id)
+    for name, value in columns.items():
+        setattr(booking, name, value)
+    s.commit()
+    s.close()
+
+
+def problems(artist_id):
+    with db.engine.connect() as conn:
+        return check(conn, artist_id)
+
+
+def test_status_transitions_keep_stats_equal_to_a_rebuild(artist_id, make_booking):
+    booking = make_booking(event_date=FUTURE)
+    make_booking(event_date=PAST, status="accepted")   # a neighbour in another month that stays put
+    assert problems(artist_id) == []
+    for status in ("accepted", "completed", "cancelled", "accepted", "rejected"):
+        change(booking.id, status=status)
+        assert problems(artist_id) == [], status
+
+
+@pytest.mark.parametrize("columns", [
+    {"budget": 2500},
+    {"currency": None},                        # counted as DEFAULT_CURRENCY
+    {"event_date": date(2030, 7, 1)},          # next month
+    {"event_date": PAST},                      # no longer upcoming
+    {"currency": "EUR"},
+    {"event_date": date(2030, 6, 1), "budget": 10, "currency": "ILS"},
+])
+def test_changing_an_accepted_booking_keeps_stats_equal_to_a_rebuild(artist_id, make_booking, columns):
+    booking = make_booking(event_date=FUTURE, status="accepted")
+    make_booking(event_date=FUTURE, status="accepted", budget=300)   # shares the day / month buckets
+    change(booking.id, **columns)
+    assert problems(artist_id) == []
+
+
+def test_deleting_a_booking_keeps_stats_equal_to_a_rebuild(artist_id, make_booking):
+    booking = make_booking(event_date=FUTURE, status="completed")
+    s = db.SessionLocal()
+    s.delete(s.get(BookingRequest, booking.id))
+    s.commit()
+    s.close()
+    assert problems(artist_id) == []
+
+
+def test_check_reports_writes_that_bypass_the_orm_until_rebuilt(artist_id, make_booking):
+    booking = make_booking(event_date=FUTURE, status="accepted")
+    with db.engine.begin() as conn:
+        conn.execute(BookingRequest.__table__.update().where(BookingRequest.id == booking.id).values(budget=1))
+    assert problems(artist_id) != []
+
+    with db.engine.begin() as conn:
+        assert rebuild(conn, artist_id) == 1
+    assert problems(artist_id) == []
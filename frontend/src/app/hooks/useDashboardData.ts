@@ -49,11 +49,9 @@ export function useDashboardData(): UseDashboardDataReturn {
     dashboardStats,
     earningsStats,
     statsLoading,
-    setDashboardStats,
-    setEarningsStats,
     setStatsLoading,
     fetchDashboardStats,
-    calculateStatsFromBookings,
+    applyServerStats,
   } = useDashboardStats();
 
   // Fetch all dashboard data from single endpoint (like the original code)
@@ -87,20 +85,7 @@ export function useDashboardData(): UseDashboardDataReturn {
         
         // Update stats
         if (dashboardData.stats) {
-          setDashboardStats({
-            totalRequests: dashboardData.stats.total_requests,
-            activeBookings: dashboardData.stats.active_bookings,
-            pending: dashboardData.stats.pending,
-            approved: dashboardData.stats.accepted,
-            totalEarnings: `$${dashboardData.stats.total_earnings.toLocaleString()}`
-          });
-          
-          setEarningsStats({
-            totalRevenue: `$${dashboardData.stats.total_earnings.toLocaleString()}`,
-            thisMonth: `$${dashboardData.stats.this_month_earnings.toLocaleString()}`,
-            avgFee: `$${dashboardData.stats.avg_booking_fee.toLocaleString()}`,
-            totalBookings: dashboardData.stats.total_bookings
-          });
+          applyServerStats(dashboardData.stats);
         }
         
       } else {
@@ -112,17 +97,18 @@ export function useDashboardData(): UseDashboardDataReturn {
       setBookingsLoading(false);
       setStatsLoading(false);
     }
-  }, []);
+  }, [applyServerStats]);
 
   // Refresh all data
   const refreshAllData = useCallback(async () => {
     await fetchAllDashboardData();
   }, [fetchAllDashboardData]);
 
-  // Refresh only bookings and recalculate stats
+  // Refresh only bookings, then the server stats they feed
   const refreshBookings = useCallback(async () => {
     await fetchBookings();
-  }, [fetchBookings]);
+    await fetchDashboardStats();
+  }, [fetchBookings, fetchDashboardStats]);
 
   // Refresh only profile
   const refreshProfile = useCallback(async () => {
@@ -134,29 +120,23 @@ export function useDashboardData(): UseDashboardDataReturn {
     refreshAllData();
   }, [refreshAllData]);
 
-  // Recalculate stats when bookings change
-  useEffect(() => {
-    if (bookings.length > 0) {
-      calculateStatsFromBookings(bookings);
-    }
-  }, [bookings, calculateStatsFromBookings]);
-
   // Enhanced booking update functions that refresh stats
   const enhancedUpdateBookingDetails = useCallback(async (bookingId: number, newDetails: any): Promise<boolean> => {
     const success = await updateBookingDetails(bookingId, newDetails);
     if (success) {
-      // Stats will be recalculated automatically via useEffect
+      // Budget, currency or date may have changed the totals
+      await fetchDashboardStats();
     }
     return success;
-  }, [updateBookingDetails]);
+  }, [updateBookingDetails, fetchDashboardStats]);
 
   const enhancedUpdateBookingStatus = useCallback(async (bookingId: number, newStatus: string): Promise<boolean> => {
     const success = await updateBookingStatus(bookingId, newStatus);
     if (success) {
-      // Stats will be recalculated automatically via useEffect
+      await fetchDashboardStats();
     }
     return success;
-  }, [updateBookingStatus]);
+  }, [updateBookingStatus, fetchDashboardStats]);
 
   return {
     // Artist Profile
@@ -1,5 +1,4 @@
 import { useState, useCallback, useMemo } from "react";
-import { BookingRequest } from "@/app/types/booking";
 import { DashboardStats } from "@/app/types/dashboard";
 import { EarningsStats } from "@/app/types/earnings";
 
@@ -11,7 +10,21 @@ export interface UseDashboardStatsReturn {
   setEarningsStats: (stats: EarningsStats) => void;
   setStatsLoading: (loading: boolean) => void;
   fetchDashboardStats: () => Promise<void>;
-  calculateStatsFromBookings: (bookings: BookingRequest[]) => void;
+  applyServerStats: (stats: any) => void;
+}
+
+// Amounts from /api/artist/dashboard are already converted into stats.currency
+export function formatMoney(amount: number, currency: string): string {
+  try {
+    return new Intl.NumberFormat(undefined, {
+      style: "currency",
+      currency,
+      minimumFractionDigits: 0,
+      maximumFractionDigits: 0,
+    }).format(amount);
+  } catch {
+    return `${amount.toLocaleString()} ${currency}`;
+  }
 }
 
 export function useDashboardStats(): UseDashboardStatsReturn {
@@ -20,18 +33,45 @@ export function useDashboardStats(): UseDashboardStatsReturn {
     activeBookings: 0,
     pending: 0,
     approved: 0,
-    totalEarnings: "$0"
+    totalEarnings: formatMoney(0, "USD"),
+    unconvertedEarnings: []
   });
 
   const [earningsStats, setEarningsStats] = useState<EarningsStats>({
-    totalRevenue: "$0",
-    thisMonth: "$0",
-    avgFee: "$0",
-    totalBookings: 0
+    totalRevenue: formatMoney(0, "USD"),
+    thisMonth: formatMoney(0, "USD"),
+    avgFee: formatMoney(0, "USD"),
+    totalBookings: 0,
+    unconvertedEarnings: []
   });
 
   const [statsLoading, setStatsLoading] = useState(false);
 
+  // The server aggregates over every booking; the client only ever sees the latest ones
+  const applyServerStats = useCallback((stats: any) => {
+    const currency = stats.currency || "USD";
+    // No FX rate loaded for these currencies: shown next to the totals, never silently dropped
+    const unconverted = Object.entries(stats.unconverted_earnings || {}).map(
+      ([code, amount]) => formatMoney(amount as number, code)
+    );
+    setDashboardStats({
+      totalRequests: stats.total_requests,
+      activeBookings: stats.active_bookings,
+      pending: stats.pending,
+      approved: stats.accepted,
+      totalEarnings: formatMoney(stats.total_earnings, currency),
+      unconvertedEarnings: unconverted
+    });
+
+    setEarningsStats({
+      totalRevenue: formatMoney(stats.total_earnings, currency),
+      thisMonth: formatMoney(stats.this_month_earnings, currency),
+      avgFee: formatMoney(stats.avg_booking_fee, currency),
+      totalBookings: stats.total_bookings,
+      unconvertedEarnings: unconverted
+    });
+  }, []);
+
   const fetchDashboardStats = useCallback(async () => {
     try {
       setStatsLoading(true);
@@ -41,22 +81,7 @@ export function useDashboardStats(): UseDashboardStatsReturn {
       
       if (response.ok) {
         const dashboardData = await response.json();
-        
-        setDashboardStats({
-          totalRequests: dashboardData.stats.total_requests,
-          activeBookings: dashboardData.stats.active_bookings,
-          pending: dashboardData.stats.pending,
-          approved: dashboardData.stats.accepted,
-          totalEarnings: `$${dashboardData.stats.total_earnings.toLocaleString()}`
-        });
-        
-        setEarningsStats({
-          totalRevenue: `$${dashboardData.stats.total_earnings.toLocaleString()}`,
-          thisMonth: `$${dashboardData.stats.this_month_earnings.toLocaleString()}`,
-          avgFee: `$${dashboardData.stats.avg_booking_fee.toLocaleString()}`,
-          totalBookings: dashboardData.stats.total_bookings
-        });
-        
+        applyServerStats(dashboardData.stats);
       } else {
         console.error('Failed to fetch dashboard stats:', response.status);
       }
@@ -65,48 +90,7 @@ export function useDashboardStats(): UseDashboardStatsReturn {
     } finally {
       setStatsLoading(false);
     }
-  }, []);
-
-  const calculateStatsFromBookings = useCallback((bookings: BookingRequest[]) => {
-    const totalRequests = bookings.length;
-    const pending = bookings.filter(b => b.status === 'pending').length;
-    const approved = bookings.filter(b => b.status === 'accepted').length;
-    const activeBookings = bookings.filter(b => 
-      b.status === 'accepted' && new Date(b.event_date) > new Date()
-    ).length;
-
-    // Calculate earnings from accepted bookings
-    const acceptedBookings = bookings.filter(b => b.status === 'accepted');
-    const totalEarnings = acceptedBookings.reduce((sum, b) => sum + b.budget, 0);
-    
-    // Calculate this month's earnings
-    const currentMonth = new Date().getMonth();
-    const currentYear = new Date().getFullYear();
-    const thisMonthEarnings = acceptedBookings
-      .filter(b => {
-        const eventDate = new Date(b.event_date);
-        return eventDate.getMonth() === currentMonth && eventDate.getFullYear() === currentYear;
-      })
-      .reduce((sum, b) => sum + b.budget, 0);
-
-    // Calculate average fee
-    const avgFee = acceptedBookings.length > 0 ? totalEarnings / acceptedBookings.length : 0;
-
-    setDashboardStats({
-      totalRequests,
-      activeBookings,
-      pending,
-      approved,
-      totalEarnings: `$${totalEarnings.toLocaleString()}`
-    });
-
-    setEarningsStats({
-      totalRevenue: `$${totalEarnings.toLocaleString()}`,
-      thisMonth: `$${thisMonthEarnings.toLocaleString()}`,
-      avgFee: `$${Math.round(avgFee).toLocaleString()}`,
-      totalBookings: acceptedBookings.length
-    });
-  }, []);
+  }, [applyServerStats]);
 
   return {
     dashboardStats,
@@ -116,6 +100,6 @@ export function useDashboardStats(): UseDashboardStatsReturn {
     setEarningsStats,
     setStatsLoading,
     fetchDashboardStats,
-    calculateStatsFromBookings,
+    applyServerStats,
   };
 }
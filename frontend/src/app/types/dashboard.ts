@@ -4,4 +4,5 @@ export interface DashboardStats {
     pending: number;
     approved: number;
     totalEarnings: string;
+    unconvertedEarnings: string[];   // formatted, per currency with no exchange rate
   }
\ No newline at end of file
@@ -3,4 +3,5 @@ export interface EarningsStats {
     thisMonth: string;
     avgFee: string;
     totalBookings: number;
+    unconvertedEarnings: string[];   // formatted, per currency with no exchange rate
   }
\ No newline at end of file
@@ -1,7 +1,7 @@
 "use client";
 import React from "react";
 import { BookingRequest } from "@/app/types/booking";
-import { SummaryCard } from "./SummaryCard";
+import { SummaryCard, unconvertedNote } from "./SummaryCard";
 
 export interface DashboardStats {
   totalRequests: number;
@@ -9,6 +9,7 @@ export interface DashboardStats {
   pending: number;
   approved: number;
   totalEarnings: string;
+  unconvertedEarnings: string[];   // formatted, per currency with no exchange rate
 }
 
 interface DashboardSectionProps {
@@ -105,6 +106,7 @@ export function DashboardSection({
               label="Total Earnings" 
               value={dashboardStats.totalEarnings} 
               icon="💰" 
+              note={unconvertedNote(dashboardStats.unconvertedEarnings)}
             />
           </div>
 
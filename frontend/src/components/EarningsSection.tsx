@@ -1,13 +1,14 @@
 "use client";
 import React from "react";
 import { BookingRequest } from "@/app/types/booking";
-import { SummaryCard } from "./SummaryCard";
+import { SummaryCard, unconvertedNote } from "./SummaryCard";
 
 export interface EarningsStats {
   totalRevenue: string;
   thisMonth: string;
   avgFee: string;
   totalBookings: number;
+  unconvertedEarnings: string[];   // formatted, per currency with no exchange rate
 }
 
 interface EarningsSectionProps {
@@ -55,6 +56,7 @@ export function EarningsSection({
               label="Total Revenue" 
               value={earningsStats.totalRevenue} 
               icon="💰" 
+              note={unconvertedNote(earningsStats.unconvertedEarnings)}
             />
             <SummaryCard 
               label="Revenue This Month" 
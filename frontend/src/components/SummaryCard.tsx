@@ -4,16 +4,23 @@ interface SummaryCardProps {
   label: string;
   value: string | number;
   icon?: string;
+  note?: string;
 }
 
-export function SummaryCard({ label, value, icon }: SummaryCardProps) {
+export function SummaryCard({ label, value, icon, note }: SummaryCardProps) {
   return (
     <div className="bg-[#232733] rounded-2xl shadow-lg border border-gray-800 p-6 flex flex-col items-center justify-center min-h-[120px]">
       {icon && <div className="text-3xl mb-2">{icon}</div>}
       <div className="text-2xl font-extrabold text-gray-100 mb-1">{value}</div>
       <div className="text-xs text-gray-400 font-semibold tracking-wide uppercase">{label}</div>
+      {note && <div className="text-xs text-amber-400 mt-2 text-center">{note}</div>}
     </div>
   );
 }
 
+// Earnings in currencies with no exchange rate are left out of the converted totals
+export function unconvertedNote(amounts: string[]): string | undefined {
+  return amounts.length ? `+ ${amounts.join(" + ")} not included (no exchange rate)` : undefined;
+}
+
 export default SummaryCard;
\ No newline at end of file